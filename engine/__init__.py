@@ -1,26 +1,39 @@
 """__init__.py pygame engine module.
 """
 
+from ._command_buffer import CommandBuffer
 from ._component import Component
 from ._debug_manager import DebugManager
 from ._delegate_manager import DelegateManager
 from ._engine import Engine
 from ._entity import Entity
+from ._entity_pool import EntityPool
+from ._entity_set import EntitySet
 from ._game_manager import GameManager
+from ._layer import Layer
 from ._loggar import Log
+from ._prefab import Prefab
 from ._scene import Scene
 from ._scene_manager import SceneManager
-from ._transform import Transform
+from ._system import System
+from ._transform import Transform, TransformPool
 
 __all__ = [
+    "CommandBuffer",
     "Component",
     "DebugManager",
     "DelegateManager",
     "Engine",
     "Entity",
+    "EntityPool",
+    "EntitySet",
     "GameManager",
+    "Layer",
     "Log",
+    "Prefab",
     "Scene",
     "SceneManager",
+    "System",
     "Transform",
+    "TransformPool",
 ]
@@ -0,0 +1,499 @@
+"""_aabb_tree.py contains a dynamic bounding volume tree used to index
+entities in the scene by their axis aligned bounding box.
+"""
+
+
+def get_bounds(the_rect):
+    """get_bounds returns the given rectangle as a (left, top, right, bottom)
+    tuple, normalizing negative width or height.
+    """
+    a_x, a_y, a_w, a_h = the_rect
+    return (min(a_x, a_x + a_w), min(a_y, a_y + a_h), max(a_x, a_x + a_w), max(a_y, a_y + a_h))
+
+
+def union_bounds(the_one, the_other):
+    """union_bounds returns the bounds containing both given bounds.
+    """
+    return (min(the_one[0], the_other[0]), min(the_one[1], the_other[1]),
+            max(the_one[2], the_other[2]), max(the_one[3], the_other[3]))
+
+
+def get_perimeter(the_bounds):
+    """get_perimeter returns the perimeter for the given bounds, it is used
+    as the cost for the tree insertion heuristic.
+    """
+    return 2 * ((the_bounds[2] - the_bounds[0]) + (the_bounds[3] - the_bounds[1]))
+
+
+def contains_bounds(the_one, the_other):
+    """contains_bounds returns if the first bounds contains the second one.
+    """
+    return (the_one[0] <= the_other[0] and the_one[1] <= the_other[1] and
+            the_other[2] <= the_one[2] and the_other[3] <= the_one[3])
+
+
+def overlap_bounds(the_one, the_other):
+    """overlap_bounds returns if both bounds overlap.
+    """
+    return (the_one[0] < the_other[2] and the_other[0] < the_one[2] and
+            the_one[1] < the_other[3] and the_other[1] < the_one[3])
+
+
+def raycast_bounds(the_bounds, the_start, the_delta):
+    """raycast_bounds returns the fraction in [0, 1] where the segment from
+    the_start to the_start + the_delta enters the given bounds, or None if
+    the segment does not touch them.
+    """
+    a_min = 0.0
+    a_max = 1.0
+    for a_axis in range(2):
+        a_origin = the_start[a_axis]
+        a_direction = the_delta[a_axis]
+        a_low = the_bounds[a_axis]
+        a_high = the_bounds[a_axis + 2]
+        if a_direction == 0:
+            if a_origin < a_low or a_origin > a_high:
+                return None
+            continue
+        a_near = (a_low - a_origin) / a_direction
+        a_far = (a_high - a_origin) / a_direction
+        if a_near > a_far:
+            a_near, a_far = a_far, a_near
+        a_min = max(a_min, a_near)
+        a_max = min(a_max, a_far)
+        if a_min > a_max:
+            return None
+    return a_min
+
+
+class AABBNode:
+    """AABBNode class is a node in the AABBTree. Leaves keep the tight bounds
+    for the indexed data and a fattened copy used for the tree.
+    """
+
+    def __init__(self, the_bounds, the_data=None):
+        """__init__ initializes AABBNode instance.
+        """
+        self.bounds = the_bounds
+        self.tight_bounds = the_bounds
+        self.data = the_data
+        self.version = None
+        self.parent = None
+        self.child1 = None
+        self.child2 = None
+        self.height = 0
+
+    @property
+    def is_leaf(self):
+        """is_leaf returns if the node is a leaf.
+        """
+        return self.child1 is None
+
+
+class AABBTree:
+    """AABBTree class implements a dynamic bounding volume tree. Every leaf
+    contains fattened bounds, so small movements do not require to update
+    the tree, and when a leaf moves out of its fattened bounds it is removed
+    and inserted again. The tree is kept balanced using rotations, so
+    queries run in logarithmic time.
+
+    Many proxies can be removed at once with remove_batch, which refits
+    every affected node once, or builds the tree again when most proxies
+    are removed.
+    """
+
+    # REBUILD_RATIO is the fraction of proxies removed in a single batch
+    # from which the tree is built again instead of being refitted.
+    REBUILD_RATIO = 0.25
+
+    def __init__(self, the_margin=8):
+        """__init__ initializes AABBTree instance.
+
+        Args:
+            the_margin (int): margin used to fatten leaf bounds.
+        """
+        self.margin = the_margin
+        self.root = None
+        self.proxies = {}   # [key]AABBNode
+
+    def __contains__(self, the_key):
+        return the_key in self.proxies
+
+    def __len__(self):
+        return len(self.proxies)
+
+    def clear(self):
+        """clear removes all proxies from the tree.
+        """
+        self.root = None
+        self.proxies = {}
+
+    def fatten(self, the_bounds):
+        """fatten returns the given bounds extended with the tree margin.
+        """
+        return (the_bounds[0] - self.margin, the_bounds[1] - self.margin,
+                the_bounds[2] + self.margin, the_bounds[3] + self.margin)
+
+    def get_version(self, the_key):
+        """get_version returns the version given when the proxy for the given
+        key was inserted or moved.
+        """
+        return self.proxies[the_key].version
+
+    def insert(self, the_key, the_rect, the_data, the_version=None):
+        """insert adds a new proxy with the given key for the given rectangle
+        and data. the_version can be used to skip moves for the same
+        version.
+        """
+        if the_key in self.proxies:
+            self.remove(the_key)
+        a_bounds = get_bounds(the_rect)
+        a_leaf = AABBNode(self.fatten(a_bounds), the_data)
+        a_leaf.tight_bounds = a_bounds
+        a_leaf.version = the_version
+        self.proxies[the_key] = a_leaf
+        self.insert_leaf(a_leaf)
+        return a_leaf
+
+    def move(self, the_key, the_rect, the_version=None):
+        """move updates proxy bounds with the given rectangle. The tree is only
+        updated if new bounds are not contained by the fattened bounds. It
+        returns True if the proxy was re-inserted in the tree.
+        """
+        a_leaf = self.proxies[the_key]
+        a_leaf.version = the_version
+        a_bounds = get_bounds(the_rect)
+        a_leaf.tight_bounds = a_bounds
+        if contains_bounds(a_leaf.bounds, a_bounds):
+            return False
+        self.remove_leaf(a_leaf)
+        a_leaf.bounds = self.fatten(a_bounds)
+        self.insert_leaf(a_leaf)
+        return True
+
+    def remove(self, the_key):
+        """remove removes the proxy for the given key.
+        """
+        a_leaf = self.proxies.pop(the_key, None)
+        if a_leaf is None:
+            return False
+        self.remove_leaf(a_leaf)
+        return True
+
+    def remove_batch(self, the_keys):
+        """remove_batch removes proxies for all given keys. Leaves are
+        detached first, and then every node above them is balanced and
+        refitted only once, from the deepest one up to the root. If the batch
+        contains a large fraction of all proxies, remaining leaves are used
+        to build the tree again. It returns the number of removed proxies.
+        """
+        a_count = len(self.proxies)
+        a_leaves = []
+        for a_key in the_keys:
+            a_leaf = self.proxies.pop(a_key, None)
+            if a_leaf is not None:
+                a_leaves.append(a_leaf)
+        if not a_leaves:
+            return 0
+        if not self.proxies:
+            self.root = None
+        elif len(a_leaves) >= a_count * self.REBUILD_RATIO:
+            self.rebuild()
+        else:
+            a_touched = set()
+            for a_leaf in a_leaves:
+                a_touched.discard(a_leaf.parent)
+                a_grand_parent = self.detach_leaf(a_leaf)
+                if a_grand_parent is not None:
+                    a_touched.add(a_grand_parent)
+            self.refit_batch(a_touched)
+        return len(a_leaves)
+
+    def query_point(self, the_point):
+        """query_point returns data for all proxies containing the given point.
+        """
+        a_x, a_y = the_point
+        a_result = []
+        a_stack = [self.root] if self.root else []
+        while a_stack:
+            a_node = a_stack.pop()
+            a_bounds = a_node.bounds
+            if a_x < a_bounds[0] or a_x >= a_bounds[2] or a_y < a_bounds[1] or a_y >= a_bounds[3]:
+                continue
+            if a_node.is_leaf:
+                a_bounds = a_node.tight_bounds
+                if a_bounds[0] <= a_x < a_bounds[2] and a_bounds[1] <= a_y < a_bounds[3]:
+                    a_result.append(a_node.data)
+                continue
+            a_stack.append(a_node.child1)
+            a_stack.append(a_node.child2)
+        return a_result
+
+    def query_rect(self, the_rect):
+        """query_rect returns data for all proxies overlapping the given
+        rectangle.
+        """
+        a_bounds = get_bounds(the_rect)
+        a_result = []
+        a_stack = [self.root] if self.root else []
+        while a_stack:
+            a_node = a_stack.pop()
+            if not overlap_bounds(a_node.bounds, a_bounds):
+                continue
+            if a_node.is_leaf:
+                if overlap_bounds(a_node.tight_bounds, a_bounds):
+                    a_result.append(a_node.data)
+                continue
+            a_stack.append(a_node.child1)
+            a_stack.append(a_node.child2)
+        return a_result
+
+    def raycast(self, the_start, the_end):
+        """raycast returns a list of (fraction, data) tuples for all proxies
+        hit by the segment from the_start to the_end, sorted by the fraction
+        of the segment where they are hit.
+        """
+        a_start = (the_start[0], the_start[1])
+        a_delta = (the_end[0] - the_start[0], the_end[1] - the_start[1])
+        a_result = []
+        a_stack = [self.root] if self.root else []
+        while a_stack:
+            a_node = a_stack.pop()
+            if raycast_bounds(a_node.bounds, a_start, a_delta) is None:
+                continue
+            if a_node.is_leaf:
+                a_bounds = a_node.tight_bounds
+                # empty bounds are never hit.
+                if a_bounds[0] == a_bounds[2] or a_bounds[1] == a_bounds[3]:
+                    continue
+                a_fraction = raycast_bounds(a_bounds, a_start, a_delta)
+                if a_fraction is not None:
+                    a_result.append((a_fraction, a_node.data))
+                continue
+            a_stack.append(a_node.child1)
+            a_stack.append(a_node.child2)
+        a_result.sort(key=lambda x: x[0])
+        return a_result
+
+    def insert_leaf(self, the_leaf):
+        """insert_leaf inserts the given leaf looking for the sibling with the
+        lowest perimeter cost, and balances the tree up to the root.
+        """
+        if self.root is None:
+            self.root = the_leaf
+            the_leaf.parent = None
+            return
+        a_bounds = the_leaf.bounds
+        a_index = self.root
+        while not a_index.is_leaf:
+            a_area = get_perimeter(a_index.bounds)
+            a_combined_area = get_perimeter(union_bounds(a_index.bounds, a_bounds))
+            a_cost = 2 * a_combined_area
+            a_inheritance_cost = 2 * (a_combined_area - a_area)
+            a_costs = []
+            for a_child in (a_index.child1, a_index.child2):
+                a_child_area = get_perimeter(union_bounds(a_bounds, a_child.bounds))
+                if not a_child.is_leaf:
+                    a_child_area -= get_perimeter(a_child.bounds)
+                a_costs.append(a_child_area + a_inheritance_cost)
+            if a_cost < a_costs[0] and a_cost < a_costs[1]:
+                break
+            a_index = a_index.child1 if a_costs[0] < a_costs[1] else a_index.child2
+        a_sibling = a_index
+        a_old_parent = a_sibling.parent
+        a_new_parent = AABBNode(union_bounds(a_bounds, a_sibling.bounds))
+        a_new_parent.parent = a_old_parent
+        a_new_parent.height = a_sibling.height + 1
+        if a_old_parent is None:
+            self.root = a_new_parent
+        elif a_old_parent.child1 is a_sibling:
+            a_old_parent.child1 = a_new_parent
+        else:
+            a_old_parent.child2 = a_new_parent
+        a_new_parent.child1 = a_sibling
+        a_new_parent.child2 = the_leaf
+        a_sibling.parent = a_new_parent
+        the_leaf.parent = a_new_parent
+        self.refit(the_leaf.parent)
+
+    def remove_leaf(self, the_leaf):
+        """remove_leaf removes the given leaf from the tree, its parent is
+        replaced by the leaf sibling.
+        """
+        if the_leaf is self.root:
+            self.root = None
+            return
+        a_parent = the_leaf.parent
+        a_grand_parent = a_parent.parent
+        a_sibling = a_parent.child2 if a_parent.child1 is the_leaf else a_parent.child1
+        the_leaf.parent = None
+        if a_grand_parent is None:
+            self.root = a_sibling
+            a_sibling.parent = None
+            return
+        if a_grand_parent.child1 is a_parent:
+            a_grand_parent.child1 = a_sibling
+        else:
+            a_grand_parent.child2 = a_sibling
+        a_sibling.parent = a_grand_parent
+        self.refit(a_grand_parent)
+
+    def build(self, the_leaves):
+        """build returns the root for a balanced subtree containing the given
+        leaves, splitting them by the median center on the longest axis.
+        """
+        if len(the_leaves) == 1:
+            return the_leaves[0]
+        a_left = min(a_leaf.bounds[0] for a_leaf in the_leaves)
+        a_top = min(a_leaf.bounds[1] for a_leaf in the_leaves)
+        a_right = max(a_leaf.bounds[2] for a_leaf in the_leaves)
+        a_bottom = max(a_leaf.bounds[3] for a_leaf in the_leaves)
+        a_axis = 0 if a_right - a_left >= a_bottom - a_top else 1
+        the_leaves.sort(key=lambda x: x.bounds[a_axis] + x.bounds[a_axis + 2])
+        a_half = len(the_leaves) // 2
+        a_node = AABBNode((a_left, a_top, a_right, a_bottom))
+        a_node.child1 = self.build(the_leaves[:a_half])
+        a_node.child2 = self.build(the_leaves[a_half:])
+        a_node.child1.parent = a_node
+        a_node.child2.parent = a_node
+        a_node.height = 1 + max(a_node.child1.height, a_node.child2.height)
+        return a_node
+
+    def detach_leaf(self, the_leaf):
+        """detach_leaf removes the given leaf from the tree without refitting
+        any node, its parent is replaced by the leaf sibling. It returns the
+        node where the sibling was attached, which has to be refitted.
+        """
+        a_parent = the_leaf.parent
+        the_leaf.parent = None
+        if a_parent is None:
+            self.root = None
+            return None
+        a_grand_parent = a_parent.parent
+        a_sibling = a_parent.child2 if a_parent.child1 is the_leaf else a_parent.child1
+        self.replace_child(a_grand_parent, a_parent, a_sibling)
+        a_sibling.parent = a_grand_parent
+        a_parent.parent = None
+        return a_grand_parent
+
+    def rebuild(self):
+        """rebuild builds the tree again with all proxies.
+        """
+        a_leaves = list(self.proxies.values())
+        for a_leaf in a_leaves:
+            a_leaf.parent = None
+        self.root = self.build(a_leaves) if a_leaves else None
+        if self.root is not None:
+            self.root.parent = None
+
+    def refit(self, the_node):
+        """refit balances and updates bounds and heights from the given node
+        up to the root.
+        """
+        a_index = the_node
+        while a_index is not None:
+            a_index = self.balance(a_index)
+            a_index.height = 1 + max(a_index.child1.height, a_index.child2.height)
+            a_index.bounds = union_bounds(a_index.child1.bounds, a_index.child2.bounds)
+            a_index = a_index.parent
+
+    def refit_batch(self, the_nodes):
+        """refit_batch balances and updates bounds and heights for the given
+        nodes and all their ancestors, every one of them only once, from the
+        deepest node up to the root.
+        """
+        a_depths = {}   # [AABBNode]depth
+        for a_node in the_nodes:
+            a_path = []
+            a_index = a_node
+            while a_index is not None and a_index not in a_depths:
+                a_path.append(a_index)
+                a_index = a_index.parent
+            a_depth = -1 if a_index is None else a_depths[a_index]
+            for a_index in reversed(a_path):
+                a_depth += 1
+                a_depths[a_index] = a_depth
+        for a_node in sorted(a_depths, key=a_depths.get, reverse=True):
+            a_node = self.rebalance(a_node)
+            a_node.height = 1 + max(a_node.child1.height, a_node.child2.height)
+            a_node.bounds = union_bounds(a_node.child1.bounds, a_node.child2.bounds)
+
+    def rebalance(self, the_node):
+        """rebalance rotates the given node until the heights of its children
+        differ at most by one, which can require many rotations after a batch
+        of leaves is removed. Nodes moved down by a rotation are balanced
+        again. It returns the new root for the subtree.
+        """
+        a_node = self.balance(the_node)
+        while a_node is not the_node:
+            self.rebalance(the_node)
+            a_node.height = 1 + max(a_node.child1.height, a_node.child2.height)
+            a_node.bounds = union_bounds(a_node.child1.bounds, a_node.child2.bounds)
+            the_node = a_node
+            a_node = self.balance(the_node)
+        return a_node
+
+    def replace_child(self, the_parent, the_old, the_new):
+        """replace_child replaces the_old child with the_new one in the given
+        parent, or the root if there is not parent.
+        """
+        if the_parent is None:
+            self.root = the_new
+        elif the_parent.child1 is the_old:
+            the_parent.child1 = the_new
+        else:
+            the_parent.child2 = the_new
+
+    def balance(self, the_node):
+        """balance performs a left or right rotation if the given node is
+        imbalanced, and returns the new root for the subtree.
+        """
+        a_node = the_node
+        if a_node.is_leaf or a_node.height < 2:
+            return a_node
+        a_b = a_node.child1
+        a_c = a_node.child2
+        a_balance = a_c.height - a_b.height
+        if a_balance > 1:
+            # rotate child2 up.
+            a_f = a_c.child1
+            a_g = a_c.child2
+            a_c.child1 = a_node
+            a_c.parent = a_node.parent
+            a_node.parent = a_c
+            self.replace_child(a_c.parent, a_node, a_c)
+            if a_f.height > a_g.height:
+                a_c.child2 = a_f
+                a_node.child2 = a_g
+                a_g.parent = a_node
+            else:
+                a_c.child2 = a_g
+                a_node.child2 = a_f
+                a_f.parent = a_node
+            a_node.bounds = union_bounds(a_b.bounds, a_node.child2.bounds)
+            a_node.height = 1 + max(a_b.height, a_node.child2.height)
+            a_c.bounds = union_bounds(a_node.bounds, a_c.child2.bounds)
+            a_c.height = 1 + max(a_node.height, a_c.child2.height)
+            return a_c
+        if a_balance < -1:
+            # rotate child1 up.
+            a_d = a_b.child1
+            a_e = a_b.child2
+            a_b.child1 = a_node
+            a_b.parent = a_node.parent
+            a_node.parent = a_b
+            self.replace_child(a_b.parent, a_node, a_b)
+            if a_d.height > a_e.height:
+                a_b.child2 = a_d
+                a_node.child1 = a_e
+                a_e.parent = a_node
+            else:
+                a_b.child2 = a_e
+                a_node.child1 = a_d
+                a_d.parent = a_node
+            a_node.bounds = union_bounds(a_c.bounds, a_node.child1.bounds)
+            a_node.height = 1 + max(a_c.height, a_node.child1.height)
+            a_b.bounds = union_bounds(a_node.bounds, a_b.child2.bounds)
+            a_b.height = 1 + max(a_node.height, a_b.child2.height)
+            return a_b
+        return a_node
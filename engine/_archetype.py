@@ -0,0 +1,209 @@
+"""_archetype.py contains archetype tables, where entities are grouped by the
+set of component types they have loaded, so systems can iterate all their
+components in bulk.
+"""
+
+
+class Archetype:
+    """Archetype class contains all entities with the same set of loaded
+    component types. Components are stored in one column per type, and every
+    entity uses the same row in all columns.
+    """
+
+    def __init__(self, the_types):
+        """__init__ initializes Archetype instance.
+
+        Args:
+            the_types (frozenset): component types for the archetype.
+        """
+        self.types = the_types
+        self.entities = []
+        self.columns = {a_type: [] for a_type in the_types}
+        self.rows = {}      # [entity_id]row
+        self.type_columns = {}  # [type]column
+        # version changes every time a row is added or removed, systems can
+        # use it to know when data they store for the archetype is outdated.
+        self.version = 0
+        self.data = {}      # [system]object
+        self.transform_rows = None
+        self.transform_rows_version = None
+
+    def __len__(self):
+        return len(self.entities)
+
+    def add(self, the_entity, the_components):
+        """add adds a new row for the given entity and its components.
+        """
+        self.rows[the_entity.id] = len(self.entities)
+        self.entities.append(the_entity)
+        self.version += 1
+        for a_component in the_components:
+            self.columns[type(a_component)].append(a_component)
+
+    def get_column(self, the_type):
+        """get_column returns the column for the given type, or the column
+        for the first type deriving from it.
+        """
+        a_column = self.type_columns.get(the_type, None)
+        if a_column is None:
+            for a_type, a_type_column in self.columns.items():
+                if issubclass(a_type, the_type):
+                    a_column = a_type_column
+                    self.type_columns[the_type] = a_column
+                    break
+        return a_column
+
+    def get_transform_rows(self):
+        """get_transform_rows returns the list of transform pool rows for
+        all entities in the archetype, it is cached until rows change.
+        """
+        if self.transform_rows_version != self.version:
+            self.transform_rows = [a_entity.transform.row for a_entity in self.entities]
+            self.transform_rows_version = self.version
+        return self.transform_rows
+
+    def matches(self, the_types):
+        """matches returns if the archetype contains all given types, or types
+        deriving from them.
+        """
+        return all(any(issubclass(a_type, a_required) for a_type in self.types) for a_required in the_types)
+
+    def remove(self, the_entity):
+        """remove removes the row for the given entity, the last row is moved
+        to its place.
+        """
+        a_row = self.rows.pop(the_entity.id)
+        self.version += 1
+        a_last = len(self.entities) - 1
+        if a_row != a_last:
+            a_moved = self.entities[a_last]
+            self.entities[a_row] = a_moved
+            self.rows[a_moved.id] = a_row
+            for a_column in self.columns.values():
+                a_column[a_row] = a_column[a_last]
+        self.entities.pop()
+        for a_column in self.columns.values():
+            a_column.pop()
+
+
+class EntityQuery:
+    """EntityQuery class contains all entities with a set of component types,
+    it is updated every time an entity changes its archetype.
+    """
+
+    def __init__(self, the_types):
+        """__init__ initializes EntityQuery instance.
+
+        Args:
+            the_types (frozenset): component types for the query.
+        """
+        self.types = the_types
+        self.entities = []
+        self.rows = {}      # [entity_id]row
+
+    def add(self, the_entity):
+        """add adds the given entity to the query result.
+        """
+        if the_entity.id in self.rows:
+            return
+        self.rows[the_entity.id] = len(self.entities)
+        self.entities.append(the_entity)
+
+    def remove(self, the_entity):
+        """remove removes the given entity from the query result, the last
+        entity is moved to its place.
+        """
+        a_row = self.rows.pop(the_entity.id, None)
+        if a_row is None:
+            return
+        a_moved = self.entities.pop()
+        if a_moved is not the_entity:
+            self.entities[a_row] = a_moved
+            self.rows[a_moved.id] = a_row
+
+
+class ArchetypeStorage:
+    """ArchetypeStorage class keeps archetype tables for all entities in a
+    scene, and cached queries returning archetypes for a set of component
+    types.
+    """
+
+    def __init__(self):
+        """__init__ initializes ArchetypeStorage instance.
+        """
+        self.archetypes = {}        # [frozenset(type)]Archetype
+        self.entity_archetypes = {}     # [entity_id]Archetype
+        self.queries = {}   # [frozenset(type)]list(Archetype)
+        self.entity_queries = {}    # [frozenset(type)]EntityQuery
+
+    def clear(self):
+        """clear removes all archetypes and queries.
+        """
+        self.archetypes = {}
+        self.entity_archetypes = {}
+        self.queries = {}
+        self.entity_queries = {}
+
+    def query(self, the_types):
+        """query returns all archetypes with the given component types. Queries
+        are cached by the set of types, so the order they are given in does
+        not matter, and updated every time a new archetype is created.
+        """
+        a_key = frozenset(the_types)
+        a_archetypes = self.queries.get(a_key, None)
+        if a_archetypes is None:
+            a_archetypes = [a_archetype for a_archetype in self.archetypes.values() if a_archetype.matches(a_key)]
+            self.queries[a_key] = a_archetypes
+        return a_archetypes
+
+    def query_entities(self, the_types):
+        """query_entities returns the list of entities with the given
+        component types. The list is cached and updated only when entities
+        change their archetype, it should not be modified. As for query, the
+        order of the given types does not matter.
+        """
+        a_key = frozenset(the_types)
+        a_query = self.entity_queries.get(a_key, None)
+        if a_query is None:
+            a_query = EntityQuery(a_key)
+            for a_archetype in self.query(a_key):
+                for a_entity in a_archetype.entities:
+                    a_query.add(a_entity)
+            self.entity_queries[a_key] = a_query
+        return a_query.entities
+
+    def remove_entity(self, the_entity):
+        """remove_entity removes the given entity from its archetype.
+        """
+        a_archetype = self.entity_archetypes.pop(the_entity.id, None)
+        if a_archetype is not None:
+            a_archetype.remove(the_entity)
+            for a_query in self.entity_queries.values():
+                a_query.remove(the_entity)
+
+    def update_entity(self, the_entity):
+        """update_entity moves the given entity to the archetype for its loaded
+        components.
+        """
+        a_components = the_entity.loaded_components
+        a_types = frozenset(type(a_component) for a_component in a_components)
+        a_old_archetype = self.entity_archetypes.get(the_entity.id, None)
+        if a_old_archetype is not None:
+            if a_old_archetype.types == a_types:
+                return a_old_archetype
+            a_old_archetype.remove(the_entity)
+        a_archetype = self.archetypes.get(a_types, None)
+        if a_archetype is None:
+            a_archetype = Archetype(a_types)
+            self.archetypes[a_types] = a_archetype
+            for a_key, a_archetypes in self.queries.items():
+                if a_archetype.matches(a_key):
+                    a_archetypes.append(a_archetype)
+        a_archetype.add(the_entity, a_components)
+        self.entity_archetypes[the_entity.id] = a_archetype
+        for a_key, a_query in self.entity_queries.items():
+            if a_archetype in self.queries[a_key]:
+                a_query.add(the_entity)
+            elif a_old_archetype is not None:
+                a_query.remove(the_entity)
+        return a_archetype
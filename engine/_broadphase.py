@@ -0,0 +1,282 @@
+"""_broadphase.py contains all collision broadphase strategies used by the
+scene to find candidate pairs of colliders before running the precise
+collision test.
+"""
+
+
+def is_layer_compatible(the_one, the_other):
+    """is_layer_compatible returns if two collider layers, given as
+    (category, mask) tuples, can collide. A None layer collides with any
+    other.
+    """
+    if the_one is None or the_other is None:
+        return True
+    return (the_one[0] & the_other[1]) != 0 and (the_other[0] & the_one[1]) != 0
+
+
+def get_layer_buckets(the_len, the_layers):
+    """get_layer_buckets returns a dictionary with a list of collider indexes
+    for every layer. If the_layers is None, all colliders are placed in one
+    bucket with None layer.
+    """
+    if the_layers is None:
+        return {None: list(range(the_len))}
+    a_buckets = {}
+    for a_index, a_layer in enumerate(the_layers):
+        a_buckets.setdefault(a_layer, []).append(a_index)
+    return a_buckets
+
+
+def get_compatible_layer_pairs(the_layers):
+    """get_compatible_layer_pairs returns all pairs of layers, including one
+    layer with itself, that can collide.
+    """
+    a_layers = list(the_layers)
+    return [(a_one, a_other) for i, a_one in enumerate(a_layers) for a_other in a_layers[i:] if is_layer_compatible(a_one, a_other)]
+
+
+class Broadphase:
+    """Broadphase class is the base class for any collision broadphase.
+
+    A broadphase receives the entities with an active collider and their
+    collider rectangles in the same order, and returns the list of index
+    pairs (i, j), with i < j, that could be colliding. Pairs are sorted, so
+    the scene checks them in the same order the brute force loop would do.
+
+    the_layers is a list with the (category, mask) tuple for every collider,
+    or None when all colliders can collide with each other. Pairs for
+    colliders with incompatible layers are never returned.
+
+    all_pairs identifies a broadphase that does not prune any pair, so the
+    narrowphase can test all of them at once without building the pairs
+    when the_layers is None.
+    """
+
+    all_pairs = False
+
+    def add(self, the_entity):
+        """add is called when an entity with a collider joins the scene
+        collision collection.
+        """
+
+    def clear(self):
+        """clear removes all information stored by the broadphase.
+        """
+
+    def get_pairs(self, the_entities, the_rects, the_layers=None):
+        """get_pairs returns the sorted list of candidate index pairs.
+        """
+        raise NotImplementedError
+
+    def remove(self, the_entity):
+        """remove is called when an entity with a collider leaves the scene
+        collision collection.
+        """
+
+
+class BruteForceBroadphase(Broadphase):
+    """BruteForceBroadphase class returns every pair of colliders as a
+    candidate.
+    """
+
+    all_pairs = True
+
+    def get_pairs(self, the_entities, the_rects, the_layers=None):
+        """get_pairs returns all index pairs for compatible layers.
+        """
+        a_buckets = get_layer_buckets(len(the_rects), the_layers)
+        a_pairs = []
+        for a_one, a_other in get_compatible_layer_pairs(a_buckets):
+            a_one_bucket = a_buckets[a_one]
+            if a_one == a_other:
+                a_len = len(a_one_bucket)
+                a_pairs.extend((a_one_bucket[i], a_one_bucket[j]) for i in range(a_len) for j in range(i + 1, a_len))
+                continue
+            for i in a_one_bucket:
+                for j in a_buckets[a_other]:
+                    a_pairs.append((i, j) if i < j else (j, i))
+        a_pairs.sort()
+        return a_pairs
+
+
+class GridBroadphase(Broadphase):
+    """GridBroadphase class implements a uniform grid spatial hash. Every
+    collider is hashed into all cells its rectangle covers, and only
+    colliders sharing a cell are returned as candidates.
+
+    The grid is rebuilt every time get_pairs is called. If cell size is not
+    provided, it is computed every frame as twice the mean collider size.
+    """
+
+    def __init__(self, the_cell_size=None):
+        """__init__ initializes GridBroadphase instance.
+        """
+        self.cell_size = the_cell_size
+        self.cells = {}
+
+    def clear(self):
+        """clear removes all cells.
+        """
+        self.cells = {}
+
+    def get_cell_size(self, the_rects):
+        """get_cell_size returns the cell size to be used for the given
+        rectangles.
+        """
+        if self.cell_size:
+            return self.cell_size
+        a_total = 0
+        for a_rect in the_rects:
+            a_total += max(abs(a_rect.w), abs(a_rect.h))
+        return max(1, (2 * a_total) // max(1, len(the_rects)))
+
+    def get_pairs(self, the_entities, the_rects, the_layers=None):
+        """get_pairs returns index pairs for colliders sharing a grid cell.
+        Every layer uses its own grid, and only grids for compatible layers
+        are compared.
+        """
+        a_cell_size = self.get_cell_size(the_rects)
+        a_grids = {}
+        for a_index, a_rect in enumerate(the_rects):
+            # pygame never collides rectangles with zero width or height.
+            if a_rect.w == 0 or a_rect.h == 0:
+                continue
+            a_cells = a_grids.setdefault(None if the_layers is None else the_layers[a_index], {})
+            a_left = min(a_rect.x, a_rect.x + a_rect.w) // a_cell_size
+            a_right = max(a_rect.x, a_rect.x + a_rect.w) // a_cell_size
+            a_top = min(a_rect.y, a_rect.y + a_rect.h) // a_cell_size
+            a_bottom = max(a_rect.y, a_rect.y + a_rect.h) // a_cell_size
+            for a_cell_x in range(a_left, a_right + 1):
+                for a_cell_y in range(a_top, a_bottom + 1):
+                    a_cells.setdefault((a_cell_x, a_cell_y), []).append(a_index)
+        a_pairs = set()
+        for a_one, a_other in get_compatible_layer_pairs(a_grids):
+            if a_one == a_other:
+                for a_cell in a_grids[a_one].values():
+                    a_len = len(a_cell)
+                    for i in range(a_len):
+                        a_i = a_cell[i]
+                        for j in range(i + 1, a_len):
+                            a_pairs.add((a_i, a_cell[j]))
+                continue
+            a_one_cells = a_grids[a_one]
+            a_other_cells = a_grids[a_other]
+            if len(a_other_cells) < len(a_one_cells):
+                a_one_cells, a_other_cells = a_other_cells, a_one_cells
+            for a_key, a_one_cell in a_one_cells.items():
+                a_other_cell = a_other_cells.get(a_key, None)
+                if a_other_cell is None:
+                    continue
+                for i in a_one_cell:
+                    for j in a_other_cell:
+                        a_pairs.add((i, j) if i < j else (j, i))
+        self.cells = a_grids
+        return sorted(a_pairs)
+
+
+class SweepAndPruneBroadphase(Broadphase):
+    """SweepAndPruneBroadphase class implements an incremental sweep and
+    prune on the X axis. Min and max endpoints for every collider are kept
+    in a list sorted across frames, and they are re-sorted with insertion
+    sort, which is close to linear when colliders move only a little per
+    frame.
+
+    Colliders are added and removed incrementally, endpoints for removed
+    colliders are purged in a single pass the next time pairs are computed.
+    """
+
+    def __init__(self):
+        """__init__ initializes SweepAndPruneBroadphase instance.
+        """
+        self.endpoints = []     # list([value, is_max, entity])
+        self.entity_endpoints = {}      # [entity_id](min_endpoint, max_endpoint)
+        self.removed = set()
+
+    def add(self, the_entity):
+        """add adds both endpoints for the given entity at the end of the
+        endpoint list, they are moved to their position when sorting.
+        """
+        if the_entity.id in self.entity_endpoints:
+            self.removed.discard(the_entity.id)
+            return
+        a_min = [float("inf"), False, the_entity]
+        a_max = [float("inf"), True, the_entity]
+        self.endpoints.append(a_min)
+        self.endpoints.append(a_max)
+        self.entity_endpoints[the_entity.id] = (a_min, a_max)
+
+    def clear(self):
+        """clear removes all endpoints.
+        """
+        self.endpoints = []
+        self.entity_endpoints = {}
+        self.removed = set()
+
+    def get_pairs(self, the_entities, the_rects, the_layers=None):
+        """get_pairs updates endpoints with the given rectangles, sorts them
+        and sweeps the X axis returning index pairs overlapping on it. Active
+        colliders are kept by layer, and only active colliders in compatible
+        layers are paired.
+        """
+        if self.removed:
+            self.endpoints = [a_endpoint for a_endpoint in self.endpoints if a_endpoint[2].id not in self.removed]
+            for a_entity_id in self.removed:
+                del self.entity_endpoints[a_entity_id]
+            self.removed = set()
+        a_indexes = {}
+        for a_index, a_entity in enumerate(the_entities):
+            a_rect = the_rects[a_index]
+            # pygame never collides rectangles with zero width or height.
+            if a_rect.w == 0 or a_rect.h == 0:
+                continue
+            a_endpoints = self.entity_endpoints.get(a_entity.id, None)
+            if a_endpoints is None:
+                self.add(a_entity)
+                a_endpoints = self.entity_endpoints[a_entity.id]
+            a_endpoints[0][0] = min(a_rect.x, a_rect.x + a_rect.w)
+            a_endpoints[1][0] = max(a_rect.x, a_rect.x + a_rect.w)
+            a_indexes[a_entity.id] = a_index
+        self.sort()
+        a_pairs = []
+        a_actives = {}      # [layer][index]
+        a_compatibles = {}  # [layer]list(active)
+        for _, a_is_max, a_entity in self.endpoints:
+            a_index = a_indexes.get(a_entity.id, None)
+            if a_index is None:
+                continue
+            a_layer = None if the_layers is None else the_layers[a_index]
+            if a_is_max:
+                del a_actives[a_layer][a_index]
+                continue
+            if a_layer not in a_actives:
+                a_actives[a_layer] = {}
+                a_compatibles = {}
+            if a_layer not in a_compatibles:
+                a_compatibles[a_layer] = [a_active for a_other_layer, a_active in a_actives.items() if is_layer_compatible(a_layer, a_other_layer)]
+            for a_active in a_compatibles[a_layer]:
+                for a_other in a_active:
+                    a_pairs.append((a_other, a_index) if a_other < a_index else (a_index, a_other))
+            a_actives[a_layer][a_index] = True
+        a_pairs.sort()
+        return a_pairs
+
+    def remove(self, the_entity):
+        """remove marks the given entity endpoints to be removed.
+        """
+        if the_entity.id in self.entity_endpoints:
+            self.removed.add(the_entity.id)
+
+    def sort(self):
+        """sort sorts endpoints using insertion sort. Min endpoints are placed
+        before max endpoints with the same value.
+        """
+        a_endpoints = self.endpoints
+        for i in range(1, len(a_endpoints)):
+            a_endpoint = a_endpoints[i]
+            a_value = a_endpoint[0]
+            a_is_max = a_endpoint[1]
+            j = i - 1
+            while j >= 0 and (a_endpoints[j][0] > a_value or (a_endpoints[j][0] == a_value and a_endpoints[j][1] and not a_is_max)):
+                a_endpoints[j + 1] = a_endpoints[j]
+                j -= 1
+            a_endpoints[j + 1] = a_endpoint
@@ -0,0 +1,85 @@
+"""_command_buffer.py contains the CommandBuffer class, used to record
+structural changes for a scene while entities are being updated and apply
+all of them at once.
+"""
+
+
+class CommandBuffer:
+    """CommandBuffer class records entities being added, spawned or removed
+    and components being added or removed. Commands are applied in the same
+    order they were recorded when the scene reaches its sync point, after
+    all entities have been updated, so no list being iterated is changed.
+    """
+
+    ADD_COMPONENT = "command:add-component"
+    ADD_ENTITY = "command:add-entity"
+    REMOVE_COMPONENT = "command:remove-component"
+    REMOVE_ENTITY = "command:remove-entity"
+    SPAWN = "command:spawn"
+
+    def __init__(self):
+        """__init__ initializes CommandBuffer instance.
+        """
+        self.commands = []  # list((command, target, argument))
+
+    def __len__(self):
+        return len(self.commands)
+
+    def add_component(self, the_entity, the_component):
+        """add_component records the given component to be added to the given
+        entity.
+        """
+        self.commands.append((CommandBuffer.ADD_COMPONENT, the_entity, the_component))
+
+    def add_entity(self, the_entity):
+        """add_entity records the given entity to be added to the scene.
+        """
+        self.commands.append((CommandBuffer.ADD_ENTITY, the_entity, None))
+
+    def apply(self, the_scene):
+        """apply runs all recorded commands for the given scene and clears
+        the buffer. Commands recorded while commands are being applied are
+        applied too. After every component command the entity collision
+        membership is checked again.
+        """
+        a_index = 0
+        while a_index < len(self.commands):
+            a_command, a_target, a_argument = self.commands[a_index]
+            a_index += 1
+            if a_command == CommandBuffer.ADD_COMPONENT:
+                a_target.add_component(a_argument)
+                the_scene.update_collider_entity(a_target)
+            elif a_command == CommandBuffer.ADD_ENTITY:
+                the_scene.add_entity(a_target)
+            elif a_command == CommandBuffer.REMOVE_COMPONENT:
+                a_target.remove_component(a_argument)
+                the_scene.update_collider_entity(a_target)
+            elif a_command == CommandBuffer.REMOVE_ENTITY:
+                the_scene.remove_entity(a_target)
+            elif a_command == CommandBuffer.SPAWN:
+                the_scene.spawn(a_target, *a_argument)
+        self.commands = []
+        return a_index
+
+    def clear(self):
+        """clear removes all recorded commands.
+        """
+        self.commands = []
+
+    def remove_component(self, the_entity, the_component):
+        """remove_component records the given component to be removed from the
+        given entity.
+        """
+        self.commands.append((CommandBuffer.REMOVE_COMPONENT, the_entity, the_component))
+
+    def remove_entity(self, the_entity):
+        """remove_entity records the given entity to be removed from the
+        scene.
+        """
+        self.commands.append((CommandBuffer.REMOVE_ENTITY, the_entity, None))
+
+    def spawn(self, the_prefab, the_count=1, the_positions=None):
+        """spawn records the given number of copies of the given prefab to be
+        spawned in the scene.
+        """
+        self.commands.append((CommandBuffer.SPAWN, the_prefab, (the_count, the_positions)))
@@ -11,15 +11,32 @@ class Component(EObject):
     """Component class identifies a component.
     """
 
+    __slots__ = ("entity", "delegates", "delegate", "collider", "shape", "category", "mask", "static",
+                 "callbacks", "remove_on_destroy")
+
+    COLLIDER_CATEGORY_DEFAULT = 0x00000001
+    COLLIDER_MASK_ALL = 0xFFFFFFFF
+    COLLIDER_SHAPE_RECT = "collider-shape:rect"
+    COLLIDER_SHAPE_CIRCLE = "collider-shape:circle"
+
     def __init__(self, the_name, the_engine=None, **kwargs):
         """__init__ initializes the Component instance.
         """
         super().__init__(the_name, the_engine, **kwargs)
         self.entity = kwargs.get("the_entity", None)
         self.delegates = kwargs.get("the_delegates", {})
-        # any collider component has to implement get_collider_box or
-        # get_collider_circle methods.
+        self.delegate = None
+        # any collider component has to implement get_collider_rect method,
+        # and circle shaped colliders get_collider_circle method too.
         self.collider = False
+        self.shape = self.COLLIDER_SHAPE_RECT
+        # collider category bitmask and the bitmask with all categories it
+        # collides with. Two colliders are only tested when category for
+        # each one is in the mask for the other one.
+        self.category = self.COLLIDER_CATEGORY_DEFAULT
+        self.mask = self.COLLIDER_MASK_ALL
+        # static colliders never move, they are indexed once by the scene.
+        self.static = False
         self.callbacks = []
         self.remove_on_destroy = kwargs.get("the_remove_on_destroy", True)
 
@@ -42,6 +59,19 @@ class Component(EObject):
         """
         return type(self).__name__
 
+    def clone(self):
+        """clone returns a copy of the component, not loaded and not attached
+        to any entity, without any delegate or callback.
+        """
+        a_clone = super().clone()
+        a_clone.entity = None
+        a_clone.delegates = {}
+        a_clone.delegate = None
+        a_clone.callbacks = []
+        a_clone.loaded = False
+        a_clone.started = False
+        return a_clone
+
     def get_delegate(self, the_delegate_name=None):
         """get_delegate retrieves the component delegate with the given name.
         If the_delegate_name is not provided, it assumes there is only one
@@ -56,6 +86,8 @@ class Component(EObject):
         """
         Log.Component(self.name).OnActive().call()
         self.active = True
+        if self.entity is not None:
+            self.entity.clear_dispatch()
 
     def on_collision_callback(self, **kwargs):
         """on_collision_callback is the component default callback when
@@ -63,6 +95,14 @@ class Component(EObject):
         """
         return True
 
+    def on_deactive(self):
+        """on_deactive is called every time the component is set to not
+        active.
+        """
+        super().on_deactive()
+        if self.entity is not None:
+            self.entity.clear_dispatch()
+
     def on_destroy(self):
         """on_destroy calls all methods to clean up the component.
         """
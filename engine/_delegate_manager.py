@@ -10,6 +10,8 @@ class Delegate(IObject):
     """Delegate class.
     """
 
+    __slots__ = ("component_source", "event_name")
+
     def __init__(self, the_name, the_component_source, the_event_name):
         """__init__ initializes a Delegate instance.
         """
@@ -23,6 +25,8 @@ class Callback(IObject):
     """Callback class.
     """
 
+    __slots__ = ("callback_id", "component_to_register", "entity", "component", "delegate", "signature", "kwargs")
+
     def __init__(self, the_name, the_component_to_register, the_entity, the_component, the_delegate, the_signature):
         """__init__ initializes a Callback instance.
 
@@ -78,12 +82,44 @@ class DelegateManager(EObject):
         from the delegate.
         """
         Log.DelegateManager(self.name).DeregisterCallback(the_delegate_id, the_callback_id).call()
-        for index, a_callback in enumerate(self.delegates.get(the_delegate_id, [])):
+        a_callbacks = self.callbacks.get(the_delegate_id, [])
+        for index, a_callback in enumerate(a_callbacks):
             if a_callback.callback_id == the_callback_id:
-                del self.callbacks[index]
+                del a_callbacks[index]
                 return True
         return False
 
+    def dispatch_delegate(self, the_delegate_id, the_entities, the_now, the_kwargs):
+        """dispatch_delegate calls the callback registered to the given
+        delegate, for trigger_delegate_for and trigger_delegates.
+        """
+        for a_callback in self.callbacks.get(the_delegate_id, []):
+            # Check if the entity for the component in the callback belongs to
+            # the active scene.
+            if not self.get_scene_manager().is_active_scene(a_callback.component.entity.scene.id):
+                continue
+            if the_entities is not None and a_callback.component.entity not in the_entities:
+                continue
+            if the_now:
+                a_callback.signature(**the_kwargs)
+                return
+            a_store_callback = Callback(a_callback.name,
+                                        a_callback.component_to_register,
+                                        a_callback.entity,
+                                        a_callback.component,
+                                        a_callback.delegate,
+                                        a_callback.signature)
+            a_store_callback.callback_id = a_callback.callback_id
+            a_store_callback.kwargs = the_kwargs
+            self.to_be_called.append(a_store_callback)
+            return
+
+    def has_callbacks(self, the_delegate_id):
+        """has_callbacks returns if there is any callback registered to the
+        given delegate.
+        """
+        return len(self.callbacks.get(the_delegate_id, [])) != 0
+
     def on_init(self):
         """on_init initializes all DelegateManager resources.
         """
@@ -129,23 +165,15 @@ class DelegateManager(EObject):
         delegate if callback entity is in the lis of entities given.
         """
         Log.DelegateManager(self.name).TriggerDelegateFor(the_delegate_id).call()
-        for a_callback in self.callbacks.get(the_delegate_id, []):
-            # Check if the entity for the component in the callback belongs to
-            # the active scene.
-            if not self.get_scene_manager().is_active_scene(a_callback.component.entity.scene.id):
-                continue
-            if the_entities is not None and a_callback.component.entity not in the_entities:
-                continue
-            if the_now:
-                a_callback.signature(**kwargs)
-                return
-            a_store_callback = Callback(a_callback.name,
-                                        a_callback.component_to_register,
-                                        a_callback.entity,
-                                        a_callback.component,
-                                        a_callback.delegate,
-                                        a_callback.signature)
-            a_store_callback.callback_id = a_callback.callback_id
-            a_store_callback.kwargs = kwargs
-            self.to_be_called.append(a_store_callback)
-            return
+        return self.dispatch_delegate(the_delegate_id, the_entities, the_now, kwargs)
+
+    def trigger_delegates(self, the_triggers, the_now):
+        """trigger_delegates calls callbacks for a batch of delegate
+        triggers, given as a list of (delegate id, kwargs) tuples, in the
+        same order. It is equivalent to calling trigger_delegate for every
+        entry, but the batch is logged once.
+        """
+        Log.DelegateManager(self.name).TriggerDelegates(len(the_triggers)).call()
+        for a_delegate_id, a_kwargs in the_triggers:
+            self.dispatch_delegate(a_delegate_id, None, the_now, a_kwargs)
+        return True
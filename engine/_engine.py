@@ -6,6 +6,7 @@ all application.
 import pygame
 from ._loggar import Log
 from ._eobject import EObject
+from ._ider import get_ider
 
 
 class Engine(EObject):
@@ -24,11 +25,14 @@ class Engine(EObject):
 
     @staticmethod
     def delete():
-        """delete is an Engine static method that deletes the singleton instance.
+        """delete is an Engine static method that deletes the singleton instance
+        and resets the identification registry, so objects created for the
+        deleted engine can not be found by id anymore.
         """
         if Engine.__instance is None:
             raise Exception("Engine not created!")
         Engine.__instance = None
+        get_ider().reset()
 
     def __init__(self, the_name="engine", the_width=640, the_height=480, **kwargs):
         """__init__ initializes singleton Engine instance.
@@ -53,6 +57,9 @@ class Engine(EObject):
             "resource-manager": kwargs.get("the_resource_manager", None),
             "scene-manager": kwargs.get("the_scene_manager", None),
             "sound-manager": kwargs.get("the_sound_manager", None), }
+        self.systems = list(kwargs.get("the_systems", []))
+        for a_system in self.systems:
+            a_system.engine = self
         self.frames = 0
         self.end_condition = kwargs.get("the_end_condition", None)
         # pygame related attributes
@@ -211,6 +218,24 @@ class Engine(EObject):
         Log.Engine(self.name).AddScene(the_scene.name).call()
         return self.scene_manager.add_scene(the_scene)
 
+    def add_system(self, the_system):
+        """add_system registers the given system to the engine.
+
+        Args:
+            the_system (System): System instance to be added to the Engine.
+
+        Returns:
+            bool : True if system was added or False if it was already
+                registered.
+        """
+        Log.Engine(self.name).AddSystem(the_system.name).call()
+        if the_system in self.systems:
+            return False
+        if the_system.engine is None:
+            the_system.engine = self
+        self.systems.append(the_system)
+        return True
+
     def destroy_entity(self, the_entity):
         """destroy_entity removes the given entity from the engine.
 
@@ -222,8 +247,9 @@ class Engine(EObject):
             False if there was any error removing it.
         """
         Log.Engine(self.name).DestroyEntity(the_entity.name).call()
-        a_scene = the_entity.get_scene()
-        a_scene.delete_entity(the_entity)
+        a_scene = the_entity.scene
+        if a_scene is None or not a_scene.remove_entity(the_entity):
+            return False
         the_entity.active = False
         return True
 
@@ -272,6 +298,8 @@ class Engine(EObject):
         super().on_end()
         for a_manager in self.active_managers:
             a_manager.on_end()
+        for a_system in self.systems:
+            a_system.on_end()
         Log.Engine(self.name).Ending(self.state).call()
 
     def on_frame_end(self):
@@ -324,6 +352,8 @@ class Engine(EObject):
         self.on_graphical_init()
         for a_manager in self.active_managers:
             a_manager.on_init()
+        for a_system in self.systems:
+            a_system.on_init()
 
     def on_run(self):
         """on_run proceeds to run the engine.
@@ -374,14 +404,30 @@ class Engine(EObject):
         self.active = True
         for a_manager in self.active_managers:
             a_manager.on_start()
+        for a_system in self.systems:
+            a_system.on_start()
 
     def on_update(self):
-        """on_update calls all on_update methods for every manager.
+        """on_update calls all on_update methods for every active system and
+        then for every manager, so entities, collisions and delegates see the
+        state updated by systems in the same frame.
         """
         super().on_update()
+        for a_system in self.systems:
+            if a_system.active:
+                a_system.on_update()
         for a_manager in self.active_managers:
             a_manager.on_update()
 
+    def remove_system(self, the_system):
+        """remove_system removes the given system from the engine.
+        """
+        Log.Engine(self.name).RemoveSystem(the_system.name).call()
+        if the_system not in self.systems:
+            return False
+        self.systems.remove(the_system)
+        return True
+
     def run(self):
         """run runs the engine and launches the give scene as the initial one.
         """
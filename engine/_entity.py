@@ -1,6 +1,7 @@
 """_entity.py contains the Entity base class, used for any entity in the game.
 """
 
+from ._component import Component
 from ._eobject import EObject
 from ._loggar import Log
 from ._transform import Transform
@@ -8,8 +9,19 @@ from ._transform import Transform
 
 class Entity(EObject):
     """Entity class identifies an entity.
+
+    Active loaded components are called from dispatch lists, built once for
+    every hook and rebuilt only when components are loaded, removed, set to
+    active or set to not active. Components are only called for any hook in
+    DISPATCH_HOOKS if their class overrides it.
     """
 
+    __slots__ = ("layer", "parent", "children", "scene", "_transform", "components", "loaded_components",
+                 "unloaded_components", "component_klasses", "component_types", "collider_component",
+                 "die_on_collision", "die_on_out_of_bounds", "dispatch")
+
+    DISPATCH_HOOKS = ("on_after_update", "on_frame_start", "on_render", "on_update")
+
     def __init__(self, the_name, the_engine=None, **kwargs):
         """__init__ initializes the Entity instance.
         """
@@ -18,12 +30,42 @@ class Entity(EObject):
         self.parent = kwargs.get("the_parent", None)
         self.children = list()
         self.scene = kwargs.get("the_scene", None)
+        self._transform = None
         self.transform = kwargs.get("the_transform", Transform())
         self.components = list()
         self.loaded_components = list()
         self.unloaded_components = list()
+        self.component_klasses = dict()     # [klass]Component
+        self.component_types = dict()   # [type]list(Component)
+        self.collider_component = None
         self.die_on_collision = kwargs.get("the_die_on_collision", False)
         self.die_on_out_of_bounds = kwargs.get("the_die_on_out_of_bounds", False)
+        self.dispatch = None    # [hook]list(Component)
+
+    @property
+    def transform(self):
+        """transform returns the entity transform.
+        """
+        return self._transform
+
+    @transform.setter
+    def transform(self, the_transform):
+        """transform setter sets the entity transform. If the previous
+        transform was stored in a scene transform pool, the new one takes its
+        place in the pool. The transform is relative to the parent entity
+        transform, and children transforms are relative to it.
+        """
+        a_transform = self._transform
+        if a_transform is not None and a_transform is not the_transform and a_transform.pool is not None:
+            a_pool = a_transform.pool
+            a_pool.detach(a_transform)
+            a_pool.attach(the_transform)
+        self._transform = the_transform
+        a_parent_transform = self.parent.transform if self.parent is not None else None
+        if the_transform.parent is not a_parent_transform:
+            the_transform.parent = a_parent_transform
+        for a_child in self.children:
+            a_child.transform.parent = the_transform
 
     def add_child(self, the_child):
         """add_child adds a new child entity.
@@ -31,6 +73,7 @@ class Entity(EObject):
         Log.Entity(self.name).AddChild(the_child.name).call()
         self.children.append(the_child)
         the_child.parent = self
+        the_child.transform.parent = self.transform
         the_child.layer = self.layer
         return True
 
@@ -38,23 +81,73 @@ class Entity(EObject):
         """add_component adds a new component to the entity.
         """
         Log.Entity(self.name).AddComponent(the_component.name).call()
-        for a_component in self.components:
-            if a_component.klass == the_component.klass:
-                Log.Entity(self.name).Error("component type {} already exists".format(the_component.klass))
-                raise Exception("component type {} already exists".format(the_component.klass))
+        if the_component.klass in self.component_klasses:
+            Log.Entity(self.name).Error("component type {} already exists".format(the_component.klass))
+            raise Exception("component type {} already exists".format(the_component.klass))
         the_component.entity = self
         the_component.engine = self.engine
         self.components.append(the_component)
         self.unloaded_components.append(the_component)
+        self.index_component(the_component)
+        self.clear_dispatch()
         return self
 
+    def clear_dispatch(self):
+        """clear_dispatch clears all dispatch lists, so they are built again
+        the next time they are required, and the scene dispatch lists too.
+        """
+        self.dispatch = None
+        if self.scene is not None:
+            self.scene.clear_dispatch()
+
+    def clear_component_indexes(self):
+        """clear_component_indexes removes all components from the indexes.
+        """
+        self.component_klasses = dict()
+        self.component_types = dict()
+        a_collider_component = self.collider_component
+        self.collider_component = None
+        if a_collider_component is not None:
+            self.update_collider()
+
+    def clone(self):
+        """clone returns a copy of the entity with a copy of its transform,
+        components and children, created without calling __init__ or
+        logging. The copy is not loaded and it is not in any scene.
+        """
+        a_clone = super().clone()
+        a_clone.parent = None
+        a_clone.scene = None
+        a_clone.loaded = False
+        a_clone.started = False
+        a_clone._transform = self._transform.clone()
+        a_clone.children = list()
+        for a_child in self.children:
+            a_child_clone = a_child.clone()
+            a_child_clone.parent = a_clone
+            a_child_clone.transform.parent = a_clone.transform
+            a_clone.children.append(a_child_clone)
+        a_clone.components = list()
+        a_clone.loaded_components = list()
+        a_clone.unloaded_components = list()
+        a_clone.clear_component_indexes()
+        a_clone.dispatch = None
+        for a_component in self.components:
+            a_component_clone = a_component.clone()
+            a_component_clone.entity = a_clone
+            a_component_clone.engine = a_clone.engine
+            a_clone.components.append(a_component_clone)
+            a_clone.unloaded_components.append(a_component_clone)
+            a_clone.index_component(a_component_clone)
+        return a_clone
+
     def delete_child(self, the_child_id):
         """delete_child removes a child from the entity children list using
         child ID.
         """
         Log.Entity(self.name).DeleteChild(the_child_id).call()
-        a_child = self.lookup_by_id(self.children, the_child_id)
-        if a_child:
+        a_child = self.get_object(the_child_id)
+        if a_child is not None and a_child.parent is self:
             self.remove_child(a_child)
             return True
         return False
@@ -71,20 +164,43 @@ class Entity(EObject):
         return False
 
     def get_collider(self):
-        """get_collider returns the collider component.
+        """get_collider returns the collider rectangle.
         """
-        for a_component in self.loaded_components:
-            if a_component.collider:
-                return a_component.get_collider_rect()
+        a_component = self.get_collider_component()
+        if a_component is None:
+            return None
+        return a_component.get_collider_rect()
+
+    def get_collider_component(self):
+        """get_collider_component returns the collider component if it is
+        loaded.
+        """
+        a_component = self.collider_component
+        if a_component is not None and a_component.loaded:
+            return a_component
         return None
 
     def get_component(self, the_component_klass):
         """get_component returns the given component by the class.
         """
-        for a_component in self.components:
-            if a_component.klass == the_component_klass:
-                return a_component
-        return None
+        return self.component_klasses.get(the_component_klass, None)
+
+    def get_component_by_type(self, the_type):
+        """get_component_by_type returns the first component with the given
+        type or a type deriving from it.
+        """
+        if the_type is Component:
+            return self.components[0] if self.components else None
+        a_components = self.component_types.get(the_type, None)
+        return a_components[0] if a_components else None
+
+    def get_components_by_type(self, the_type):
+        """get_components_by_type returns all components with the given type
+        or a type deriving from it.
+        """
+        if the_type is Component:
+            return list(self.components)
+        return list(self.component_types.get(the_type, ()))
 
     def get_delegate_for_component(self, the_component_class):
         """get_delefate_for_component returns the delegate for the given
@@ -95,18 +211,49 @@ class Entity(EObject):
             return None
         return a_component.delegate
 
+    def get_dispatch(self, the_hook):
+        """get_dispatch returns the list of active loaded components to be
+        called for the given hook. The list should not be modified.
+        """
+        if self.dispatch is None:
+            a_active = [x for x in self.loaded_components if x.active]
+            self.dispatch = {"on_end": a_active, "on_start": a_active}
+            for a_hook in self.DISPATCH_HOOKS:
+                a_base = getattr(Component, a_hook)
+                self.dispatch[a_hook] = [x for x in a_active if getattr(type(x), a_hook) is not a_base]
+        return self.dispatch[the_hook]
+
     def has_collider(self):
         """has_collider returns if the entity has a collider component.
         """
-        for a_component in self.components:
-            if a_component.collider:
-                return True
-        return False
+        return self.collider_component is not None
+
+    def has_static_collider(self):
+        """has_static_collider returns if the entity has a static collider
+        component.
+        """
+        return self.collider_component is not None and self.collider_component.static
+
+    def index_component(self, the_component):
+        """index_component adds the given component to the indexes by class
+        name and by type, including all its base types deriving from
+        Component, and caches it if it is the first collider.
+        """
+        self.component_klasses[the_component.klass] = the_component
+        for a_type in type(the_component).__mro__:
+            if a_type is Component:
+                break
+            self.component_types.setdefault(a_type, []).append(the_component)
+        if the_component.collider and self.collider_component is None:
+            self.collider_component = the_component
+            self.update_collider()
 
     def load_unloaded_components(self):
         """load_unloaded_components proceeds to load any unloaded component.
         """
         # Log.Entity(self.name).LoadUnloadedComponents().call()
+        if not self.unloaded_components:
+            return True
         a_unloaded_components = list()
         a_loaded = False
         for a_component in self.unloaded_components:
@@ -117,16 +264,19 @@ class Entity(EObject):
             self.loaded_components.append(a_component)
             a_loaded = True
         self.unloaded_components = a_unloaded_components
+        if a_loaded:
+            self.clear_dispatch()
+            self.update_archetype()
         # if there was at least one component being loaded, on_start for that
         #  or those component has to be called.
         if a_loaded:
-            for a_component in [x for x in self.loaded_components if x.active]:
+            for a_component in self.get_dispatch("on_start"):
                 a_component.on_start()
         return True
 
     def on_after_update(self):
         super().on_after_update()
-        for a_component in self.loaded_components:
+        for a_component in self.get_dispatch("on_after_update"):
             a_component.on_after_update()
 
     def on_destroy(self):
@@ -138,6 +288,8 @@ class Entity(EObject):
         self.components = list()
         self.loaded_components = list()
         self.unloaded_components = list()
+        self.clear_component_indexes()
+        self.clear_dispatch()
 
     # def on_dump(self):
     #     """on_dump dumps entity to JSON format.
@@ -148,7 +300,7 @@ class Entity(EObject):
         """on_end calls all on_end methods for components in the entity.
         """
         super().on_end()
-        for a_component in [x for x in self.loaded_components if x.active]:
+        for a_component in self.get_dispatch("on_end"):
             a_component.on_end()
 
     def on_frame_end(self):
@@ -156,7 +308,7 @@ class Entity(EObject):
         """
         super().on_frame_end()
         self.load_unloaded_components()
-        for a_component in [x for x in self.loaded_components if x.active]:
+        for a_component in self.get_dispatch("on_frame_start"):
             a_component.on_frame_start()
 
     # def on_frame_start(self):
@@ -176,21 +328,21 @@ class Entity(EObject):
         super().on_render()
         if not self.visible:
             return
-        for a_component in [x for x in self.loaded_components if x.active]:
+        for a_component in self.get_dispatch("on_render"):
             a_component.on_render()
 
     def on_start(self):
         """on_start is called the first time the entity starts.
         """
         super().on_start()
-        for a_component in [x for x in self.loaded_components if x.active]:
+        for a_component in self.get_dispatch("on_start"):
             a_component.on_start()
 
     def on_update(self):
         """on_update is called every time the entity is called to be updated.
         """
         super().on_update()
-        for a_component in [x for x in self.loaded_components if x.active]:
+        for a_component in self.get_dispatch("on_update"):
             a_component.on_update()
 
     def remove_child(self, the_child):
@@ -198,6 +350,8 @@ class Entity(EObject):
         """
         Log.Entity(self.name).RemoveChild(the_child.name).call()
         self.children.remove(the_child)
+        the_child.parent = None
+        the_child.transform.parent = None
 
     def remove_component(self, the_component):
         """remove_component removes the given component.
@@ -210,6 +364,9 @@ class Entity(EObject):
                 self.loaded_components.remove(the_component)
             if the_component in self.unloaded_components:
                 self.unloaded_components.remove(the_component)
+            self.unindex_component(the_component)
+            self.clear_dispatch()
+            self.update_archetype()
             return True
         return False
 
@@ -224,4 +381,41 @@ class Entity(EObject):
         self.components = list()
         self.loaded_components = list()
         self.unloaded_components = list()
+        self.clear_component_indexes()
+        self.clear_dispatch()
+        self.update_archetype()
         return True
+
+    def unindex_component(self, the_component):
+        """unindex_component removes the given component from the indexes by
+        class name and by type, and caches the next collider if it was the
+        cached one.
+        """
+        self.component_klasses.pop(the_component.klass, None)
+        for a_type in type(the_component).__mro__:
+            if a_type is Component:
+                break
+            a_components = self.component_types.get(a_type, None)
+            if a_components is None:
+                continue
+            a_components.remove(the_component)
+            if not a_components:
+                del self.component_types[a_type]
+        if the_component is self.collider_component:
+            self.collider_component = next((x for x in self.components if x.collider), None)
+            self.update_collider()
+
+    def update_archetype(self):
+        """update_archetype moves the entity to the scene archetype for its
+        loaded components, if the entity is loaded in a scene.
+        """
+        if self.scene is not None and self.loaded:
+            self.scene.archetypes.update_entity(self)
+
+    def update_collider(self):
+        """update_collider updates the entity in the scene collision
+        collection after the collider component changes, if the entity is
+        loaded in a scene.
+        """
+        if self.scene is not None and self.loaded:
+            self.scene.update_collider_entity(self)
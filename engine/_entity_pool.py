@@ -0,0 +1,77 @@
+"""_entity_pool.py contains the EntityPool class, used to reuse entities
+which are created and destroyed very often, like bullets, particles or
+pickups.
+"""
+
+
+class EntityPool:
+    """EntityPool class keeps entities released from a scene parked, with all
+    their components loaded and started, so they can be spawned again without
+    creating new entities, components or delegates.
+
+    Entities are created with the pool factory when there is not any parked
+    entity. The pool reset function is called for every parked entity being
+    spawned again, with the same arguments given to spawn, and it has to
+    restore any state changed while the entity was being used.
+    """
+
+    def __init__(self, the_factory, the_reset=None, the_capacity=None):
+        """__init__ initializes EntityPool instance.
+
+        Args:
+            the_factory (callable): creates a new entity using spawn
+                arguments.
+            the_reset (callable): resets a parked entity using the entity and
+                spawn arguments.
+            the_capacity (int): maximum number of parked entities, entities
+                released when the pool is full are destroyed.
+        """
+        self.factory = the_factory
+        self.reset = the_reset
+        self.capacity = the_capacity
+        self.entities = []
+
+    def __len__(self):
+        return len(self.entities)
+
+    def fill(self, the_count, *args, **kwargs):
+        """fill creates entities with the pool factory and parks them, until
+        there are the given number of parked entities.
+        """
+        while len(self.entities) < the_count:
+            self.entities.append(self.factory(*args, **kwargs))
+
+    def park(self, the_entity):
+        """park stores the given entity in the pool, it is called by the scene
+        once a released entity has been removed. If the pool is full the
+        entity is destroyed.
+        """
+        if self.capacity is not None and len(self.entities) >= self.capacity:
+            the_entity.on_destroy()
+            return False
+        self.entities.append(the_entity)
+        return True
+
+    def release(self, the_entity):
+        """release removes the given entity from its scene without destroying
+        it, and parks it at the end of the frame. It returns False if the
+        entity is not in any scene.
+        """
+        if the_entity.scene is None:
+            return False
+        return the_entity.scene.release_entity(the_entity, self)
+
+    def spawn(self, the_scene, *args, **kwargs):
+        """spawn adds an entity to the given scene and returns it. A parked
+        entity is reset and reused if available, if not a new entity is
+        created with the pool factory.
+        """
+        if self.entities:
+            a_entity = self.entities.pop()
+            if self.reset is not None:
+                self.reset(a_entity, *args, **kwargs)
+            the_scene.spawn_entity(a_entity)
+        else:
+            a_entity = self.factory(*args, **kwargs)
+            the_scene.add_entity(a_entity)
+        return a_entity
@@ -0,0 +1,63 @@
+"""_entity_set.py contains the EntitySet class, used to keep entities in the
+same order they were added while removing any of them in constant time.
+"""
+
+
+class EntitySet:
+    """EntitySet class keeps entities indexed by the entity id, in the order
+    they were added. Adding, removing and checking an entity are constant
+    time operations, and iterating follows the insertion order.
+
+    Entities can not be added or removed while the set is being iterated.
+    """
+
+    def __init__(self, the_entities=None):
+        """__init__ initializes EntitySet instance.
+
+        Args:
+            the_entities (iterable): entities to add to the set.
+        """
+        self.entities = {}  # [entity_id]Entity
+        if the_entities is not None:
+            for a_entity in the_entities:
+                self.entities[a_entity.id] = a_entity
+
+    def __contains__(self, the_entity):
+        return self.entities.get(the_entity.id, None) is the_entity
+
+    def __getitem__(self, the_index):
+        # entities are not stored in a list, so indexing and slicing copy
+        # all of them, they should not be used every frame.
+        return list(self.entities.values())[the_index]
+
+    def __iter__(self):
+        return iter(self.entities.values())
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __repr__(self):
+        return "EntitySet({})".format(list(self.entities.values()))
+
+    def add(self, the_entity):
+        """add adds the given entity at the end of the set. An entity already
+        in the set keeps its position.
+        """
+        self.entities.setdefault(the_entity.id, the_entity)
+
+    def clear(self):
+        """clear removes all entities.
+        """
+        self.entities = {}
+
+    def discard(self, the_entity):
+        """discard removes the given entity from the set. It returns False if
+        the entity was not in the set.
+        """
+        return self.entities.pop(the_entity.id, None) is not None
+
+    def first(self):
+        """first returns the first entity added to the set, or None if the set
+        is empty.
+        """
+        return next(iter(self.entities.values()), None)
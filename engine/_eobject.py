@@ -9,6 +9,8 @@ class EObject(IObject):
     """EObject extends IObject for any object using the Engine.
     """
 
+    __slots__ = ("engine", "state", "running", "_cache")
+
     def __init__(self, the_name, the_engine=None, **kwargs):
         """__init__ initializes an EObject instance.
         """
@@ -17,12 +19,33 @@ class EObject(IObject):
         self.engine = the_engine
         self.state = "created"
         self.running = False
-        self.cache = {}
+        self._cache = None
+
+    @property
+    def cache(self):
+        """cache returns instance data cache, it is created the first time it
+        is required.
+        """
+        if self._cache is None:
+            self._cache = {}
+        return self._cache
+
+    def clone(self):
+        """clone returns a copy of the instance with a new id and an empty
+        cache, created without calling __init__.
+        """
+        a_clone = super().clone()
+        a_clone.state = "created"
+        a_clone.running = False
+        a_clone._cache = None
+        return a_clone
 
     def get_cache(self, the_key):
         """get_cache retrieves instance data cache for the given key.
         """
-        return self.cache.get(the_key, None)
+        if self._cache is None:
+            return None
+        return self._cache.get(the_key, None)
 
     def get_cursor_manager(self):
         """get_cursor_manager returns the engine CursorManager.
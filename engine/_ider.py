@@ -1,27 +1,48 @@
 """_ider.py generates unique identifications to be used by the
 application.
+
+Identifications are integers, and the Ider keeps a registry with all live
+objects by identification, it uses weak references so objects are removed
+from the registry when they are not used anymore.
 """
 
+import weakref
+
 
 class Ider:
-    """Ider class contains a unique identification generator.
+    """Ider class contains a unique identification generator and the registry
+    for all objects using those identifications.
     """
 
     def __init__(self):
         """__init__ initializes the Ider instance.
         """
         self._ider = 0
+        self.objects = weakref.WeakValueDictionary()    # [id]object
+
+    def get(self, the_id):
+        """get returns the live object for the given identification or None
+        if it does not exist.
+        """
+        return self.objects.get(the_id, None)
+
+    def register(self, the_object):
+        """register adds the given object to the registry using the object
+        identification.
+        """
+        self.objects[the_object.id] = the_object
 
     def reset(self):
-        """reset resets the identification to zero.
+        """reset resets the identification to zero and clears the registry.
         """
         self._ider = 0
+        self.objects = weakref.WeakValueDictionary()
 
     def next(self):
         """next returns the next identification.
         """
         self._ider += 1
-        return str(self._ider)
+        return self._ider
 
 
 # _ider contains the Ider singleton.
@@ -4,18 +4,28 @@ will derive.
 
 from ._ider import get_ider
 
+# SLOTS_CACHE keeps all slot names for every class being cloned.
+SLOTS_CACHE = {}    # [type]tuple(str)
+
 
 class IObject:
     """IObject is the basic and generic object for any other class.
+
+    Core engine classes declare __slots__ to keep instances compact, classes
+    deriving from them without __slots__ can still add any attribute.
     """
 
+    __slots__ = ("id", "name", "loaded", "started", "tag", "dirty", "active", "visible", "__weakref__")
+
     def __init__(self, the_name, **kwargs):
         """__init__ initializes the IObject instance.
 
         Args:
             the_name (str): IObject instance name.
         """
-        self.id = get_ider().next()
+        a_ider = get_ider()
+        self.id = a_ider.next()
+        a_ider.register(self)
         self.name = the_name
         self.loaded = kwargs.get("loaded", False)
         self.started = kwargs.get("started", False)
@@ -24,6 +34,54 @@ class IObject:
         self.active = kwargs.get("active", True)
         self.visible = kwargs.get("visible", True)
 
+    def clone(self):
+        """clone returns a copy of the instance with a new id, created without
+        calling __init__. Lists, dictionaries and sets are copied, any other
+        attribute is shared with the instance.
+        """
+        a_klass = type(self)
+        a_clone = a_klass.__new__(a_klass)
+        for a_slot in IObject.get_slots(a_klass):
+            try:
+                a_value = getattr(self, a_slot)
+            except AttributeError:
+                continue
+            if isinstance(a_value, (list, dict, set)):
+                a_value = a_value.copy()
+            setattr(a_clone, a_slot, a_value)
+        a_dict = getattr(self, "__dict__", None)
+        if a_dict:
+            for a_key, a_value in a_dict.items():
+                setattr(a_clone, a_key, a_value.copy() if isinstance(a_value, (list, dict, set)) else a_value)
+        a_ider = get_ider()
+        a_clone.id = a_ider.next()
+        a_ider.register(a_clone)
+        return a_clone
+
+    @staticmethod
+    def get_object(the_id):
+        """get_object returns the live object for the given id in constant
+        time, or None if there is not any object with that id.
+        """
+        return get_ider().get(the_id)
+
+    @staticmethod
+    def get_slots(the_klass):
+        """get_slots returns all slot names declared by the given class and
+        its base classes.
+        """
+        a_slots = SLOTS_CACHE.get(the_klass, None)
+        if a_slots is None:
+            a_slots = []
+            for a_klass in the_klass.__mro__:
+                a_klass_slots = a_klass.__dict__.get("__slots__", ())
+                if isinstance(a_klass_slots, str):
+                    a_klass_slots = (a_klass_slots,)
+                a_slots.extend(x for x in a_klass_slots if x not in ("__dict__", "__weakref__") and x not in a_slots)
+            a_slots = tuple(a_slots)
+            SLOTS_CACHE[the_klass] = a_slots
+        return a_slots
+
     @staticmethod
     def lookup_by_active(the_iter):
         """lookup_by_active returns a list of entries in the given iterable
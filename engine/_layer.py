@@ -0,0 +1,153 @@
+"""_layer.py contains the Layer class, used to render scene entities in
+order.
+"""
+
+from bisect import insort
+from ._entity import Entity
+from ._entity_set import EntitySet
+
+
+class Layer:
+    """Layer class contains entities rendered together. Scene layers are
+    rendered from the lowest to the highest z value, and entities in a layer
+    are rendered by the layer sort key, or in the order they were added if
+    the layer does not have any sort key.
+
+    Entities are kept sorted by inserting them in place. Sort keys can change
+    while entities move, they are computed again before rendering and
+    entities are moved with insertion sort, which is close to linear when
+    only a few entities change their place in a frame. Removed entities are
+    purged in a single pass the next time the layer is rendered.
+
+    The layer render batch keeps the render methods for all entities in the
+    layer, it is only built again when entities are added, removed or change
+    their place, or when any entity dispatch list changes.
+    """
+
+    def __init__(self, the_name, the_z=0, the_sort_key=None):
+        """__init__ initializes Layer instance.
+
+        Args:
+            the_name (str): layer name.
+            the_z (int): layer z value.
+            the_sort_key (callable): returns the sort key for an entity.
+        """
+        self.name = the_name
+        self.z = the_z
+        self.sort_key = the_sort_key
+        self.entities = EntitySet()
+        self.order = []     # list([key, sequence, entity])
+        self.sequence = 0
+        self.removed = set()
+        self.batch = None   # list((entity, list(method)))
+
+    def __contains__(self, the_entity):
+        return the_entity in self.entities
+
+    def __iter__(self):
+        return iter([a_entity for a_entity, _ in self.get_batch()])
+
+    def __len__(self):
+        return len(self.entities)
+
+    @staticmethod
+    def y_sort(the_entity):
+        """y_sort returns the bottom of the entity rectangle, it can be used
+        as sort key for top-down games, where entities lower in the screen
+        are rendered on top.
+        """
+        return the_entity.transform.get_rect().bottom
+
+    def add(self, the_entity):
+        """add inserts the given entity in its place in the layer.
+        """
+        if the_entity in self.entities:
+            return
+        if the_entity.id in self.removed:
+            self.purge()
+        self.entities.add(the_entity)
+        a_entry = [self.sort_key(the_entity) if self.sort_key is not None else 0, self.sequence, the_entity]
+        self.sequence += 1
+        if self.sort_key is None:
+            self.order.append(a_entry)
+        else:
+            insort(self.order, a_entry)
+        self.batch = None
+
+    def clear(self):
+        """clear removes all entities.
+        """
+        self.entities.clear()
+        self.order = []
+        self.removed = set()
+        self.batch = None
+
+    def clear_batch(self):
+        """clear_batch clears the render batch, so it is built again the next
+        time the layer is rendered.
+        """
+        self.batch = None
+
+    def discard(self, the_entity):
+        """discard removes the given entity from the layer. It returns False if
+        the entity was not in the layer.
+        """
+        if not self.entities.discard(the_entity):
+            return False
+        self.removed.add(the_entity.id)
+        self.batch = None
+        return True
+
+    def get_batch(self):
+        """get_batch returns a list with every entity in the layer in render
+        order and the list of render methods to call for it. The list should
+        not be modified.
+        """
+        if self.removed:
+            self.purge()
+        if self.sort_key is not None and self.sort():
+            self.batch = None
+        if self.batch is None:
+            self.batch = []
+            for _, _, a_entity in self.order:
+                if type(a_entity).on_render is not Entity.on_render:
+                    self.batch.append((a_entity, [a_entity.on_render]))
+                else:
+                    self.batch.append((a_entity, [x.on_render for x in a_entity.get_dispatch("on_render")]))
+        return self.batch
+
+    def on_render(self):
+        """on_render calls render methods for all visible entities in the
+        layer. It can be overridden to group all draw calls for the layer.
+        """
+        for a_entity, a_calls in self.get_batch():
+            if not a_entity.visible:
+                continue
+            for a_call in a_calls:
+                a_call()
+
+    def purge(self):
+        """purge removes entries for removed entities in a single pass.
+        """
+        self.order = [a_entry for a_entry in self.order if a_entry[2].id not in self.removed]
+        self.removed = set()
+
+    def sort(self):
+        """sort computes sort keys again and moves entities to their place
+        using insertion sort. It returns True if any entity was moved.
+        """
+        a_sort_key = self.sort_key
+        a_order = self.order
+        a_moved = False
+        for a_entry in a_order:
+            a_entry[0] = a_sort_key(a_entry[2])
+        for i in range(1, len(a_order)):
+            a_entry = a_order[i]
+            j = i - 1
+            while j >= 0 and a_order[j] > a_entry:
+                a_order[j + 1] = a_order[j]
+                j -= 1
+            if j != i - 1:
+                a_order[j + 1] = a_entry
+                a_moved = True
+        return a_moved
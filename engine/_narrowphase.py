@@ -0,0 +1,182 @@
+"""_narrowphase.py contains the precise collision test for candidate pairs
+provided by the broadphase.
+
+When NumPy is installed, collider rectangles and circles are gathered in
+contiguous arrays once per frame and all candidate pairs are tested with
+vectorized comparisons. If NumPy is not available, every pair is tested one
+by one, rectangles with pygame.Rect.colliderect.
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# NUMPY_MIN_PAIRS is the minimum number of candidate pairs to use the
+# vectorized path, smaller sets are faster using the scalar path.
+NUMPY_MIN_PAIRS = 32
+
+# NUMPY_CHUNK_ROWS is the number of rows tested at once when all pairs have
+# to be checked, it keeps overlap matrices in a bounded size.
+NUMPY_CHUNK_ROWS = 512
+
+
+def collide_rects(the_rects, the_pairs=None):
+    """collide_rects returns the list of index pairs (i, j) for colliding
+    rectangles, in the same order given by the_pairs. If the_pairs is None,
+    all pairs with i < j are tested, and they are returned sorted.
+    """
+    if the_pairs is None:
+        a_len = len(the_rects)
+        if numpy is not None and (a_len * (a_len - 1)) // 2 >= NUMPY_MIN_PAIRS:
+            return collide_all_rects_numpy(the_rects)
+        the_pairs = [(i, j) for i in range(a_len) for j in range(i + 1, a_len)]
+    if numpy is not None and len(the_pairs) >= NUMPY_MIN_PAIRS:
+        return collide_rects_numpy(the_rects, the_pairs)
+    return collide_rects_scalar(the_rects, the_pairs)
+
+
+def collide_rects_scalar(the_rects, the_pairs):
+    """collide_rects_scalar tests every pair with pygame.Rect.colliderect.
+    """
+    return [(i, j) for i, j in the_pairs if the_rects[i].colliderect(the_rects[j])]
+
+
+def get_rect_bounds(the_rects):
+    """get_rect_bounds returns left, top, right and bottom arrays for the
+    given rectangles and a mask with rectangles that can collide.
+    Rectangles with negative width or height are normalized, and those with
+    zero width or height never collide, as pygame does.
+    """
+    a_array = numpy.array([tuple(a_rect) for a_rect in the_rects], dtype=numpy.int64).reshape(-1, 4)
+    a_x, a_y, a_w, a_h = a_array[:, 0], a_array[:, 1], a_array[:, 2], a_array[:, 3]
+    a_left = numpy.minimum(a_x, a_x + a_w)
+    a_right = numpy.maximum(a_x, a_x + a_w)
+    a_top = numpy.minimum(a_y, a_y + a_h)
+    a_bottom = numpy.maximum(a_y, a_y + a_h)
+    return a_left, a_top, a_right, a_bottom, (a_w != 0) & (a_h != 0)
+
+
+def collide_rects_numpy(the_rects, the_pairs):
+    """collide_rects_numpy tests all given pairs at once using NumPy arrays.
+    """
+    a_left, a_top, a_right, a_bottom, a_valid = get_rect_bounds(the_rects)
+    a_pairs = numpy.array(the_pairs, dtype=numpy.intp).reshape(-1, 2)
+    a_i = a_pairs[:, 0]
+    a_j = a_pairs[:, 1]
+    a_mask = (a_valid[a_i] & a_valid[a_j] &
+              (a_left[a_i] < a_right[a_j]) & (a_left[a_j] < a_right[a_i]) &
+              (a_top[a_i] < a_bottom[a_j]) & (a_top[a_j] < a_bottom[a_i]))
+    return list(zip(a_i[a_mask].tolist(), a_j[a_mask].tolist()))
+
+
+def collide_all_rects_numpy(the_rects):
+    """collide_all_rects_numpy tests all pairs of rectangles using NumPy
+    broadcasting, processing blocks of rows to bound memory usage.
+    """
+    a_left, a_top, a_right, a_bottom, a_valid = get_rect_bounds(the_rects)
+    a_len = len(the_rects)
+    a_columns = numpy.arange(a_len)
+    a_result = []
+    for a_start in range(0, a_len, NUMPY_CHUNK_ROWS):
+        a_end = min(a_len, a_start + NUMPY_CHUNK_ROWS)
+        a_rows = slice(a_start, a_end)
+        a_mask = ((a_left[a_rows, None] < a_right[None, :]) & (a_left[None, :] < a_right[a_rows, None]) &
+                  (a_top[a_rows, None] < a_bottom[None, :]) & (a_top[None, :] < a_bottom[a_rows, None]))
+        a_mask &= a_valid[a_rows, None] & a_valid[None, :]
+        a_mask &= a_columns[None, :] > numpy.arange(a_start, a_end)[:, None]
+        a_i, a_j = numpy.nonzero(a_mask)
+        a_result.extend(zip((a_i + a_start).tolist(), a_j.tolist()))
+    return a_result
+
+
+def collide_colliders(the_rects, the_circles, the_pairs=None):
+    """collide_colliders returns the list of index pairs (i, j) for colliding
+    colliders, where the_circles has the (x, y, radius) tuple for circle
+    colliders and None for rectangle colliders. If the_circles is None all
+    colliders are rectangles.
+    """
+    if the_circles is None:
+        return collide_rects(the_rects, the_pairs)
+    if the_pairs is None:
+        a_len = len(the_rects)
+        the_pairs = [(i, j) for i in range(a_len) for j in range(i + 1, a_len)]
+    if numpy is not None and len(the_pairs) >= NUMPY_MIN_PAIRS:
+        return collide_colliders_numpy(the_rects, the_circles, the_pairs)
+    return collide_colliders_scalar(the_rects, the_circles, the_pairs)
+
+
+def collide_circle_rect_scalar(the_circle, the_rect):
+    """collide_circle_rect_scalar returns if the given circle and rectangle
+    collide, using the squared distance from the circle center to the
+    closest point in the rectangle.
+    """
+    if the_rect.w == 0 or the_rect.h == 0:
+        return False
+    a_x, a_y, a_radius = the_circle
+    a_left = min(the_rect.x, the_rect.x + the_rect.w)
+    a_right = max(the_rect.x, the_rect.x + the_rect.w)
+    a_top = min(the_rect.y, the_rect.y + the_rect.h)
+    a_bottom = max(the_rect.y, the_rect.y + the_rect.h)
+    a_dx = a_x - min(max(a_x, a_left), a_right)
+    a_dy = a_y - min(max(a_y, a_top), a_bottom)
+    return a_dx * a_dx + a_dy * a_dy < a_radius * a_radius
+
+
+def collide_colliders_scalar(the_rects, the_circles, the_pairs):
+    """collide_colliders_scalar tests every pair using the collider shapes.
+    """
+    a_result = []
+    for i, j in the_pairs:
+        a_one = the_circles[i]
+        a_other = the_circles[j]
+        if a_one is None and a_other is None:
+            a_collide = the_rects[i].colliderect(the_rects[j])
+        elif a_one is None:
+            a_collide = collide_circle_rect_scalar(a_other, the_rects[i])
+        elif a_other is None:
+            a_collide = collide_circle_rect_scalar(a_one, the_rects[j])
+        else:
+            a_dx = a_one[0] - a_other[0]
+            a_dy = a_one[1] - a_other[1]
+            a_radius = a_one[2] + a_other[2]
+            a_collide = a_dx * a_dx + a_dy * a_dy < a_radius * a_radius
+        if a_collide:
+            a_result.append((i, j))
+    return a_result
+
+
+def collide_colliders_numpy(the_rects, the_circles, the_pairs):
+    """collide_colliders_numpy tests all given pairs at once using NumPy
+    arrays. Rectangle-rectangle, circle-circle and circle-rectangle pairs
+    are tested with their own vectorized comparisons using squared
+    distances.
+    """
+    a_left, a_top, a_right, a_bottom, a_valid = get_rect_bounds(the_rects)
+    a_is_circle = numpy.array([a_circle is not None for a_circle in the_circles], dtype=bool)
+    a_circles = numpy.array([a_circle if a_circle is not None else (0.0, 0.0, 0.0) for a_circle in the_circles], dtype=numpy.float64).reshape(-1, 3)
+    a_x, a_y, a_radius = a_circles[:, 0], a_circles[:, 1], a_circles[:, 2]
+    a_pairs = numpy.array(the_pairs, dtype=numpy.intp).reshape(-1, 2)
+    a_i = a_pairs[:, 0]
+    a_j = a_pairs[:, 1]
+    a_i_circle = a_is_circle[a_i]
+    a_j_circle = a_is_circle[a_j]
+    # rectangle - rectangle
+    a_mask = (a_valid[a_i] & a_valid[a_j] &
+              (a_left[a_i] < a_right[a_j]) & (a_left[a_j] < a_right[a_i]) &
+              (a_top[a_i] < a_bottom[a_j]) & (a_top[a_j] < a_bottom[a_i]))
+    a_mask &= ~a_i_circle & ~a_j_circle
+    # circle - circle
+    a_dx = a_x[a_i] - a_x[a_j]
+    a_dy = a_y[a_i] - a_y[a_j]
+    a_sum = a_radius[a_i] + a_radius[a_j]
+    a_mask |= a_i_circle & a_j_circle & (a_dx * a_dx + a_dy * a_dy < a_sum * a_sum)
+    # circle - rectangle, in both orders.
+    a_circle = numpy.where(a_i_circle, a_i, a_j)
+    a_rect = numpy.where(a_i_circle, a_j, a_i)
+    a_dx = a_x[a_circle] - numpy.clip(a_x[a_circle], a_left[a_rect], a_right[a_rect])
+    a_dy = a_y[a_circle] - numpy.clip(a_y[a_circle], a_top[a_rect], a_bottom[a_rect])
+    a_mask |= ((a_i_circle != a_j_circle) & a_valid[a_rect] &
+               (a_dx * a_dx + a_dy * a_dy < a_radius[a_circle] * a_radius[a_circle]))
+    return list(zip(a_i[a_mask].tolist(), a_j[a_mask].tolist()))
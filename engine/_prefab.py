@@ -0,0 +1,52 @@
+"""_prefab.py contains the Prefab class, used to describe an entity once and
+create many copies of it.
+"""
+
+from pygame.math import Vector2
+from ._iobject import IObject
+
+
+class Prefab:
+    """Prefab class keeps a template entity, with its transform, components
+    and children, which is never added to any scene. Copies are created by
+    cloning the template, without calling __init__ for the entity and its
+    components or logging every one of them.
+    """
+
+    def __init__(self, the_entity):
+        """__init__ initializes Prefab instance.
+
+        Args:
+            the_entity (Entity): template entity.
+        """
+        self.entity = the_entity
+        self.compile(the_entity)
+
+    @property
+    def name(self):
+        """name returns the template entity name.
+        """
+        return self.entity.name
+
+    def compile(self, the_entity):
+        """compile caches slot names for the given entity, its components and
+        its children, so they are not looked up when copies are created.
+        """
+        IObject.get_slots(type(the_entity))
+        for a_component in the_entity.components:
+            IObject.get_slots(type(a_component))
+        for a_child in the_entity.children:
+            self.compile(a_child)
+
+    def instantiate(self, the_count=1, the_positions=None):
+        """instantiate returns a list with the given number of copies of the
+        template entity. the_positions can provide the position for every
+        copy, as a list of vectors or a NumPy array with one row for every
+        copy.
+        """
+        a_template = self.entity
+        a_entities = [a_template.clone() for _ in range(the_count)]
+        if the_positions is not None:
+            for a_entity, a_position in zip(a_entities, the_positions):
+                a_entity.transform.position = Vector2(float(a_position[0]), float(a_position[1]))
+        return a_entities
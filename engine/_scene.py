@@ -1,35 +1,120 @@
 """_scene.py contais the Scene base class, used for any scene in the game.
 """
 
+from bisect import bisect_right
 import pygame
+from ._aabb_tree import AABBTree
+from ._archetype import ArchetypeStorage
+from ._broadphase import BruteForceBroadphase, GridBroadphase, SweepAndPruneBroadphase, is_layer_compatible
+from ._command_buffer import CommandBuffer
+from ._entity import Entity
+from ._entity_set import EntitySet
 from ._eobject import EObject
+from ._layer import Layer
 from ._loggar import Log
+from ._narrowphase import collide_colliders
+from ._transform import TransformPool
 
 
 class Scene(EObject):
     """Scene class identifies a scene.
+
+    Entities, layers and collision collections are kept in entity sets, so
+    entities are removed in constant time from all of them while keeping
+    the order they were added for rendering and collisions.
+
+    Layers are rendered from the lowest to the highest z value. LAYERS are
+    added when the scene is initialized, using their position as z value,
+    and any other layer can be added with add_layer.
+
+    Entity hooks in DISPATCH_HOOKS are called using scene dispatch lists,
+    with the component methods to call for every loaded entity, or the
+    entity method if the entity class overrides the hook. Lists are built
+    again only when loaded entities or their dispatch lists change.
     """
     LAYERS = ["background", "middle", "top"]
     SCENE_HANDLER_ENTITY_NAME = "SceneHandlerEntity"
     SCENE_HANDLER_COMPONENT_NAME = "SceneHandlerComponent"
     ON_COLLISION_EVENT_NAME = "on-collision-event"
+    ON_COLLISION_ENTER_EVENT_NAME = "on-collision-enter-event"
+    ON_COLLISION_STAY_EVENT_NAME = "on-collision-stay-event"
+    ON_COLLISION_EXIT_EVENT_NAME = "on-collision-exit-event"
     ON_DESTROY_EVENT_NAME = "on-destroy-event"
-    ON_LOAD_EVENT_NAME = "on-load_event"    
+    ON_LOAD_EVENT_NAME = "on-load_event"
+    COLLISION_MODE_BRUTE_FORCE = "collision-mode:brute-force"
+    COLLISION_MODE_GRID = "collision-mode:grid"
+    COLLISION_MODE_SWEEP_AND_PRUNE = "collision-mode:sweep-and-prune"
+    # collision-mode:circle was the original default mode, it is kept as an
+    # alias for the default broadphase.
+    COLLISION_MODE_CIRCLE = "collision-mode:circle"
+    # DISPATCH_HOOKS maps every entity hook to the component hook called by
+    # the entity for it.
+    DISPATCH_HOOKS = {
+        "on_after_update": "on_after_update",
+        "on_frame_end": "on_frame_start",
+        "on_frame_start": None,
+        "on_update": "on_update",
+    }
+    BROADPHASES = {
+        COLLISION_MODE_BRUTE_FORCE: lambda the_kwargs: BruteForceBroadphase(),
+        COLLISION_MODE_GRID: lambda the_kwargs: GridBroadphase(the_kwargs.get("collision_cell_size", None)),
+        COLLISION_MODE_SWEEP_AND_PRUNE: lambda the_kwargs: SweepAndPruneBroadphase(),
+        COLLISION_MODE_CIRCLE: lambda the_kwargs: GridBroadphase(the_kwargs.get("collision_cell_size", None)),
+    }
 
     def __init__(self, the_name, the_engine=None, **kwargs):
         """__init__ initialized the Scene instance.
         """
         super().__init__(the_name, the_engine)
-        self.entities = list()
+        self.entities = EntitySet()
         self.to_delete_entities = list()
-        self.loaded_entities = list()
-        self.unloaded_entities = list()
-        self.layers = dict()
+        # to_release_entities keeps entities released to an entity pool with
+        # the pool, and spawned_entities those spawned again from a pool,
+        # they are not unloaded or loaded again.
+        self.to_release_entities = list()   # list((Entity, EntityPool))
+        self.spawned_entities = EntitySet()
+        # command_buffer records structural changes done while entities are
+        # being updated, they are applied in on_after_update.
+        self.command_buffer = CommandBuffer()
+        self.dispatch = None    # [hook]list(method)
+        self.loaded_entities = EntitySet()
+        self.unloaded_entities = EntitySet()
+        self.layers = dict()    # [name]Layer
+        self.layer_order = list()   # list(Layer) sorted by z
+        self.archetypes = ArchetypeStorage()
+        # entity_names and entity_tags index entities added to the scene by
+        # name and by the tag they had when they were added.
+        self.entity_names = dict()  # [name]EntitySet
+        self.entity_tags = dict()   # [tag]EntitySet
+        self.scene_handler_component = None
+        self.collision_delegates = None
         self.scene_code = None
         self.tag = kwargs.get("tag", None)
-        self.collision_mode = kwargs.get("collision_mode", "collision-mode:circle")
+        self.collision_mode = kwargs.get("collision_mode", self.COLLISION_MODE_GRID)
         self.collision_check = kwargs.get("collision_check", True)
-        self.collision_collection = list()
+        self.collision_collection = EntitySet()
+        # dynamic colliders are checked every frame using the broadphase,
+        # static colliders are indexed in a tree only rebuilt when static
+        # colliders are added or removed.
+        self.dynamic_collision_collection = EntitySet()
+        self.static_collision_collection = EntitySet()
+        self.static_collision_index = AABBTree(0)
+        self.static_collision_dirty = False
+        # collision_order keeps the position every collider was added to the
+        # collision collection, used to trigger collisions in that order.
+        self.collision_order = dict()   # [entity_id]int
+        self.collision_sequence = 0
+        # collision_stay_frames is the number of frames between two stay
+        # events for the same contact, zero disables stay events.
+        self.collision_stay_frames = kwargs.get("collision_stay_frames", 1)
+        self.contacts = dict()  # [(entity_id, entity_id)][one_entity, other_entity, frames]
+        if self.collision_mode not in self.BROADPHASES:
+            Log.Scene(self.name).Error("unknown collision mode {}".format(self.collision_mode)).call()
+            raise Exception("unknown collision mode {}".format(self.collision_mode))
+        self.broadphase = self.BROADPHASES[self.collision_mode](kwargs)
+        self.spatial_index = AABBTree(kwargs.get("spatial_index_margin", 8))
+        self.transform_pool = TransformPool() if TransformPool.is_available() else None
+        self.spatial_index_dirty = False
 
     def add_entity(self, the_entity):
         """add_entity adds a new entity to the scene. If the entity has
@@ -37,57 +122,298 @@ class Scene(EObject):
         recursive way.
         """
         Log.Scene(self.name).AddEntity(the_entity.name).call()
-        self.entities.append(the_entity)
-        self.unloaded_entities.append(the_entity)
-        the_entity.engine = self.engine
-        the_entity.scene = self
-        for a_entity_child in the_entity.children:
-            self.add_entity(a_entity_child)
+        self.insert_entity(the_entity)
         return True
 
+    def add_layer(self, the_name, the_z=0, the_sort_key=None):
+        """add_layer adds a new layer to the scene and returns it. Layers with
+        the same z value are rendered in the order they were added.
+        the_sort_key can provide a function returning the key used to sort
+        entities in the layer, like Layer.y_sort.
+        """
+        if the_name in self.layers:
+            Log.Scene(self.name).Error("layer {} already exists".format(the_name)).call()
+            raise Exception("layer {} already exists".format(the_name))
+        a_layer = Layer(the_name, the_z, the_sort_key)
+        a_index = bisect_right([a_other.z for a_other in self.layer_order], the_z)
+        self.layer_order.insert(a_index, a_layer)
+        self.layers[the_name] = a_layer
+        return a_layer
+
+    def add_collider_entity(self, the_entity):
+        """add_collider_entity adds the given entity to the collision
+        collection, as a static or dynamic collider.
+        """
+        self.collision_collection.add(the_entity)
+        self.collision_order[the_entity.id] = self.collision_sequence
+        self.collision_sequence += 1
+        if the_entity.has_static_collider():
+            self.static_collision_collection.add(the_entity)
+            self.static_collision_dirty = True
+        else:
+            self.dynamic_collision_collection.add(the_entity)
+            self.broadphase.add(the_entity)
+
     def check_collisions(self):
         """check_collisions checks collisions between all entities in the
-        scene.
+        scene. Collider rectangles and circles are computed once per frame,
+        the scene broadphase provides candidate pairs using rectangles and the
+        narrowphase tests all of them at once using collider shapes.
+
+        Static colliders are only tested against dynamic colliders, using the
+        static collision index. Pairs of colliders where the category for one
+        of them is not in the mask for the other one are never tested.
+
+        Colliding pairs are kept in the scene contact set. On collision event
+        is triggered for every colliding pair, on collision enter and exit
+        are triggered when the contact starts and ends, and on collision stay
+        every collision_stay_frames while the contact is kept.
         """
-        for i in range(len(self.collision_collection)):
-            for j in range(i + 1, len(self.collision_collection)):
-                i_entity = self.collision_collection[i]
-                i_collider = i_entity.get_collider()
-                if i_collider is None:
-                    continue
-                j_entity = self.collision_collection[j]
-                j_collider = j_entity.get_collider()
-                if j_collider is None:
+        a_entities = list()
+        a_rects = list()
+        a_layers = list()
+        a_circles = list()
+        for a_entity in self.dynamic_collision_collection:
+            a_collider = a_entity.get_collider_component()
+            if a_collider is None:
+                continue
+            a_entities.append(a_entity)
+            a_rects.append(a_collider.get_collider_rect())
+            a_layers.append((a_collider.category, a_collider.mask))
+            a_circles.append(a_collider.get_collider_circle() if a_collider.shape == a_collider.COLLIDER_SHAPE_CIRCLE else None)
+        # layers are only used when there are colliders that can not collide
+        # with some other collider.
+        a_layer_set = set(a_layers)
+        if len(a_layer_set) <= 1 and all(is_layer_compatible(a_layer, a_layer) for a_layer in a_layer_set):
+            a_dynamic_layers = None
+        else:
+            a_dynamic_layers = a_layers
+        if self.broadphase.all_pairs and a_dynamic_layers is None:
+            a_pairs = None
+        else:
+            a_pairs = self.broadphase.get_pairs(a_entities, a_rects, a_dynamic_layers)
+        a_collisions = collide_colliders(a_rects, a_circles if any(a_circles) else None, a_pairs)
+        if self.static_collision_collection:
+            a_collisions.extend(self.check_static_collisions(a_entities, a_rects, a_layers, a_circles))
+            a_order = self.collision_order
+            a_collisions = [(i, j) if a_order[a_entities[i].id] < a_order[a_entities[j].id] else (j, i) for i, j in a_collisions]
+            a_collisions.sort(key=lambda x: (a_order[a_entities[x[0]].id], a_order[a_entities[x[1]].id]))
+        a_delegates = None
+        a_contacts = dict()
+        for i, j in a_collisions:
+            if a_delegates is None:
+                a_delegates = self.get_collision_delegates()
+            a_one_entity = a_entities[i]
+            a_other_entity = a_entities[j]
+            a_key = (a_one_entity.id, a_other_entity.id) if a_one_entity.id < a_other_entity.id else (a_other_entity.id, a_one_entity.id)
+            self.trigger_collision_delegate(a_delegates[self.ON_COLLISION_EVENT_NAME], a_one_entity, a_other_entity)
+            a_contact = self.contacts.get(a_key, None)
+            if a_contact is None:
+                a_contact = [a_one_entity, a_other_entity, 0]
+                self.trigger_collision_delegate(a_delegates[self.ON_COLLISION_ENTER_EVENT_NAME], a_one_entity, a_other_entity)
+            else:
+                a_contact[2] += 1
+                if self.collision_stay_frames and a_contact[2] % self.collision_stay_frames == 0:
+                    self.trigger_collision_delegate(a_delegates[self.ON_COLLISION_STAY_EVENT_NAME], a_one_entity, a_other_entity)
+            a_contacts[a_key] = a_contact
+        for a_key, a_contact in self.contacts.items():
+            if a_key not in a_contacts:
+                if a_delegates is None:
+                    a_delegates = self.get_collision_delegates()
+                self.trigger_collision_delegate(a_delegates[self.ON_COLLISION_EXIT_EVENT_NAME], a_contact[0], a_contact[1])
+        self.contacts = a_contacts
+
+    def check_static_collisions(self, the_entities, the_rects, the_layers, the_circles):
+        """check_static_collisions returns collisions between the given
+        dynamic colliders and all static colliders. Static colliders are
+        appended to the given lists and returned pairs use those indexes.
+        """
+        self.update_static_collision_index()
+        a_len = len(the_entities)
+        a_static_indexes = dict()
+        a_pairs = list()
+        for i in range(a_len):
+            for a_entity, a_rect, a_layer, a_circle in self.static_collision_index.query_rect(the_rects[i]):
+                if not is_layer_compatible(the_layers[i], a_layer):
                     continue
-                if i_collider.colliderect(j_collider):
-                    a_scene_entity = self.lookup_by_name(self.entities, self.SCENE_HANDLER_ENTITY_NAME)
-                    a_scene_component = a_scene_entity.lookup_by_name(a_scene_entity.components, self.SCENE_HANDLER_COMPONENT_NAME)
-                    # self.engine.delegate_manager.trigger_delegate(self.engine.delegate_manager.on_collision_delegate.id, True, the_one_entity=i_entity, the_other_entity=j_entity)
-                    self.engine.delegate_manager.trigger_delegate(a_scene_component.get_delegate(self.ON_COLLISION_EVENT_NAME).id, True, the_one_entity=i_entity, the_other_entity=j_entity)
-                    # print("collision {} and {}\n".format(self.collision_collection[i].name, self.collision_collection[j].name))
+                a_static_index = a_static_indexes.get(a_entity.id, None)
+                if a_static_index is None:
+                    a_static_index = len(the_entities)
+                    a_static_indexes[a_entity.id] = a_static_index
+                    the_entities.append(a_entity)
+                    the_rects.append(a_rect)
+                    the_layers.append(a_layer)
+                    the_circles.append(a_circle)
+                a_pairs.append((i, a_static_index))
+        return collide_colliders(the_rects, the_circles if any(the_circles) else None, a_pairs)
+
+    def clear_collisions(self):
+        """clear_collisions removes all colliders and contacts.
+        """
+        self.collision_collection = EntitySet()
+        self.dynamic_collision_collection = EntitySet()
+        self.static_collision_collection = EntitySet()
+        self.static_collision_index.clear()
+        self.static_collision_dirty = False
+        self.collision_order = dict()
+        self.broadphase.clear()
+        self.contacts = dict()
+
+    def clear_dispatch(self):
+        """clear_dispatch clears all dispatch lists, so they are built again
+        the next time they are required, and all layer render batches.
+        """
+        self.dispatch = None
+        for a_layer in self.layer_order:
+            a_layer.clear_batch()
+
+    def clear_entity_indexes(self):
+        """clear_entity_indexes removes all entities from the name and tag
+        indexes, and clears the scene handler cache.
+        """
+        self.entity_names = dict()
+        self.entity_tags = dict()
+        self.scene_handler_component = None
+        self.collision_delegates = None
+
+    def clear_layers(self):
+        """clear_layers removes all entities from every layer, layers are
+        kept.
+        """
+        for a_layer in self.layer_order:
+            a_layer.clear()
+
+    def clear_transform_pool(self):
+        """clear_transform_pool detaches all transforms from the scene
+        transform pool, so they keep their values when entities are unloaded.
+        """
+        if self.transform_pool is not None:
+            self.transform_pool.clear()
+
+    def get_collision_delegates(self):
+        """get_collision_delegates returns a dictionary with all collision
+        delegates in the scene handler component by the event name. It is
+        cached until the scene handler entity is removed.
+        """
+        if self.collision_delegates is None:
+            a_scene_component = self.get_scene_handler_component()
+            self.collision_delegates = {a_event_name: a_scene_component.get_delegate(a_event_name) for a_event_name in [self.ON_COLLISION_EVENT_NAME,
+                                                                                                                      self.ON_COLLISION_ENTER_EVENT_NAME,
+                                                                                                                      self.ON_COLLISION_STAY_EVENT_NAME,
+                                                                                                                      self.ON_COLLISION_EXIT_EVENT_NAME]}
+        return self.collision_delegates
+
+    def get_dispatch(self, the_hook):
+        """get_dispatch returns the list of methods to call for the given
+        entity hook. Entities with unloaded components are always called for
+        on_frame_end, because components are loaded there.
+        """
+        if self.dispatch is None:
+            self.dispatch = dict()
+        a_calls = self.dispatch.get(the_hook, None)
+        if a_calls is None:
+            a_calls = list()
+            a_entity_hook = getattr(Entity, the_hook)
+            a_component_hook = self.DISPATCH_HOOKS[the_hook]
+            for a_entity in self.loaded_entities:
+                if getattr(type(a_entity), the_hook) is not a_entity_hook:
+                    a_calls.append(getattr(a_entity, the_hook))
+                elif the_hook == "on_frame_end" and a_entity.unloaded_components:
+                    a_calls.append(a_entity.on_frame_end)
+                elif a_component_hook is not None:
+                    a_calls.extend(getattr(x, a_component_hook) for x in a_entity.get_dispatch(a_component_hook))
+            self.dispatch[the_hook] = a_calls
+        return a_calls
+
+    def get_entities_by_tag(self, the_tag):
+        """get_entities_by_tag returns all entities in the scene with the given
+        tag.
+        """
+        return list(self.entity_tags.get(the_tag, ()))
+
+    def get_entity_by_name(self, the_name):
+        """get_entity_by_name returns the first entity in the scene with the
+        given name, or None if not found.
+        """
+        a_entities = self.entity_names.get(the_name, None)
+        return a_entities.first() if a_entities else None
+
+    def get_layer(self, the_name):
+        """get_layer returns the layer with the given name, or None if not
+        found.
+        """
+        return self.layers.get(the_name, None)
+
+    def get_scene_handler_component(self):
+        """get_scene_handler_component returns the scene handler component. It
+        is cached until the scene handler entity is removed.
+        """
+        if self.scene_handler_component is None:
+            a_scene_entity = self.get_entity_by_name(self.SCENE_HANDLER_ENTITY_NAME)
+            if a_scene_entity is None:
+                return None
+            self.scene_handler_component = a_scene_entity.lookup_by_name(a_scene_entity.components, self.SCENE_HANDLER_COMPONENT_NAME)
+        return self.scene_handler_component
+
+    def index_entity(self, the_entity):
+        """index_entity adds the given entity to the name and tag indexes.
+        """
+        self.entity_names.setdefault(the_entity.name, EntitySet()).add(the_entity)
+        if the_entity.tag is not None:
+            self.entity_tags.setdefault(the_entity.tag, EntitySet()).add(the_entity)
+
+    def insert_entity(self, the_entity):
+        """insert_entity adds the given entity and all its children to the
+        scene, they are loaded at the start of the next frame.
+        """
+        self.entities.add(the_entity)
+        self.unloaded_entities.add(the_entity)
+        self.index_entity(the_entity)
+        the_entity.engine = self.engine
+        the_entity.scene = self
+        for a_entity_child in the_entity.children:
+            self.insert_entity(a_entity_child)
+
+    def load_entity(self, the_entity, the_start=True):
+        """load_entity adds the given entity to loaded entities, layers,
+        archetypes, spatial index and collision collection. Entity on_load and
+        on_start are only called if the_start is True. The entity layer is
+        checked before the entity is changed in any way.
+        """
+        a_layer = self.layers.get(the_entity.layer, None)
+        if a_layer is None:
+            Log.Scene(self.name).Error("unknown layer {} for {}".format(the_entity.layer, the_entity.name)).call()
+            raise Exception("unknown layer {} for {}".format(the_entity.layer, the_entity.name))
+        if self.transform_pool is not None:
+            self.transform_pool.attach(the_entity.transform)
+        if the_start:
+            the_entity.on_load()
+            the_entity.on_start()
+        self.loaded_entities.add(the_entity)
+        self.clear_dispatch()
+        self.archetypes.update_entity(the_entity)
+        a_layer.add(the_entity)
+        self.spatial_index.insert(the_entity.id, the_entity.transform.get_rect(), the_entity, the_entity.transform.version)
+        self.update_collider_entity(the_entity)
 
     def load_unloaded_entities(self):
         """load_unloaded_entities proceeds to load any unloaded entity.
+        Entities added while entities are being loaded are loaded too.
         """
         # Log.Scene(self.name).LoadUnloadedEntities().call()
-        a_unloaded_entities = list()
-        for a_entity in self.unloaded_entities:
-            if not a_entity.active:
-                a_unloaded_entities.append(a_entity)
-                continue
-            a_entity.on_load()
-            a_entity.on_start()
-            self.loaded_entities.append(a_entity)
-            layer = a_entity.layer
-            self.layers[layer].append(a_entity)
-            if a_entity.has_collider:
-                self.collision_collection.append(a_entity)
+        a_entities = [a_entity for a_entity in self.unloaded_entities if a_entity.active]
+        while a_entities:
+            for a_entity in a_entities:
+                if a_entity in self.unloaded_entities:
+                    self.load_entity(a_entity)
+                    self.unloaded_entities.discard(a_entity)
 
-            # TODO: trigger load delegate
+                # TODO: trigger load delegate
 
-            print([x.name for x in self.collision_collection])
-
-        self.unloaded_entities = a_unloaded_entities
+            a_entities = [a_entity for a_entity in self.unloaded_entities if a_entity.active]
+        for a_entity in [a_entity for a_entity in self.spawned_entities if a_entity.active]:
+            self.load_entity(a_entity, False)
+            self.spawned_entities.discard(a_entity)
 
     def on_active(self):
         """on_active calls all loaded entities on_active methods.
@@ -101,18 +427,19 @@ class Scene(EObject):
         executed and before on_render.
         """
         super().on_after_update()
+        self.command_buffer.apply(self)
+        self.unload_entities(self.to_delete_entities + [a_entity for a_entity, _ in self.to_release_entities])
         for a_entity in self.to_delete_entities:
-            self.entities.remove(a_entity)
-            if a_entity in self.loaded_entities:
-                self.loaded_entities.remove(a_entity)
-            if a_entity in self.unloaded_entities:
-                self.unloaded_entities.remove(a_entity)
-            # TODO: remove entity form self.layers
             a_entity.on_unload()
             a_entity.on_destroy()
         self.to_delete_entities = list()
-        for a_entity in self.loaded_entities:
-            a_entity.on_after_update()
+        for a_entity, a_pool in self.to_release_entities:
+            if a_pool is not None:
+                a_pool.park(a_entity)
+        self.to_release_entities = list()
+        for a_call in self.get_dispatch("on_after_update"):
+            a_call()
+        self.spatial_index_dirty = True
 
     def on_destroy(self):
         """on_destroy calls all methods to clean up the scene.
@@ -122,12 +449,21 @@ class Scene(EObject):
         self.loaded = False
         for a_entity in self.entities:
             a_entity.on_destroy()
-        self.entities = list()
-        self.loaded_entities = list()
-        self.unloaded_entities = list()
+        self.entities = EntitySet()
+        self.loaded_entities = EntitySet()
+        self.unloaded_entities = EntitySet()
+        self.clear_dispatch()
+        self.clear_entity_indexes()
         self.to_delete_entities = list()
-        self.collision_collection = list()
+        self.to_release_entities = list()
+        self.spawned_entities = EntitySet()
+        self.command_buffer.clear()
+        self.clear_collisions()
+        self.spatial_index.clear()
+        self.archetypes.clear()
+        self.clear_transform_pool()
         self.layers = dict()
+        self.layer_order = list()
 
     # def on_dump(self):
     #     """on_dump dumps all scene entities in JSON format.
@@ -145,23 +481,25 @@ class Scene(EObject):
         """on_frame_end calls all methods to run at the end of tick frame.
         """
         super().on_frame_end()
-        for a_entity in self.loaded_entities:
-            a_entity.on_frame_end()
+        for a_call in self.get_dispatch("on_frame_end"):
+            a_call()
 
     def on_frame_start(self):
         """on_frame_start calls all methods to run at the start of tick frame.
         """
         super().on_frame_start()
+        self.spatial_index_dirty = True
         self.load_unloaded_entities()
-        for a_entity in self.loaded_entities:
-            a_entity.on_frame_start()
+        for a_call in self.get_dispatch("on_frame_start"):
+            a_call()
 
     def on_init(self):
         """on_init initializes all scene resources.
         resources.
         """
-        for a_layer in Scene.LAYERS:
-            self.layers[a_layer] = list()
+        for a_z, a_layer in enumerate(Scene.LAYERS):
+            if a_layer not in self.layers:
+                self.add_layer(a_layer, a_z)
 
     def on_load(self):
         """on_load is called when scene is loaded by the engine.
@@ -171,12 +509,12 @@ class Scene(EObject):
 
     def on_render(self):
         """on_render calls all loaded entities on_render methods. It call
-        entities using layers, calling from background to top layer.
+        entities using layers, calling from the lowest to the highest z
+        value, and every layer renders its entities as a batch.
         """
         super().on_render()
-        for _, a_entities_in_layer in self.layers.items():
-            for a_entity in a_entities_in_layer:
-                a_entity.on_render()
+        for a_layer in self.layer_order:
+            a_layer.on_render()
 
     def on_start(self):
         """on_start calls all loaded entities on_start methods.
@@ -198,11 +536,18 @@ class Scene(EObject):
         super().on_swap_from()
         for a_entity in self.loaded_entities:
             a_entity.on_unload()
-        self.loaded_entities = list()
-        self.unloaded_entities = list(self.entities)
-        self.collision_collection = list()
+        self.loaded_entities = EntitySet()
+        self.unloaded_entities = EntitySet(self.entities)
+        self.clear_dispatch()
+        self.clear_collisions()
+        self.spatial_index.clear()
+        self.archetypes.clear()
+        self.clear_transform_pool()
         self.to_delete_entities = list()
-        self.layers = dict()
+        self.to_release_entities = list()
+        self.spawned_entities = EntitySet()
+        self.command_buffer.clear()
+        self.clear_layers()
 
     def on_unload(self):
         """on_unload is called when scene is unloaded from the scene manager.
@@ -211,37 +556,256 @@ class Scene(EObject):
         self.loaded = False
         for a_entity in self.loaded_entities:
             a_entity.on_unload()
-        self.entities = list()
-        self.loaded_entities = list()
-        self.unloaded_entities = list()
-        self.collision_collection = list()
+        self.entities = EntitySet()
+        self.loaded_entities = EntitySet()
+        self.unloaded_entities = EntitySet()
+        self.clear_dispatch()
+        self.clear_entity_indexes()
+        self.clear_collisions()
+        self.spatial_index.clear()
+        self.archetypes.clear()
+        self.clear_transform_pool()
         self.to_delete_entities = list()
-        self.layers = list()
+        self.to_release_entities = list()
+        self.spawned_entities = EntitySet()
+        self.command_buffer.clear()
+        self.clear_layers()
 
     def on_update(self):
         """on_update calls all loaded entities on_update methods.
         """
         super().on_update()
-        for a_entity in self.loaded_entities:
-            a_entity.on_update()
+        for a_call in self.get_dispatch("on_update"):
+            a_call()
         self.check_collisions()
 
+    def query(self, *the_types):
+        """query returns all loaded entities with loaded components for all
+        given component types, or types deriving from them, for example
+        scene.query(MoveTo, Collider2D). The result is cached and updated
+        incrementally when components are loaded or removed, so it should not
+        be modified.
+        """
+        return self.archetypes.query_entities(the_types)
+
+    def query_point(self, the_point):
+        """query_point returns all loaded entities containing the given point.
+        """
+        self.update_spatial_index()
+        return self.spatial_index.query_point(the_point)
+
+    def query_rect(self, the_rect):
+        """query_rect returns all loaded entities overlapping the given
+        rectangle.
+        """
+        self.update_spatial_index()
+        return self.spatial_index.query_rect(the_rect)
+
+    def raycast(self, the_start, the_end):
+        """raycast returns all loaded entities hit by the segment from
+        the_start to the_end, sorted by the distance to the_start.
+        """
+        self.update_spatial_index()
+        return [a_entity for _, a_entity in self.spatial_index.raycast(the_start, the_end)]
+
+    def release_entity(self, the_entity, the_pool=None):
+        """release_entity removes the given entity from the scene without
+        unloading or destroying it, so components and delegates are kept. At
+        the end of the frame it is parked in the given entity pool. Children
+        are released with the entity, but only the entity is parked.
+        """
+        if the_entity.scene is not self:
+            return False
+        self.to_release_entities.append((the_entity, the_pool))
+        self.unindex_entity(the_entity)
+        self.spawned_entities.discard(the_entity)
+        for a_entity_child in the_entity.children:
+            self.release_entity(a_entity_child)
+        the_entity.scene = None
+        the_entity.engine = None
+        return True
+
+    def remove_collider_entity(self, the_entity):
+        """remove_collider_entity removes the given entity from the collision
+        collection.
+        """
+        self.collision_collection.discard(the_entity)
+        del self.collision_order[the_entity.id]
+        if self.static_collision_collection.discard(the_entity):
+            self.static_collision_dirty = True
+        else:
+            self.dynamic_collision_collection.discard(the_entity)
+            self.broadphase.remove(the_entity)
+
+    def remove_contacts(self, the_entity_ids):
+        """remove_contacts removes all contacts for the given entity ids and
+        triggers on collision exit for every one of them, so contacts with
+        removed entities are not kept for the next check_collisions.
+        """
+        a_delegates = None
+        a_contacts = dict()
+        for a_key, a_contact in self.contacts.items():
+            if a_key[0] not in the_entity_ids and a_key[1] not in the_entity_ids:
+                a_contacts[a_key] = a_contact
+                continue
+            if a_delegates is None:
+                a_delegates = self.get_collision_delegates()
+            self.trigger_collision_delegate(a_delegates[self.ON_COLLISION_EXIT_EVENT_NAME], a_contact[0], a_contact[1])
+        self.contacts = a_contacts
+
     def remove_entity(self, the_entity):
         """remove_entity removes the given entity from the scene.
         """
         Log.Scene(self.name).RemoveEntity(the_entity.name).call()
-        a_entity = self.lookup_by_id(self.entities, the_entity.id)
-        if not a_entity:
+        if the_entity.scene is not self:
             return False
-        self.to_delete_entities.append(a_entity)
-        # TODO: Remove collider from the collision collection, so there is not
-        # more checks between this collider and other other one.
+        self.to_delete_entities.append(the_entity)
+        self.unindex_entity(the_entity)
+        # collider is removed from the collision collection and from the
+        # broadphase in on_after_update.
 
         # TODO: Trigger destroy delegate
 
         for a_entity_child in the_entity.children:
             self.remove_entity(a_entity_child)
 
-        a_entity.scene = None
-        a_entity.engine = None
+        the_entity.scene = None
+        the_entity.engine = None
         return True
+
+    def spawn(self, the_prefab, the_count=1, the_positions=None):
+        """spawn creates the given number of copies of the given prefab and
+        adds them to the scene, they are loaded at the start of the next
+        frame. the_positions can provide the position for every copy, as a
+        list of vectors or a NumPy array. It returns the list of copies.
+        """
+        Log.Scene(self.name).Spawn(the_prefab.name, the_count).call()
+        a_entities = the_prefab.instantiate(the_count, the_positions)
+        for a_entity in a_entities:
+            self.insert_entity(a_entity)
+        return a_entities
+
+    def spawn_entity(self, the_entity):
+        """spawn_entity adds an entity released from a scene back to the
+        scene. Entities already loaded are added without being logged or
+        loaded and started again, so they reuse their components and
+        delegates. Other entities are added with add_entity.
+        """
+        if not the_entity.loaded:
+            return self.add_entity(the_entity)
+        self.entities.add(the_entity)
+        self.spawned_entities.add(the_entity)
+        self.index_entity(the_entity)
+        the_entity.engine = self.engine
+        the_entity.scene = self
+        for a_entity_child in the_entity.children:
+            self.spawn_entity(a_entity_child)
+        return True
+
+    def trigger_collision_delegate(self, the_delegate, the_one_entity, the_other_entity):
+        """trigger_collision_delegate triggers the given collision delegate
+        for both entities. Delegates without any registered callback are not
+        triggered.
+        """
+        if the_delegate is None or not self.engine.delegate_manager.has_callbacks(the_delegate.id):
+            return
+        self.engine.delegate_manager.trigger_delegate(the_delegate.id, True, the_one_entity=the_one_entity, the_other_entity=the_other_entity)
+
+    def unindex_entity(self, the_entity):
+        """unindex_entity removes the given entity from the name and tag
+        indexes, and clears the scene handler cache if it is the scene handler
+        entity.
+        """
+        a_entities = self.entity_names.get(the_entity.name, None)
+        if a_entities is not None and a_entities.discard(the_entity):
+            if not a_entities:
+                del self.entity_names[the_entity.name]
+        a_entities = self.entity_tags.get(the_entity.tag, None)
+        if a_entities is not None and a_entities.discard(the_entity):
+            if not a_entities:
+                del self.entity_tags[the_entity.tag]
+        if self.scene_handler_component is not None and self.scene_handler_component.entity is the_entity:
+            self.scene_handler_component = None
+            self.collision_delegates = None
+
+    def unload_entities(self, the_entities):
+        """unload_entities removes the given entities from the scene entities,
+        layers, collision collection, archetypes, spatial index and transform
+        pool. Every entity is removed in constant time, so the cost depends
+        only on the number of entities being removed, and the spatial index
+        removes all of them in a single batch. Contacts with removed colliders
+        are removed and exited in a single pass, before entities are unloaded.
+        """
+        if not the_entities:
+            return
+        self.clear_dispatch()
+        a_collider_ids = set()
+        for a_entity in the_entities:
+            self.entities.discard(a_entity)
+            self.loaded_entities.discard(a_entity)
+            self.unloaded_entities.discard(a_entity)
+            self.spawned_entities.discard(a_entity)
+            for a_layer in self.layer_order:
+                a_layer.discard(a_entity)
+            if a_entity.id in self.collision_order:
+                a_collider_ids.add(a_entity.id)
+                self.remove_collider_entity(a_entity)
+            self.archetypes.remove_entity(a_entity)
+            if self.transform_pool is not None:
+                self.transform_pool.detach(a_entity.transform)
+        self.spatial_index.remove_batch([a_entity.id for a_entity in the_entities])
+        if a_collider_ids and self.contacts:
+            self.remove_contacts(a_collider_ids)
+
+    def update_collider_entity(self, the_entity):
+        """update_collider_entity adds the given loaded entity to the
+        collision collection, removes it or moves it between static and
+        dynamic colliders, so it matches the entity collider component. It is
+        called every time the entity collider component changes.
+        """
+        if the_entity not in self.loaded_entities:
+            return False
+        a_in_collection = the_entity.id in self.collision_order
+        if not the_entity.has_collider():
+            if a_in_collection:
+                self.remove_collider_entity(the_entity)
+            return True
+        if a_in_collection:
+            if the_entity.has_static_collider() == (the_entity in self.static_collision_collection):
+                return True
+            self.remove_collider_entity(the_entity)
+        self.add_collider_entity(the_entity)
+        return True
+
+    def update_spatial_index(self):
+        """update_spatial_index updates the spatial index with the entity
+        transforms. It runs at most once per frame, when the first query is
+        done after entities have been updated, and only entities with a new
+        transform version are moved.
+        """
+        if not self.spatial_index_dirty:
+            return
+        for a_entity in self.loaded_entities:
+            a_transform = a_entity.transform
+            a_version = a_transform.version
+            if self.spatial_index.get_version(a_entity.id) != a_version:
+                self.spatial_index.move(a_entity.id, a_transform.get_rect(), a_version)
+        self.spatial_index_dirty = False
+
+    def update_static_collision_index(self):
+        """update_static_collision_index rebuilds the static collision index
+        if any static collider was added or removed. Static colliders not
+        loaded yet are indexed once they are loaded.
+        """
+        if not self.static_collision_dirty:
+            return
+        self.static_collision_index.clear()
+        self.static_collision_dirty = False
+        for a_entity in self.static_collision_collection:
+            a_collider = a_entity.get_collider_component()
+            if a_collider is None:
+                self.static_collision_dirty = True
+                continue
+            a_rect = a_collider.get_collider_rect()
+            a_circle = a_collider.get_collider_circle() if a_collider.shape == a_collider.COLLIDER_SHAPE_CIRCLE else None
+            self.static_collision_index.insert(a_entity.id, a_rect, (a_entity, a_rect, (a_collider.category, a_collider.mask), a_circle))
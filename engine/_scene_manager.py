@@ -29,6 +29,7 @@ class SceneManager(EObject):
         """
         super().__init__(the_name, the_engine)
         self.scenes = []
+        self.scene_ids = set()
         self.active_scene = None
         self.standby_scene = None
 
@@ -47,6 +48,7 @@ class SceneManager(EObject):
             return False
         the_scene.engine = self.engine
         self.scenes.append(the_scene)
+        self.scene_ids.add(the_scene.id)
         return True
 
     def assign_active_scene(self, the_scene=None, the_scene_index=0):
@@ -64,8 +66,7 @@ class SceneManager(EObject):
         SceneManager.
 
         Args:
-            the_id (str): string with the id of the scene to delete from the
-                SceneManager.
+            the_id (int): id of the scene to delete from the SceneManager.
 
         Returns:
             bool : True if scene was deleted from the SceneManager or False if
@@ -77,33 +78,33 @@ class SceneManager(EObject):
             return False
         a_scene.engine = None
         self.scenes.remove(a_scene)
+        self.scene_ids.discard(a_scene.id)
         return True
 
     def get_scene_by_id(self, the_id):
         """get_scene_by_id returns a scene in the SceneManager by the scene id.
 
         Args:
-            the_id (str): string with the scene id to look for.
+            the_id (int): scene id to look for.
 
         Returns:
             Scene : scene instance if it is found or None if not.
         """
-        for a_scene in self.scenes:
-            if a_scene.id == the_id:
-                return a_scene
-        return None
+        if the_id not in self.scene_ids:
+            return None
+        return self.get_object(the_id)
 
     def get_scene_index_by_id(self, the_id):
         """get_scene_index_by_id returns the scene index in the SceneManager
         by the given scene id.
 
         Args:
-            the_id (str): string with the scene id to look for.
+            the_id (int): scene id to look for.
 
         Returns:
             int : scene index.
         """
-        for a_scene_index, a_scene in self.scenes:
+        for a_scene_index, a_scene in enumerate(self.scenes):
             if a_scene.id == the_id:
                 return a_scene_index
         return None
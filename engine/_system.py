@@ -0,0 +1,68 @@
+"""_system.py contains the System base class, used for any system in the
+game.
+"""
+
+from ._eobject import EObject
+
+
+class System(EObject):
+    """System class identifies a system. A system declares the component types
+    it requires, and every frame it iterates in bulk all entities in the
+    active scene with those components loaded, using scene archetypes.
+
+    Systems are registered to the engine and they run before managers on
+    every update.
+    """
+
+    COMPONENTS = ()
+
+    def __init__(self, the_name, the_engine=None, **kwargs):
+        """__init__ initializes the System instance.
+        """
+        super().__init__(the_name, the_engine, **kwargs)
+        self.components = tuple(kwargs.get("the_components", self.COMPONENTS))
+        # updated_frame is the engine frame for the last update, components
+        # handled by the system use it to know if the system ran in a frame.
+        self.updated_frame = None
+
+    def get_archetypes(self, the_scene):
+        """get_archetypes returns all archetypes in the given scene with the
+        system components.
+        """
+        return the_scene.archetypes.query(self.components)
+
+    def get_scene(self):
+        """get_scene returns the active scene.
+        """
+        a_scene_manager = self.get_scene_manager()
+        if a_scene_manager is None or a_scene_manager.active_scene is None:
+            return None
+        return a_scene_manager.active_scene.scene
+
+    def on_update(self):
+        """on_update calls on_update_rows for every archetype with the system
+        components in the active scene.
+        """
+        super().on_update()
+        a_scene = self.get_scene()
+        if a_scene is None:
+            return
+        for a_archetype in self.get_archetypes(a_scene):
+            if len(a_archetype) == 0:
+                continue
+            self.on_update_archetype(a_archetype)
+        self.updated_frame = self.engine.frames if self.engine is not None else None
+
+    def on_update_archetype(self, the_archetype):
+        """on_update_archetype is called for every not empty archetype with
+        the system components, by default it calls on_update_rows with the
+        archetype entities and columns.
+        """
+        self.on_update_rows(the_archetype.entities, *[the_archetype.get_column(a_type) for a_type in self.components])
+
+    def on_update_rows(self, the_entities, *the_columns):
+        """on_update_rows is called with a list of entities and one list of
+        components for every system component type, all of them sharing the
+        same row for the same entity. Inactive entities and components are
+        included, so systems can filter them in bulk.
+        """
@@ -1,25 +1,554 @@
 """_transform.py contains static geometric information for any
 entity in the game.
+
+Transforms for entities loaded in a scene are stored in the scene
+TransformPool, where positions, rotations, scales and dimensions for all
+entities are kept in contiguous arrays, and every Transform is a view onto
+its row. Transforms not attached to any pool keep their own vectors.
+
+Every transform has a version, which changes every time its vectors are
+changed, so rectangles and any other data computed from the transform can
+be cached until it changes.
 """
 
 from pygame import Rect
 from pygame.math import Vector2
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TransformVector:
+    """TransformVector class is a view onto a two dimensional vector stored
+    in a TransformPool row. It can be used as a pygame Vector2, and writes go
+    directly to the pool arrays.
+    """
+
+    __slots__ = ("transform", "field")
+
+    def __init__(self, the_transform, the_field):
+        """__init__ initializes TransformVector instance.
+
+        Args:
+            the_transform (Transform): transform owning the vector.
+            the_field (int): TransformPool field index.
+        """
+        self.transform = the_transform
+        self.field = the_field
+
+    @property
+    def array(self):
+        """array returns the pool row for the vector, as a NumPy view.
+        """
+        return self.transform.pool.arrays[self.field][self.transform.row]
+
+    @property
+    def x(self):
+        """x returns the first vector component.
+        """
+        return float(self.transform.pool.arrays[self.field][self.transform.row, 0])
+
+    @x.setter
+    def x(self, the_value):
+        """x setter sets the first vector component.
+        """
+        self.transform.pool.arrays[self.field][self.transform.row, 0] = the_value
+        self.transform.touch()
+
+    @property
+    def y(self):
+        """y returns the second vector component.
+        """
+        return float(self.transform.pool.arrays[self.field][self.transform.row, 1])
+
+    @y.setter
+    def y(self, the_value):
+        """y setter sets the second vector component.
+        """
+        self.transform.pool.arrays[self.field][self.transform.row, 1] = the_value
+        self.transform.touch()
+
+    def __add__(self, the_other):
+        return self.to_vector() + the_other
+
+    def __eq__(self, the_other):
+        return self.to_vector() == the_other
+
+    def __getitem__(self, the_index):
+        return float(self.array[the_index])
+
+    def __iadd__(self, the_other):
+        self.update(self.to_vector() + the_other)
+        return self
+
+    def __imul__(self, the_other):
+        self.update(self.to_vector() * the_other)
+        return self
+
+    def __isub__(self, the_other):
+        self.update(self.to_vector() - the_other)
+        return self
+
+    def __iter__(self):
+        return iter(self.to_vector())
+
+    def __len__(self):
+        return 2
+
+    def __mul__(self, the_other):
+        return self.to_vector() * the_other
+
+    def __neg__(self):
+        return -self.to_vector()
+
+    def __radd__(self, the_other):
+        return the_other + self.to_vector()
+
+    def __repr__(self):
+        return "<TransformVector({}, {})>".format(self.x, self.y)
+
+    def __rmul__(self, the_other):
+        return the_other * self.to_vector()
+
+    def __rsub__(self, the_other):
+        return the_other - self.to_vector()
+
+    def __setitem__(self, the_index, the_value):
+        self.array[the_index] = the_value
+        self.transform.touch()
+
+    def __sub__(self, the_other):
+        return self.to_vector() - the_other
+
+    def to_vector(self):
+        """to_vector returns a pygame Vector2 copy.
+        """
+        a_array = self.array
+        return Vector2(float(a_array[0]), float(a_array[1]))
+
+    def update(self, the_value):
+        """update sets both vector components from the given vector.
+        """
+        a_array = self.array
+        a_array[0] = the_value[0]
+        a_array[1] = the_value[1]
+        self.transform.touch()
+
 
 class Transform:
     """Transform class provides, position, rotation, scale and
     dimension.
+
+    A transform can have a parent transform, then its position, rotation and
+    scale are relative to the parent. World position, rotation and scale are
+    computed when they are required, and cached until the transform or any
+    ancestor changes. Rotation x value is the angle in degrees.
+
+    Changes done in place to vectors of a transform not attached to a pool
+    can not be tracked, so world values and rectangles are only cached when
+    the transform and all its ancestors are attached to a pool, and they
+    are computed every time they are required otherwise.
     """
 
+    __slots__ = ("pool", "row", "vectors", "_version", "_rect", "_rect_version", "_parent", "_world",
+                 "_world_key", "_world_version")
+
+    FIELD_POSITION = 0
+    FIELD_ROTATION = 1
+    FIELD_SCALE = 2
+    FIELD_DIM = 3
+
     def __init__(self, **kwargs):
         """__init__ initializes Transform instance.
         """
-        self.position = kwargs.get("the_position", Vector2(0, 0))
-        self.rotation = kwargs.get("the_rotation", Vector2(0, 0))
-        self.scale = kwargs.get("the_scale", Vector2(1, 1))
-        self.dim = kwargs.get("the_dim", Vector2(0, 0))
+        self.pool = None
+        self.row = None
+        self._version = 0
+        self._rect = None
+        self._rect_version = None
+        self._parent = None
+        self._world = None
+        self._world_key = None
+        self._world_version = 0
+        self.vectors = [kwargs.get("the_position", Vector2(0, 0)),
+                        kwargs.get("the_rotation", Vector2(0, 0)),
+                        kwargs.get("the_scale", Vector2(1, 1)),
+                        kwargs.get("the_dim", Vector2(0, 0))]
+        self.parent = kwargs.get("the_parent", None)
+
+    @property
+    def dim(self):
+        """dim returns the transform dimension.
+        """
+        return self.vectors[Transform.FIELD_DIM]
+
+    @dim.setter
+    def dim(self, the_value):
+        """dim setter sets the transform dimension.
+        """
+        self.set_vector(Transform.FIELD_DIM, the_value)
+
+    @property
+    def local_version(self):
+        """local_version returns the version for the transform own vectors,
+        without taking into account any ancestor.
+        """
+        if self.pool is None:
+            return self._version
+        return int(self.pool.versions[self.row])
+
+    @property
+    def parent(self):
+        """parent returns the parent transform.
+        """
+        return self._parent
+
+    @parent.setter
+    def parent(self, the_parent):
+        """parent setter sets the parent transform. The transform version is
+        changed to a value never returned before.
+        """
+        self._parent = the_parent
+        a_version = max(self.local_version, self._world_version) + 1
+        if self.pool is None:
+            self._version = a_version
+        else:
+            self.pool.versions[self.row] = a_version
+            if the_parent is None:
+                self.pool.child_rows.discard(self.row)
+            else:
+                self.pool.child_rows.add(self.row)
+
+    @property
+    def position(self):
+        """position returns the transform position.
+        """
+        return self.vectors[Transform.FIELD_POSITION]
+
+    @position.setter
+    def position(self, the_value):
+        """position setter sets the transform position.
+        """
+        self.set_vector(Transform.FIELD_POSITION, the_value)
+
+    @property
+    def rotation(self):
+        """rotation returns the transform rotation.
+        """
+        return self.vectors[Transform.FIELD_ROTATION]
+
+    @rotation.setter
+    def rotation(self, the_value):
+        """rotation setter sets the transform rotation.
+        """
+        self.set_vector(Transform.FIELD_ROTATION, the_value)
+
+    @property
+    def scale(self):
+        """scale returns the transform scale.
+        """
+        return self.vectors[Transform.FIELD_SCALE]
+
+    @scale.setter
+    def scale(self, the_value):
+        """scale setter sets the transform scale.
+        """
+        self.set_vector(Transform.FIELD_SCALE, the_value)
+
+    @property
+    def version(self):
+        """version returns the transform version, it changes every time any
+        transform vector changes, or any vector for any ancestor.
+        """
+        if self._parent is None:
+            return self.local_version
+        return self.update_world()
+
+    @property
+    def world_position(self):
+        """world_position returns the transform position in world space. The
+        vector is cached and it should not be modified.
+        """
+        self.update_world()
+        return self._world[Transform.FIELD_POSITION]
+
+    @property
+    def world_rotation(self):
+        """world_rotation returns the transform rotation in world space. The
+        vector is cached and it should not be modified.
+        """
+        self.update_world()
+        return self._world[Transform.FIELD_ROTATION]
+
+    @property
+    def world_scale(self):
+        """world_scale returns the transform scale in world space. The vector
+        is cached and it should not be modified.
+        """
+        self.update_world()
+        return self._world[Transform.FIELD_SCALE]
+
+    def clone(self):
+        """clone returns a copy of the transform, not attached to any pool and
+        without any parent.
+        """
+        a_clone = Transform.__new__(Transform)
+        a_clone.pool = None
+        a_clone.row = None
+        a_clone._version = 0
+        a_clone._rect = None
+        a_clone._rect_version = None
+        a_clone._parent = None
+        a_clone._world = None
+        a_clone._world_key = None
+        a_clone._world_version = 0
+        a_clone.vectors = [Vector2(a_vector[0], a_vector[1]) for a_vector in self.vectors]
+        return a_clone
 
     def get_rect(self):
-        """get_rect returns a rectangle for the position and dimensions.
+        """get_rect returns a rectangle for the world position and the
+        dimensions. For transforms attached to a pool, the rectangle is cached
+        until the transform version changes, and it should not be modified.
+        """
+        if self.pool is None and self._parent is None:
+            return Rect(self.position.x, self.position.y, self.dim.x * self.scale.x, self.dim.y * self.scale.y)
+        a_version = self.version
+        if self.pool is not None and self._rect_version == a_version:
+            return self._rect
+        if self._parent is None:
+            a_x, a_y = self.pool.positions[self.row]
+            a_width, a_height = self.pool.dims[self.row] * self.pool.scales[self.row]
+        else:
+            a_position = self._world[Transform.FIELD_POSITION]
+            a_scale = self._world[Transform.FIELD_SCALE]
+            a_x, a_y = a_position.x, a_position.y
+            a_width, a_height = self.dim[0] * a_scale.x, self.dim[1] * a_scale.y
+        a_rect = Rect(a_x, a_y, a_width, a_height)
+        if self.pool is not None:
+            self._rect = a_rect
+            self._rect_version = a_version
+        return a_rect
+
+    def is_tracked(self):
+        """is_tracked returns if all changes to the transform and to all its
+        ancestors are tracked by versions, which is only true when all of
+        them are attached to a pool.
+        """
+        a_transform = self
+        while a_transform is not None:
+            if a_transform.pool is None:
+                return False
+            a_transform = a_transform._parent
+        return True
+
+    def set_vector(self, the_field, the_value):
+        """set_vector sets the vector for the given field. If the transform is
+        attached to a pool, values are copied to the pool row.
+        """
+        if self.pool is None:
+            self.vectors[the_field] = the_value
+            self._version += 1
+        else:
+            self.vectors[the_field].update(the_value)
+
+    def touch(self):
+        """touch changes the transform version.
+        """
+        if self.pool is None:
+            self._version += 1
+        else:
+            self.pool.versions[self.row] += 1
+
+    def update_world(self):
+        """update_world computes world position, rotation and scale if the
+        transform or any ancestor changed since they were computed, and it
+        returns the world version. Transforms not tracked are computed every
+        time, with a new world version.
+        """
+        a_parent = self._parent
+        if self.is_tracked():
+            a_key = (self.local_version, a_parent.version if a_parent is not None else None)
+        else:
+            a_key = None
+        if a_key is None or self._world_key != a_key:
+            a_position = self.vectors[Transform.FIELD_POSITION]
+            a_rotation = self.vectors[Transform.FIELD_ROTATION]
+            a_scale = self.vectors[Transform.FIELD_SCALE]
+            if a_parent is None:
+                self._world = [Vector2(a_position[0], a_position[1]),
+                               Vector2(a_rotation[0], a_rotation[1]),
+                               Vector2(a_scale[0], a_scale[1])]
+            else:
+                a_parent.update_world()
+                a_parent_position, a_parent_rotation, a_parent_scale = a_parent._world
+                a_offset = Vector2(a_position[0] * a_parent_scale.x, a_position[1] * a_parent_scale.y)
+                self._world = [a_parent_position + a_offset.rotate(a_parent_rotation.x),
+                               a_parent_rotation + Vector2(a_rotation[0], a_rotation[1]),
+                               Vector2(a_parent_scale.x * a_scale[0], a_parent_scale.y * a_scale[1])]
+            self._world_key = a_key
+            # world versions only grow, and they are always greater than the
+            # local version, so they never match a version seen before.
+            self._world_version = max(self._world_version, self.local_version) + 1
+        return self._world_version
+
+
+class TransformPool:
+    """TransformPool class stores positions, rotations, scales and dimensions
+    for many transforms in contiguous float arrays, one row for every
+    transform, so they can be processed in bulk. Attached transforms become
+    views onto their row.
+
+    Rows from detached transforms are reused, and arrays double their
+    capacity when they are full. Rows are never moved while attached.
+
+    The versions array keeps the version for every row, anything writing to
+    the arrays directly has to call touch for the rows it changed.
+    """
+
+    def __init__(self, the_capacity=64):
+        """__init__ initializes TransformPool instance.
+        """
+        self.capacity = the_capacity
+        self.arrays = [numpy.zeros((the_capacity, 2), dtype=numpy.float64) for _ in range(4)]
+        self.transforms = [None] * the_capacity
+        self.versions = numpy.zeros(the_capacity, dtype=numpy.int64)
+        # child_rows are rows for transforms with a parent, their arrays keep
+        # values relative to the parent.
+        self.child_rows = set()
+        self.free_rows = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size - len(self.free_rows)
+
+    @property
+    def dims(self):
+        """dims returns the array with all dimensions.
+        """
+        return self.arrays[Transform.FIELD_DIM]
+
+    @property
+    def positions(self):
+        """positions returns the array with all positions.
+        """
+        return self.arrays[Transform.FIELD_POSITION]
+
+    @property
+    def rotations(self):
+        """rotations returns the array with all rotations.
+        """
+        return self.arrays[Transform.FIELD_ROTATION]
+
+    @property
+    def scales(self):
+        """scales returns the array with all scales.
+        """
+        return self.arrays[Transform.FIELD_SCALE]
+
+    def attach(self, the_transform):
+        """attach copies the given transform values to a pool row and turns
+        the transform into a view onto that row.
+        """
+        if the_transform.pool is self:
+            return the_transform.row
+        if the_transform.pool is not None:
+            the_transform.pool.detach(the_transform)
+        if self.free_rows:
+            a_row = self.free_rows.pop()
+        else:
+            if self.size == self.capacity:
+                self.grow()
+            a_row = self.size
+            self.size += 1
+        for a_field, a_array in enumerate(self.arrays):
+            a_vector = the_transform.vectors[a_field]
+            a_array[a_row, 0] = a_vector[0]
+            a_array[a_row, 1] = a_vector[1]
+        self.transforms[a_row] = the_transform
+        # row versions only grow, so a transform taking the row of another
+        # one never gets a version already seen for the row.
+        self.versions[a_row] = max(int(self.versions[a_row]), the_transform._version) + 1
+        if the_transform.parent is not None:
+            self.child_rows.add(a_row)
+        the_transform.pool = self
+        the_transform.row = a_row
+        the_transform.vectors = [TransformVector(the_transform, a_field) for a_field in range(len(self.arrays))]
+        return a_row
+
+    def clear(self):
+        """clear detaches all transforms.
+        """
+        for a_transform in self.transforms[:self.size]:
+            if a_transform is not None:
+                self.detach(a_transform)
+        self.free_rows = []
+        self.size = 0
+
+    def detach(self, the_transform):
+        """detach copies the pool row back to the given transform, which keeps
+        its own vectors again, and releases the row.
+        """
+        if the_transform.pool is not self:
+            return False
+        a_row = the_transform.row
+        the_transform.vectors = [Vector2(float(a_array[a_row, 0]), float(a_array[a_row, 1])) for a_array in self.arrays]
+        the_transform._version = int(self.versions[a_row]) + 1
+        the_transform.pool = None
+        the_transform.row = None
+        self.transforms[a_row] = None
+        self.child_rows.discard(a_row)
+        self.free_rows.append(a_row)
+        return True
+
+    def get_rects(self, the_rows=None):
+        """get_rects returns x, y, width and height arrays for the given rows,
+        or all rows if not provided. Rectangles for transforms with a parent
+        are in world space.
+        """
+        if the_rows is None:
+            the_rows = slice(0, self.size)
+        a_positions = self.positions[the_rows]
+        a_sizes = self.dims[the_rows] * self.scales[the_rows]
+        if self.child_rows:
+            a_rows = numpy.arange(self.size)[the_rows] if isinstance(the_rows, slice) else numpy.asarray(the_rows)
+            a_indexes = numpy.flatnonzero(numpy.isin(a_rows, list(self.child_rows)))
+            if len(a_indexes):
+                a_positions = a_positions.copy()
+                for a_index in a_indexes.tolist():
+                    a_transform = self.transforms[a_rows[a_index]]
+                    a_transform.update_world()
+                    a_position, _, a_scale = a_transform._world
+                    a_positions[a_index] = (a_position.x, a_position.y)
+                    a_sizes[a_index] = (a_transform.dim[0] * a_scale.x, a_transform.dim[1] * a_scale.y)
+        return a_positions[:, 0], a_positions[:, 1], a_sizes[:, 0], a_sizes[:, 1]
+
+    def grow(self):
+        """grow doubles the pool capacity.
+        """
+        a_capacity = max(1, self.capacity * 2)
+        for a_field, a_array in enumerate(self.arrays):
+            a_new_array = numpy.zeros((a_capacity, 2), dtype=numpy.float64)
+            a_new_array[:self.capacity] = a_array
+            self.arrays[a_field] = a_new_array
+        self.transforms.extend([None] * (a_capacity - self.capacity))
+        a_versions = numpy.zeros(a_capacity, dtype=numpy.int64)
+        a_versions[:self.capacity] = self.versions
+        self.versions = a_versions
+        self.capacity = a_capacity
+
+    def touch(self, the_rows=None):
+        """touch changes the version for the given rows, or all rows if not
+        provided.
+        """
+        if the_rows is None:
+            the_rows = slice(0, self.size)
+        self.versions[the_rows] += 1
+
+    @staticmethod
+    def is_available():
+        """is_available returns if transform pools can be used, they require
+        NumPy to be installed.
         """
-        return Rect(self.position.x, self.position.y, self.dim.x * self.scale.x, self.dim.y * self.scale.y)
\ No newline at end of file
+        return numpy is not None
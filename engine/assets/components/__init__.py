@@ -2,6 +2,7 @@
 """
 
 from ._box import Box
+from ._circle_collider2d import CircleCollider2D
 from ._collider2d import Collider2D
 from ._key_controller import KeyController
 from ._move_to import MoveTo
@@ -11,6 +12,7 @@ from ._out_of_bounds import OutOfBounds
 
 __all__ = [
     "Box",
+    "CircleCollider2D",
     "Collider2D",
     "KeyController",
     "MoveTo",
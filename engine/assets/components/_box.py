@@ -7,6 +7,8 @@ from ..._component import Component
 
 class Box(Component):
 
+    __slots__ = ("color", "rect", "border")
+
     def __init__(self, the_name, the_engine=None, **kwargs):
         """__init__ initializes Box instance.
         """
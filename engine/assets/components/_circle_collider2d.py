@@ -0,0 +1,46 @@
+"""_circle_collider2d file contains the component that implements a circle
+collider.
+"""
+
+import math
+import pygame
+from ._collider2d import Collider2D
+
+
+class CircleCollider2D(Collider2D):
+    """CircleCollider2D class implements a 2D circle collider component. The
+    circle is centered in the entity transform rectangle.
+    """
+
+    __slots__ = ("radius",)
+
+    def __init__(self, the_name, the_engine=None, **kwargs):
+        """__init__ initializes CircleCollider2D instance.
+
+        the_radius is the circle radius, if it is not provided, the radius is
+        half the smallest side of the entity transform rectangle.
+        """
+        super().__init__(the_name, the_engine, **kwargs)
+        self.shape = self.COLLIDER_SHAPE_CIRCLE
+        self.radius = kwargs.get("the_radius", None)
+
+    def get_collider_circle(self):
+        """get_collider_circle returns the (center x, center y, radius) tuple
+        used to check collisions, in world space.
+        """
+        a_transform = self.entity.transform
+        a_position = a_transform.world_position
+        a_scale = a_transform.world_scale
+        a_width = a_transform.dim.x * a_scale.x
+        a_height = a_transform.dim.y * a_scale.y
+        a_radius = self.radius if self.radius is not None else min(abs(a_width), abs(a_height)) / 2
+        return (a_position.x + a_width / 2, a_position.y + a_height / 2, a_radius)
+
+    def get_collider_rect(self):
+        """get_collider_rect returns the rectangle bounding the circle, it is
+        used by the broadphase.
+        """
+        a_x, a_y, a_radius = self.get_collider_circle()
+        a_left = math.floor(a_x - a_radius)
+        a_top = math.floor(a_y - a_radius)
+        return pygame.Rect(a_left, a_top, math.ceil(a_x + a_radius) - a_left, math.ceil(a_y + a_radius) - a_top)
@@ -9,11 +9,20 @@ class Collider2D(Component):
     """Collider2D class implements a 2D collider component.
     """
 
+    __slots__ = ()
+
     def __init__(self, the_name, the_engine=None, **kwargs):
         """__init__ initializes Collider2d instance.
+
+        the_category is the collider category bitmask and the_mask is the
+        bitmask for all categories the collider collides with. the_static
+        identifies colliders that never move.
         """
         super().__init__(the_name, the_engine, **kwargs)
         self.collider = True
+        self.category = kwargs.get("the_category", self.COLLIDER_CATEGORY_DEFAULT)
+        self.mask = kwargs.get("the_mask", self.COLLIDER_MASK_ALL)
+        self.static = kwargs.get("the_static", False)
 
     def get_collider_rect(self):
         """get_collider_rect returns the rectangle used to check collisions.
@@ -8,6 +8,8 @@ from ..._component import Component
 
 class KeyController(Component):
 
+    __slots__ = ()
+
     KEYBOARD_EVENT_NAME = "keyboard-event"
 
     def __init__(self, the_name, the_engine=None, **kwargs):
@@ -10,19 +10,48 @@ class MoveTo(Component):
     direction.
     """
 
+    __slots__ = ("_speed", "behavior", "system")
+
     def __init__(self, the_name, the_engine=None, **kwargs):
         """__init__ initializes MoveTo instance.
         """
         super().__init__(the_name, the_engine, **kwargs)
-        self.speed = kwargs.get("the_speed", pygame.Vector2(0, 0))
+        # system is the MoveToSystem moving the entity, if any, it is notified
+        # every time speed changes.
+        self.system = None
+        self._speed = kwargs.get("the_speed", pygame.Vector2(0, 0))
         self.behavior = kwargs.get("the_behavior", None)
 
+    @property
+    def speed(self):
+        """speed returns the movement speed.
+        """
+        return self._speed
+
+    @speed.setter
+    def speed(self, the_speed):
+        """speed setter sets the movement speed. Speed should be changed
+        assigning a new vector, so a MoveToSystem moving the entity is
+        notified.
+        """
+        self._speed = the_speed
+        if self.system is not None:
+            self.system.on_speed_changed(self)
+
     def callback_key_controller(self, the_key):
         """callback_key_controller is the callback to be called when a key is
         being pressed.
         """
         self.speed = self.behavior["KeyController"][the_key]
 
+    def clone(self):
+        """clone returns a copy of the component with its own speed vector.
+        """
+        a_clone = super().clone()
+        a_clone.system = None
+        a_clone._speed = pygame.Vector2(self._speed)
+        return a_clone
+
     def on_start(self):
         """on_start calls start methods.
         """
@@ -38,14 +67,13 @@ class MoveTo(Component):
                     a_delegate = a_component.get_delegate(a_delegate_name)
             elif a_key_split[0] == "entity":
                 a_scene = self.entity.scene
-                a_scene_entity = a_scene.lookup_by_name(a_scene.entities, a_key_split[1])
+                a_scene_entity = a_scene.get_entity_by_name(a_key_split[1])
                 a_scene_component = a_scene_entity.lookup_by_name(a_scene_entity.components, a_key_split[2])
                 a_delegate_name = a_key_split[3] if len(a_key_split) == 4 else None
                 a_delegate = a_scene_component.get_delegate(a_delegate_name)
             elif a_key_split[0] == "scene":
                 a_scene = self.entity.scene
-                a_scene_entity = a_scene.lookup_by_name(a_scene.entities, a_scene.SCENE_HANDLER_ENTITY_NAME)
-                a_scene_component = a_scene_entity.lookup_by_name(a_scene_entity.components, a_scene.SCENE_HANDLER_COMPONENT_NAME)
+                a_scene_component = a_scene.get_scene_handler_component()
                 a_delegate_name = a_key_split[1] if len(a_key_split) == 2 else None
                 a_delegate = a_scene_component.get_delegate(a_delegate_name)
             if a_delegate:
@@ -56,5 +84,6 @@ class MoveTo(Component):
         """on_update calls all on_update methods.
         """
         super().on_update()
-        self.entity.transform.position.x += self.speed.x
-        self.entity.transform.position.y += self.speed.y
+        if self.system is not None and self.system.updated_frame == self.engine.frames:
+            return
+        self.entity.transform.position += self.speed
@@ -9,6 +9,8 @@ class OutOfBounds(Component):
     """OutOfBounds class is the component controlling out of bounds events.
     """
 
+    __slots__ = ("bounce", "system")
+
     OUT_OF_BOUNDS_EVENT_NAME = "out-of-bounds-event"
 
     def __init__(self, the_name, the_engine=None, **kwargs):
@@ -20,6 +22,15 @@ class OutOfBounds(Component):
         """
         super().__init__(the_name, the_engine, **kwargs)
         self.bounce = kwargs.get("the_bounce", False)
+        # system is the OutOfBoundsSystem checking the entity, if any.
+        self.system = None
+
+    def clone(self):
+        """clone returns a copy of the component, not checked by any system.
+        """
+        a_clone = super().clone()
+        a_clone.system = None
+        return a_clone
 
     def on_load(self):
         """on_load is called all on_load methods.
@@ -31,6 +42,8 @@ class OutOfBounds(Component):
         """on_update calls all on_update methods.
         """
         super().on_update()
+        if self.system is not None and self.system.updated_frame == self.engine.frames:
+            return
         a_width = self.engine.width
         a_height = self.engine.height
         a_rect = self.entity.transform.get_rect()
@@ -13,6 +13,8 @@ class SceneHandlerComponent(Component):
     # ON_DESTROY_EVENT_NAME = "on-destroy-event"
     # ON_LOAD_EVENT_NAME = "on-load_event"
 
+    __slots__ = ()
+
     def __init__(self, the_name, the_engine=None, **kwargs):
         super().__init__(the_name, the_engine, **kwargs)
 
@@ -21,5 +23,8 @@ class SceneHandlerComponent(Component):
         """
         super().on_load()
         self.delegates[Scene.ON_COLLISION_EVENT_NAME] = self.engine.delegate_manager.create_delegate(self, Scene.ON_COLLISION_EVENT_NAME)
+        self.delegates[Scene.ON_COLLISION_ENTER_EVENT_NAME] = self.engine.delegate_manager.create_delegate(self, Scene.ON_COLLISION_ENTER_EVENT_NAME)
+        self.delegates[Scene.ON_COLLISION_STAY_EVENT_NAME] = self.engine.delegate_manager.create_delegate(self, Scene.ON_COLLISION_STAY_EVENT_NAME)
+        self.delegates[Scene.ON_COLLISION_EXIT_EVENT_NAME] = self.engine.delegate_manager.create_delegate(self, Scene.ON_COLLISION_EXIT_EVENT_NAME)
         self.delegates[Scene.ON_DESTROY_EVENT_NAME] = self.engine.delegate_manager.create_delegate(self, Scene.ON_DESTROY_EVENT_NAME)
         self.delegates[Scene.ON_LOAD_EVENT_NAME] = self.engine.delegate_manager.create_delegate(self, Scene.ON_LOAD_EVENT_NAME)
\ No newline at end of file
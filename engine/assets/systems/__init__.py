@@ -0,0 +1,11 @@
+"""__init__.py systems.
+"""
+
+from ._move_to_system import MoveToSystem
+from ._out_of_bounds_system import OutOfBoundsSystem
+
+
+__all__ = [
+    "MoveToSystem",
+    "OutOfBoundsSystem",
+]
@@ -0,0 +1,118 @@
+"""_move_to_system.py contains the system moving all MoveTo components at
+once.
+"""
+
+from ..._system import System
+from ..components import MoveTo
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class MoveToSystemData:
+    """MoveToSystemData class contains MoveToSystem arrays for one archetype,
+    transform pool rows and speeds, sharing the archetype row.
+    """
+
+    __slots__ = ("version", "rows", "speeds")
+
+    def __init__(self, the_version, the_rows, the_speeds):
+        """__init__ initializes MoveToSystemData instance.
+        """
+        self.version = the_version
+        self.rows = the_rows
+        self.speeds = the_speeds
+
+
+class MoveToSystem(System):
+    """MoveToSystem class moves all entities with a MoveTo component, adding
+    speed multiplied by dt to the position of every entity in one vectorized
+    operation per archetype.
+
+    Positions are updated in the scene transform pool, so transforms read
+    them without any copy. Speeds are kept in arrays, rebuilt when archetype
+    rows change and updated when a MoveTo speed is assigned. MoveTo
+    components move themselves when the system does not run in a frame, or
+    if the scene has no transform pool.
+    """
+
+    COMPONENTS = (MoveTo,)
+
+    def __init__(self, the_name, the_engine=None, **kwargs):
+        """__init__ initializes MoveToSystem instance.
+
+        Args:
+            the_name (str): MoveToSystem instance name.
+            the_engine (Engine): Engine instance.
+            the_dt (float): time step every position is moved with.
+        """
+        super().__init__(the_name, the_engine, **kwargs)
+        self.dt = kwargs.get("the_dt", 1)
+        self.changed = []
+
+    def get_data(self, the_archetype, the_move_tos):
+        """get_data returns rows and speeds arrays for the given archetype,
+        building them if archetype rows have changed.
+        """
+        a_data = the_archetype.data.get(self, None)
+        if a_data is not None and a_data.version == the_archetype.version:
+            return a_data
+        a_rows = numpy.array(the_archetype.get_transform_rows(), dtype=numpy.intp)
+        a_speeds = numpy.zeros((len(the_move_tos), 2), dtype=numpy.float64)
+        for a_index, a_move_to in enumerate(the_move_tos):
+            a_move_to.system = self
+            a_speeds[a_index] = (a_move_to.speed[0], a_move_to.speed[1])
+        a_data = MoveToSystemData(the_archetype.version, a_rows, a_speeds)
+        the_archetype.data[self] = a_data
+        return a_data
+
+    def on_speed_changed(self, the_move_to):
+        """on_speed_changed is called by a MoveTo component every time its
+        speed is assigned.
+        """
+        self.changed.append(the_move_to)
+
+    def on_update(self):
+        """on_update moves all entities with a MoveTo component in the active
+        scene, if it has a transform pool.
+        """
+        a_scene = self.get_scene()
+        if a_scene is None or a_scene.transform_pool is None:
+            return
+        self.update_changed_speeds(a_scene)
+        super().on_update()
+
+    def on_update_archetype(self, the_archetype):
+        """on_update_archetype adds speed multiplied by dt to the position of
+        every entity in the archetype with an active MoveTo component.
+        """
+        a_move_tos = the_archetype.get_column(MoveTo)
+        a_data = self.get_data(the_archetype, a_move_tos)
+        a_pool = the_archetype.entities[0].transform.pool
+        a_active = numpy.fromiter((a_move_to.active for a_move_to in a_move_tos), dtype=bool, count=len(a_move_tos))
+        if a_active.all():
+            a_rows = a_data.rows
+            a_pool.positions[a_rows] += a_data.speeds * self.dt
+        else:
+            a_rows = a_data.rows[a_active]
+            a_pool.positions[a_rows] += a_data.speeds[a_active] * self.dt
+        a_pool.touch(a_rows)
+
+    def update_changed_speeds(self, the_scene):
+        """update_changed_speeds copies speeds assigned since the last update
+        to the speeds arrays.
+        """
+        for a_move_to in self.changed:
+            a_entity = a_move_to.entity
+            if a_entity is None:
+                continue
+            a_archetype = the_scene.archetypes.entity_archetypes.get(a_entity.id, None)
+            if a_archetype is None:
+                continue
+            a_data = a_archetype.data.get(self, None)
+            if a_data is None or a_data.version != a_archetype.version:
+                continue
+            a_data.speeds[a_archetype.rows[a_entity.id]] = (a_move_to.speed[0], a_move_to.speed[1])
+        self.changed = []
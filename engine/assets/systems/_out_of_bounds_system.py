@@ -0,0 +1,105 @@
+"""_out_of_bounds_system.py contains the system checking all OutOfBounds
+components at once.
+"""
+
+from ..._system import System
+from ..components import OutOfBounds
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class OutOfBoundsSystemData:
+    """OutOfBoundsSystemData class contains OutOfBoundsSystem arrays for one
+    archetype, transform pool rows sharing the archetype row.
+    """
+
+    __slots__ = ("version", "rows")
+
+    def __init__(self, the_version, the_rows):
+        """__init__ initializes OutOfBoundsSystemData instance.
+        """
+        self.version = the_version
+        self.rows = the_rows
+
+
+class OutOfBoundsSystem(System):
+    """OutOfBoundsSystem class checks all entities with an OutOfBounds
+    component against the engine screen in one array pass per archetype,
+    using the scene transform pool, and triggers all out of bounds delegates
+    in one batch.
+
+    Bounds are checked like OutOfBounds does, with rectangles truncated to
+    integers. OutOfBounds components check themselves when the system does
+    not run in a frame, or if the scene has no transform pool.
+    """
+
+    COMPONENTS = (OutOfBounds,)
+    LOCATIONS = ("left", "right", "top", "down")
+
+    def __init__(self, the_name, the_engine=None, **kwargs):
+        """__init__ initializes OutOfBoundsSystem instance.
+        """
+        super().__init__(the_name, the_engine, **kwargs)
+        self.triggers = []
+
+    def get_data(self, the_archetype, the_out_of_bounds):
+        """get_data returns the rows array for the given archetype, building
+        it if archetype rows have changed.
+        """
+        a_data = the_archetype.data.get(self, None)
+        if a_data is not None and a_data.version == the_archetype.version:
+            return a_data
+        a_rows = numpy.array(the_archetype.get_transform_rows(), dtype=numpy.intp)
+        for a_component in the_out_of_bounds:
+            a_component.system = self
+        a_data = OutOfBoundsSystemData(the_archetype.version, a_rows)
+        the_archetype.data[self] = a_data
+        return a_data
+
+    def on_update(self):
+        """on_update checks all entities with an OutOfBounds component in the
+        active scene, if it has a transform pool, and triggers delegates for
+        all of them.
+        """
+        a_scene = self.get_scene()
+        if a_scene is None or a_scene.transform_pool is None:
+            return
+        self.triggers = []
+        super().on_update()
+        if self.triggers:
+            self.engine.delegate_manager.trigger_delegates(self.triggers, True)
+        self.triggers = []
+
+    def on_update_archetype(self, the_archetype):
+        """on_update_archetype checks bounds for all entities in the archetype
+        with an active OutOfBounds component, and collects delegate triggers
+        for the ones with any callback.
+        """
+        a_out_of_bounds = the_archetype.get_column(OutOfBounds)
+        a_count = len(a_out_of_bounds)
+        a_data = self.get_data(the_archetype, a_out_of_bounds)
+        a_pool = the_archetype.entities[0].transform.pool
+        a_x, a_y, a_w, a_h = [numpy.trunc(a_array) for a_array in a_pool.get_rects(a_data.rows)]
+        a_bounce = numpy.fromiter((a_component.bounce for a_component in a_out_of_bounds), dtype=bool, count=a_count)
+        a_active = numpy.fromiter((a_component.active for a_component in a_out_of_bounds), dtype=bool, count=a_count)
+        a_width = self.engine.width
+        a_height = self.engine.height
+        a_right = a_x + a_w
+        a_down = a_y + a_h
+        a_tests = numpy.stack([numpy.where(a_bounce, a_x < 0, a_right < 0),
+                               numpy.where(a_bounce, a_right > a_width, a_x > a_width),
+                               numpy.where(a_bounce, a_y < 0, a_down < 0),
+                               numpy.where(a_bounce, a_down > a_height, a_y > a_height)], axis=1)
+        a_tests &= a_active[:, None]
+        a_delegate_manager = self.engine.delegate_manager
+        for a_index in numpy.flatnonzero(a_tests.any(axis=1)).tolist():
+            a_component = a_out_of_bounds[a_index]
+            a_delegate = a_component.delegates[OutOfBounds.OUT_OF_BOUNDS_EVENT_NAME]
+            if not a_delegate_manager.has_callbacks(a_delegate.id):
+                continue
+            for a_location, a_test in zip(self.LOCATIONS, a_tests[a_index].tolist()):
+                if a_test:
+                    self.triggers.append((a_delegate.id, {"the_entity": a_component.entity, "the_location": a_location}))
@@ -8,6 +8,7 @@ from pygame.constants import K_RIGHT
 from engine import (Component, DebugManager, DelegateManager, Engine, Entity,
                     GameManager, Log, Scene, SceneManager, Transform)
 from engine.assets.components import Box, Collider2D, KeyController, MoveTo, SceneHandlerComponent, OutOfBounds
+from engine.assets.systems import MoveToSystem, OutOfBoundsSystem
 
 
 # class Box(Component):
@@ -40,7 +41,7 @@ def move_to_on_collision_callback(self):
 
 if __name__ == "__main__":
     # a_engine = Engine("main", 800, 400, the_end_condition=lambda self: self.frames == 2)
-    a_engine = Engine("main", 800, 400)
+    a_engine = Engine("main", 800, 400, the_systems=[MoveToSystem("move-to-system"), OutOfBoundsSystem("out-of-bounds-system")])
     Log.Main().Engine(a_engine.name).call()
     # a_engine.debug_manager = DebugManager("mgr/debug")
     a_engine.delegate_manager = DelegateManager("mgr/delegate")
@@ -61,7 +62,7 @@ if __name__ == "__main__":
         "component:KeyController": move_to_keyboard_callback,
         "component:OutOfBounds": move_to_out_of_bounds_callback,
         # "entity:{}:{}:{}".format(Scene.SCENE_HANDLER_ENTITY_NAME, Scene.SCENE_HANDLER_COMPONENT_NAME, Scene.ON_COLLISION_EVENT_NAME): move_to_on_collision_callback,
-        "scene:{}".format(Scene.ON_COLLISION_EVENT_NAME): move_to_on_collision_callback,
+        "scene:{}".format(Scene.ON_COLLISION_ENTER_EVENT_NAME): move_to_on_collision_callback,
         # "KeyController": lambda self : lambda the_key : print(self.speed.x, self.speed.y, the_key),
             # pygame.K_UP: pygame.Vector2(0, -2), 
             # pygame.K_DOWN: pygame.Vector2(0, 2), 
@@ -73,7 +74,7 @@ if __name__ == "__main__":
     a_rock = a_engine.new_entity(Entity("Rock"))
     a_rock.transform = Transform(the_position=pygame.Vector2(200, 50), the_dim=pygame.Vector2(10, 10))
     a_rock.add_component(Box("Rock/Body", the_color="red"))
-    a_rock.add_component(Collider2D("Rock/Collider"))
+    a_rock.add_component(Collider2D("Rock/Collider", the_static=True))
     a_scene_handler = a_engine.new_entity(Entity(Scene.SCENE_HANDLER_ENTITY_NAME))
     a_scene_handler.add_component(SceneHandlerComponent(Scene.SCENE_HANDLER_COMPONENT_NAME))
     a_engine.scene_manager.active_scene.scene.add_entity(a_scene_handler)
@@ -0,0 +1,70 @@
+import random
+
+import pygame
+import sure
+from engine._aabb_tree import AABBTree, get_bounds, raycast_bounds
+
+
+def check_tree(the_node):
+    """check_tree validates node bounds and heights, and returns the node
+    height.
+    """
+    if the_node.is_leaf:
+        return 0
+    a_height1 = check_tree(the_node.child1)
+    a_height2 = check_tree(the_node.child2)
+    the_node.child1.parent.should.equal(the_node)
+    the_node.child2.parent.should.equal(the_node)
+    abs(a_height1 - a_height2).should.be.lower_than(2)
+    the_node.height.should.equal(1 + max(a_height1, a_height2))
+    return the_node.height
+
+
+def test_aabb_tree_queries():
+    a_random = random.Random(0)
+    a_tree = AABBTree(4)
+    a_rects = {}
+    for a_key in range(300):
+        a_rects[a_key] = pygame.Rect(a_random.randint(0, 500), a_random.randint(0, 500), a_random.randint(1, 30), a_random.randint(1, 30))
+        a_tree.insert(a_key, a_rects[a_key], a_key)
+    for a_key in range(0, 300, 3):
+        a_tree.remove(a_key)
+        del a_rects[a_key]
+    for a_key, a_rect in a_rects.items():
+        a_rect.move_ip(a_random.randint(-10, 10), a_random.randint(-10, 10))
+        a_tree.move(a_key, a_rect)
+    len(a_tree).should.equal(len(a_rects))
+    check_tree(a_tree.root).should.be.lower_than(20)
+    for _ in range(50):
+        a_area = pygame.Rect(a_random.randint(0, 500), a_random.randint(0, 500), a_random.randint(1, 100), a_random.randint(1, 100))
+        sorted(a_tree.query_rect(a_area)).should.equal(sorted(k for k, r in a_rects.items() if r.colliderect(a_area)))
+        a_point = (a_random.randint(0, 500), a_random.randint(0, 500))
+        sorted(a_tree.query_point(a_point)).should.equal(sorted(k for k, r in a_rects.items() if r.collidepoint(a_point)))
+        a_start = (a_random.randint(0, 500), a_random.randint(0, 500))
+        a_end = (a_random.randint(0, 500), a_random.randint(0, 500))
+        a_hits = a_tree.raycast(a_start, a_end)
+        sorted(k for _, k in a_hits).should.equal(sorted(k for k, r in a_rects.items() if raycast_bounds(get_bounds(r), a_start, (a_end[0] - a_start[0], a_end[1] - a_start[1])) is not None))
+        [f for f, _ in a_hits].should.equal(sorted(f for f, _ in a_hits))
+
+
+def test_aabb_tree_remove_batch():
+    a_random = random.Random(1)
+    for a_count, a_removed in [(400, 40), (400, 300), (400, 400), (1, 1)]:
+        a_tree = AABBTree(4)
+        a_rects = {}
+        for a_key in range(a_count):
+            a_rects[a_key] = pygame.Rect(a_random.randint(0, 500), a_random.randint(0, 500), a_random.randint(1, 30), a_random.randint(1, 30))
+            a_tree.insert(a_key, a_rects[a_key], a_key)
+        a_keys = a_random.sample(range(a_count), a_removed)
+        a_tree.remove_batch(a_keys + [-1]).should.equal(a_removed)
+        for a_key in a_keys:
+            del a_rects[a_key]
+        len(a_tree).should.equal(len(a_rects))
+        if not a_rects:
+            a_tree.root.should.be.none
+            continue
+        check_tree(a_tree.root)
+        for _ in range(30):
+            a_area = pygame.Rect(a_random.randint(0, 500), a_random.randint(0, 500), a_random.randint(1, 100), a_random.randint(1, 100))
+            sorted(a_tree.query_rect(a_area)).should.equal(sorted(k for k, r in a_rects.items() if r.colliderect(a_area)))
+        a_tree.remove_batch([]).should.equal(0)
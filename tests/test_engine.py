@@ -1,6 +1,7 @@
 import sure
 from engine import (Component, DelegateManager, Engine, Entity, GameManager,
                     Scene, SceneManager)
+from engine._iobject import IObject
 
 
 def test_engine():
@@ -25,6 +26,15 @@ def test_engine():
     Engine.delete()
 
 
+def test_engine_delete_resets_ids():
+    Engine("test/engine", 640, 480)
+    a_entity = Entity("entity")
+    IObject.get_object(a_entity.id).should.equal(a_entity)
+    Engine.delete()
+    IObject.get_object(a_entity.id).should.be.none
+    Entity("entity").id.should.equal(1)
+
+
 def test_run():
     # setup
     a_engine = Engine("test/engine", 800, 400, the_end_condition=lambda self: self.frames == 2)
@@ -0,0 +1,91 @@
+import gc
+import pygame
+import sure
+from engine import Component, Entity, Transform
+from engine.assets.components import Box, CircleCollider2D, Collider2D, MoveTo
+
+
+class Player(Entity):
+    pass
+
+
+def test_entity_component_indexes():
+    a_entity = Entity("entity")
+    a_box = Box("box")
+    a_move_to = MoveTo("move-to")
+    a_circle = CircleCollider2D("circle")
+    for a_component in [a_box, a_move_to, a_circle]:
+        a_entity.add_component(a_component)
+    a_entity.add_component.when.called_with(Box("other-box")).should.throw(Exception)
+    a_entity.get_component("MoveTo").should.equal(a_move_to)
+    a_entity.get_component("Collider2D").should.be.none
+    a_entity.get_component_by_type(Collider2D).should.equal(a_circle)
+    a_entity.get_components_by_type(Component).should.equal([a_box, a_move_to, a_circle])
+    a_entity.has_collider().should.be.true
+    a_entity.get_collider_component().should.be.none
+    a_circle.loaded = True
+    a_entity.get_collider_component().should.equal(a_circle)
+    a_collider = Collider2D("collider", the_static=True)
+    a_entity.add_component(a_collider)
+    a_entity.collider_component.should.equal(a_circle)
+    a_entity.get_components_by_type(Collider2D).should.equal([a_circle, a_collider])
+    a_entity.remove_component(a_circle).should.be.true
+    a_entity.collider_component.should.equal(a_collider)
+    a_entity.has_static_collider().should.be.true
+    a_entity.get_component("CircleCollider2D").should.be.none
+    a_entity.get_components_by_type(CircleCollider2D).should.be.empty
+    a_entity.remove_components().should.be.true
+    a_entity.has_collider().should.be.false
+    a_entity.get_component_by_type(Component).should.be.none
+
+
+def test_entity_slots():
+    Entity("entity").should_not.have.property("__dict__")
+    Box("box").should_not.have.property("__dict__")
+    Transform().should_not.have.property("__dict__")
+    a_entity = Player("player")
+    a_entity.speed = 1
+    a_entity.speed.should.equal(1)
+
+
+def test_entity_id_registry():
+    a_entity = Entity("entity")
+    a_child = Entity("child")
+    a_entity.add_child(a_child)
+    a_entity.id.should.be.an(int)
+    Entity.get_object(a_entity.id).should.be(a_entity)
+    a_entity.delete_child(a_entity.id).should.be.false
+    a_entity.delete_child(a_child.id).should.be.true
+    a_entity.children.should.be.empty
+    a_id = a_child.id
+    del a_child
+    gc.collect()
+    Entity.get_object(a_id).should.be.none
+
+
+def test_entity_clone():
+    a_entity = Player("player", tag="hero")
+    a_entity.transform = Transform(the_position=pygame.Vector2(1, 2), the_dim=pygame.Vector2(3, 4))
+    a_entity.speed = 1
+    a_entity.add_component(Collider2D("collider"))
+    a_entity.add_component(MoveTo("move", the_speed=pygame.Vector2(2, 0)))
+    a_entity.add_child(Entity("child"))
+    a_clone = a_entity.clone()
+    a_clone.should.be.a(Player)
+    a_clone.id.should_not.equal(a_entity.id)
+    Entity.get_object(a_clone.id).should.be(a_clone)
+    a_clone.name.should.equal("player")
+    a_clone.tag.should.equal("hero")
+    a_clone.speed.should.equal(1)
+    a_clone.transform.should_not.be(a_entity.transform)
+    a_clone.transform.get_rect().should.equal(a_entity.transform.get_rect())
+    a_clone.children[0].parent.should.be(a_clone)
+    a_clone.children[0].should_not.be(a_entity.children[0])
+    [x.name for x in a_clone.components].should.equal(["collider", "move"])
+    a_move = a_clone.get_component("MoveTo")
+    a_move.entity.should.be(a_clone)
+    a_move.should_not.be(a_entity.get_component("MoveTo"))
+    a_clone.unloaded_components.should.equal(a_clone.components)
+    a_clone.has_collider().should.be.true
+    a_move.speed *= -1
+    a_entity.get_component("MoveTo").speed.should.equal(pygame.Vector2(2, 0))
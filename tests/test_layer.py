@@ -0,0 +1,56 @@
+import pygame
+import sure
+from engine import Component, Entity, Layer, Transform
+
+
+class Sprite(Component):
+
+    def __init__(self, the_name, the_rendered):
+        super().__init__(the_name)
+        self.rendered = the_rendered
+
+    def on_render(self):
+        self.rendered.append(self.entity.name)
+
+
+def new_sprite_entity(the_name, the_y, the_rendered):
+    a_entity = Entity(the_name)
+    a_entity.transform = Transform(the_position=pygame.Vector2(0, the_y), the_dim=pygame.Vector2(10, 10))
+    a_entity.add_component(Sprite("{}/sprite".format(the_name), the_rendered))
+    a_entity.load_unloaded_components()
+    return a_entity
+
+
+def test_layer_insertion_order():
+    a_rendered = []
+    a_layer = Layer("middle")
+    a_entities = [new_sprite_entity("entity/{}".format(i), 10 - i, a_rendered) for i in range(4)]
+    for a_entity in a_entities:
+        a_layer.add(a_entity)
+    a_layer.add(a_entities[0])
+    list(a_layer).should.equal(a_entities)
+    a_layer.discard(a_entities[1]).should.be.true
+    a_layer.discard(a_entities[1]).should.be.false
+    a_layer.should_not.contain(a_entities[1])
+    len(a_layer).should.equal(3)
+    a_layer.add(a_entities[1])
+    list(a_layer).should.equal([a_entities[0], a_entities[2], a_entities[3], a_entities[1]])
+    a_entities[2].visible = False
+    a_layer.on_render()
+    a_rendered.should.equal(["entity/0", "entity/3", "entity/1"])
+
+
+def test_layer_sort_key():
+    a_rendered = []
+    a_layer = Layer("world", the_sort_key=Layer.y_sort)
+    a_entities = [new_sprite_entity("entity/{}".format(i), y, a_rendered) for i, y in enumerate([30, 10, 20])]
+    for a_entity in a_entities:
+        a_layer.add(a_entity)
+    list(a_layer).should.equal([a_entities[1], a_entities[2], a_entities[0]])
+    a_batch = a_layer.get_batch()
+    a_layer.get_batch().should.be(a_batch)
+    a_entities[1].transform.position.y = 25
+    list(a_layer).should.equal([a_entities[2], a_entities[1], a_entities[0]])
+    a_layer.get_batch().should_not.be(a_batch)
+    a_layer.on_render()
+    a_rendered.should.equal(["entity/2", "entity/1", "entity/0"])
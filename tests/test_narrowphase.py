@@ -0,0 +1,58 @@
+import random
+
+import pygame
+import sure
+from engine import _narrowphase
+from engine._narrowphase import (collide_circle_rect_scalar, collide_colliders, collide_colliders_scalar,
+                                 collide_rects, collide_rects_scalar)
+
+
+def new_rects(the_count, the_seed=0):
+    a_random = random.Random(the_seed)
+    return [pygame.Rect(a_random.randint(0, 300), a_random.randint(0, 300), a_random.randint(-20, 20), a_random.randint(-20, 20))
+            for _ in range(the_count)]
+
+
+def test_collide_rects_numpy_matches_scalar():
+    a_rects = new_rects(400)
+    a_all_pairs = [(i, j) for i in range(len(a_rects)) for j in range(i + 1, len(a_rects))]
+    a_expected = collide_rects_scalar(a_rects, a_all_pairs)
+    a_expected.should_not.be.empty
+    collide_rects(a_rects).should.equal(a_expected)
+    collide_rects(a_rects, a_all_pairs).should.equal(a_expected)
+    a_pairs = a_all_pairs[::7]
+    collide_rects(a_rects, a_pairs).should.equal(collide_rects_scalar(a_rects, a_pairs))
+
+
+def test_collide_rects_without_numpy():
+    a_rects = new_rects(100)
+    a_expected = collide_rects(a_rects)
+    a_numpy = _narrowphase.numpy
+    _narrowphase.numpy = None
+    try:
+        collide_rects(a_rects).should.equal(a_expected)
+    finally:
+        _narrowphase.numpy = a_numpy
+
+
+def test_collide_colliders_numpy_matches_scalar():
+    a_random = random.Random(3)
+    a_rects = new_rects(300, 3)
+    a_circles = [None if a_random.random() < 0.5 else (a_random.uniform(0, 300), a_random.uniform(0, 300), a_random.uniform(0, 15))
+                 for _ in a_rects]
+    a_pairs = [(i, j) for i in range(len(a_rects)) for j in range(i + 1, len(a_rects))]
+    a_expected = collide_colliders_scalar(a_rects, a_circles, a_pairs)
+    a_kinds = set((a_circles[i] is None, a_circles[j] is None) for i, j in a_expected)
+    a_kinds.should.equal({(True, True), (True, False), (False, True), (False, False)})
+    collide_colliders(a_rects, a_circles).should.equal(a_expected)
+    collide_colliders(a_rects, None).should.equal(collide_rects(a_rects))
+
+
+def test_collide_circle_rect_scalar():
+    a_rect = pygame.Rect(10, 10, 10, 10)
+    collide_circle_rect_scalar((5, 15, 6), a_rect).should.be.true
+    collide_circle_rect_scalar((5, 15, 5), a_rect).should.be.false
+    collide_circle_rect_scalar((6, 6, 5), a_rect).should.be.false
+    collide_circle_rect_scalar((7, 7, 5), a_rect).should.be.true
+    collide_circle_rect_scalar((15, 15, 1), a_rect).should.be.true
+    collide_circle_rect_scalar((15, 15, 1), pygame.Rect(10, 10, 0, 10)).should.be.false
@@ -0,0 +1,578 @@
+import random
+
+import pygame
+import sure
+from engine import DelegateManager, Engine, Entity, EntityPool, Layer, Prefab, Scene, SceneManager, Transform
+from engine._broadphase import BruteForceBroadphase, GridBroadphase, SweepAndPruneBroadphase
+from engine.assets.components import Box, CircleCollider2D, Collider2D, MoveTo, OutOfBounds, SceneHandlerComponent
+
+
+def new_collision_scene(the_count, the_seed=0, **kwargs):
+    """new_collision_scene creates an engine with an active scene with the
+    given number of random colliders, all of them loaded and started.
+    """
+    a_random = random.Random(the_seed)
+    a_engine = Engine("test/engine", 800, 400)
+    a_engine.delegate_manager = DelegateManager("delegate-manager")
+    a_engine.scene_manager = SceneManager("scene-manager")
+    a_scene = Scene("test-scene", **kwargs)
+    a_engine.scene_manager.add_scene(a_scene)
+    a_engine.scene_manager.assign_active_scene()
+    a_scene.on_init()
+    a_handler = Entity(Scene.SCENE_HANDLER_ENTITY_NAME)
+    a_handler.add_component(SceneHandlerComponent(Scene.SCENE_HANDLER_COMPONENT_NAME))
+    a_scene.add_entity(a_handler)
+    for a_index in range(the_count):
+        a_entity = Entity("entity/{}".format(a_index))
+        a_entity.transform = Transform(the_position=pygame.Vector2(a_random.randint(0, 400), a_random.randint(0, 200)),
+                                       the_dim=pygame.Vector2(a_random.randint(0, 30), a_random.randint(0, 30)))
+        a_entity.add_component(Collider2D("entity/{}/collider".format(a_index)))
+        a_scene.add_entity(a_entity)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    return a_engine, a_scene
+
+
+def record_collisions(the_scene):
+    """record_collisions registers a callback to the scene collision delegate
+    and returns the list where collisions are being recorded.
+    """
+    a_collisions = []
+    a_handler = the_scene.lookup_by_name(the_scene.entities, Scene.SCENE_HANDLER_ENTITY_NAME)
+    a_component = a_handler.get_component("SceneHandlerComponent")
+    a_delegate = a_component.get_delegate(Scene.ON_COLLISION_EVENT_NAME)
+    the_scene.engine.delegate_manager.register_callback_to_delegate(
+        a_component, a_delegate, lambda the_one_entity, the_other_entity: a_collisions.append((the_one_entity.name, the_other_entity.name)))
+    return a_collisions
+
+
+def test_grid_broadphase_matches_brute_force():
+    a_engine, a_scene = new_collision_scene(200)
+    a_collisions = record_collisions(a_scene)
+    a_scene.broadphase = BruteForceBroadphase()
+    a_scene.check_collisions()
+    a_expected = list(a_collisions)
+    a_expected.should_not.be.empty
+    for a_cell_size in [None, 1, 7, 64, 1000]:
+        del a_collisions[:]
+        a_scene.broadphase = GridBroadphase(a_cell_size)
+        a_scene.check_collisions()
+        a_collisions.should.equal(a_expected)
+    Engine.delete()
+
+
+def test_unknown_collision_mode():
+    (lambda: Scene("test-scene", collision_mode="collision-mode:unknown")).when.called_with().should.throw(Exception)
+
+
+def test_sweep_and_prune_broadphase_matches_brute_force():
+    a_engine, a_scene = new_collision_scene(100, collision_mode=Scene.COLLISION_MODE_SWEEP_AND_PRUNE)
+    a_collisions = record_collisions(a_scene)
+    a_sweep_and_prune = a_scene.broadphase
+    a_brute_force = BruteForceBroadphase()
+    a_random = random.Random(1)
+    for _ in range(5):
+        a_scene.broadphase = a_brute_force
+        del a_collisions[:]
+        a_scene.check_collisions()
+        a_expected = list(a_collisions)
+        a_scene.broadphase = a_sweep_and_prune
+        del a_collisions[:]
+        a_scene.check_collisions()
+        a_collisions.should.equal(a_expected)
+        for a_entity in a_scene.collision_collection:
+            a_entity.transform.position.x += a_random.randint(-5, 5)
+            a_entity.transform.position.y += a_random.randint(-5, 5)
+    a_entity = a_scene.lookup_by_name(a_scene.entities, "entity/0")
+    a_scene.remove_entity(a_entity)
+    a_scene.on_after_update()
+    a_scene.collision_collection.should_not.contain(a_entity)
+    a_sweep_and_prune.removed.should.contain(a_entity.id)
+    a_scene.check_collisions()
+    a_sweep_and_prune.entity_endpoints.should_not.contain(a_entity.id)
+    len(a_sweep_and_prune.endpoints).should.equal(2 * len(a_sweep_and_prune.entity_endpoints))
+    Engine.delete()
+
+
+def test_scene_spatial_queries():
+    a_engine, a_scene = new_collision_scene(0)
+    a_entity = Entity("entity/query")
+    a_entity.transform = Transform(the_position=pygame.Vector2(100, 100), the_dim=pygame.Vector2(10, 10))
+    a_scene.add_entity(a_entity)
+    a_scene.on_frame_start()
+    a_scene.query_point((105, 105)).should.equal([a_entity])
+    a_scene.query_point((95, 105)).should.be.empty
+    a_scene.query_rect(pygame.Rect(0, 0, 101, 101)).should.equal([a_entity])
+    a_scene.raycast((0, 0), (200, 200)).should.equal([a_entity])
+    a_entity.transform.position.x += 100
+    a_scene.on_after_update()
+    a_scene.query_point((105, 105)).should.be.empty
+    a_scene.query_point((205, 105)).should.equal([a_entity])
+    a_scene.raycast((0, 105), (300, 105)).should.equal([a_entity])
+    Engine.delete()
+
+
+def test_collision_contact_events():
+    a_engine, a_scene = new_collision_scene(0, collision_stay_frames=2)
+    a_one = Entity("entity/one")
+    a_one.transform = Transform(the_position=pygame.Vector2(0, 0), the_dim=pygame.Vector2(10, 10))
+    a_one.add_component(Collider2D("entity/one/collider"))
+    a_other = Entity("entity/other")
+    a_other.transform = Transform(the_position=pygame.Vector2(5, 5), the_dim=pygame.Vector2(10, 10))
+    a_other.add_component(Collider2D("entity/other/collider"))
+    a_scene.add_entity(a_one)
+    a_scene.add_entity(a_other)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_events = []
+    a_component = a_scene.get_scene_handler_component()
+    for a_event_name in [Scene.ON_COLLISION_ENTER_EVENT_NAME, Scene.ON_COLLISION_STAY_EVENT_NAME, Scene.ON_COLLISION_EXIT_EVENT_NAME]:
+        a_engine.delegate_manager.register_callback_to_delegate(
+            a_component, a_component.get_delegate(a_event_name),
+            lambda the_one_entity, the_other_entity, the_event_name=a_event_name: a_events.append((the_event_name, the_one_entity.name, the_other_entity.name)))
+    for _ in range(4):
+        a_scene.check_collisions()
+    a_other.transform.position.x = 100
+    a_scene.check_collisions()
+    a_scene.check_collisions()
+    a_events.should.equal([(Scene.ON_COLLISION_ENTER_EVENT_NAME, "entity/one", "entity/other"),
+                           (Scene.ON_COLLISION_STAY_EVENT_NAME, "entity/one", "entity/other"),
+                           (Scene.ON_COLLISION_EXIT_EVENT_NAME, "entity/one", "entity/other")])
+    a_scene.contacts.should.be.empty
+    Engine.delete()
+
+
+def test_collision_contact_removed_entity():
+    a_engine, a_scene = new_collision_scene(0)
+    a_one = Entity("entity/one")
+    a_one.transform = Transform(the_position=pygame.Vector2(0, 0), the_dim=pygame.Vector2(10, 10))
+    a_one.add_component(Collider2D("entity/one/collider"))
+    a_other = Entity("entity/other")
+    a_other.transform = Transform(the_position=pygame.Vector2(5, 5), the_dim=pygame.Vector2(10, 10))
+    a_other.add_component(Collider2D("entity/other/collider"))
+    a_scene.add_entity(a_one)
+    a_scene.add_entity(a_other)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_events = []
+    a_component = a_scene.get_scene_handler_component()
+    a_engine.delegate_manager.register_callback_to_delegate(
+        a_component, a_component.get_delegate(Scene.ON_COLLISION_EXIT_EVENT_NAME),
+        lambda the_one_entity, the_other_entity: a_events.append((the_one_entity.name, the_other_entity.name, the_other_entity.state)))
+    a_scene.check_collisions()
+    len(a_scene.contacts).should.equal(1)
+    a_state = a_other.state
+    a_scene.remove_entity(a_other)
+    a_scene.on_after_update()
+    a_events.should.equal([("entity/one", "entity/other", a_state)])
+    a_scene.contacts.should.be.empty
+    a_scene.check_collisions()
+    a_events.should.have.length_of(1)
+    Engine.delete()
+
+
+def test_collision_layers():
+    a_engine, a_scene = new_collision_scene(100)
+    a_collisions = record_collisions(a_scene)
+    a_random = random.Random(2)
+    a_colliders = [a_entity.get_collider_component() for a_entity in a_scene.collision_collection if a_entity.get_collider_component()]
+    for a_collider in a_colliders:
+        a_collider.category = a_random.choice([0x1, 0x2, 0x4])
+        a_collider.mask = a_random.choice([0x1, 0x3, 0x6, 0x7])
+    a_expected = []
+    for i in range(len(a_colliders)):
+        for j in range(i + 1, len(a_colliders)):
+            a_one = a_colliders[i]
+            a_other = a_colliders[j]
+            if (a_one.category & a_other.mask) and (a_other.category & a_one.mask) and a_one.get_collider_rect().colliderect(a_other.get_collider_rect()):
+                a_expected.append((a_one.entity.name, a_other.entity.name))
+    a_expected.should_not.be.empty
+    for a_broadphase in [BruteForceBroadphase(), GridBroadphase(), SweepAndPruneBroadphase()]:
+        del a_collisions[:]
+        a_scene.broadphase = a_broadphase
+        a_scene.check_collisions()
+        a_collisions.should.equal(a_expected)
+    Engine.delete()
+
+
+def test_static_colliders():
+    a_engine, a_scene = new_collision_scene(100)
+    a_collisions = record_collisions(a_scene)
+    a_scene.broadphase = BruteForceBroadphase()
+    a_scene.check_collisions()
+    a_expected = list(a_collisions)
+    for a_entity in a_scene.collision_collection[::2]:
+        a_entity.get_collider_component().static = True
+    a_scene.clear_collisions()
+    for a_entity in a_scene.loaded_entities:
+        if a_entity.has_collider():
+            a_scene.add_collider_entity(a_entity)
+    len(a_scene.static_collision_collection).should.equal(50)
+    for a_broadphase in [BruteForceBroadphase(), GridBroadphase(), SweepAndPruneBroadphase()]:
+        del a_collisions[:]
+        a_scene.broadphase = a_broadphase
+        for a_entity in a_scene.dynamic_collision_collection:
+            a_broadphase.add(a_entity)
+        a_scene.check_collisions()
+        a_collisions.should.equal([(a_one, a_other) for a_one, a_other in a_expected
+                                   if not (a_scene.lookup_by_name(a_scene.entities, a_one).has_static_collider() and
+                                           a_scene.lookup_by_name(a_scene.entities, a_other).has_static_collider())])
+    a_scene.static_collision_dirty.should.be.false
+    len(a_scene.static_collision_index).should.equal(50)
+    Engine.delete()
+
+
+def test_circle_colliders():
+    a_engine, a_scene = new_collision_scene(0)
+    a_collisions = record_collisions(a_scene)
+    for a_name, a_position, a_collider in [("circle/one", (0, 0), CircleCollider2D("circle/one/collider")),
+                                           ("circle/other", (12, 12), CircleCollider2D("circle/other/collider")),
+                                           ("box", (18, 8), Collider2D("box/collider"))]:
+        a_entity = Entity(a_name)
+        a_entity.transform = Transform(the_position=pygame.Vector2(a_position), the_dim=pygame.Vector2(10, 10))
+        a_entity.add_component(a_collider)
+        a_scene.add_entity(a_entity)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_scene.check_collisions()
+    a_collisions.should.equal([("circle/other", "box")])
+    a_circle = a_scene.lookup_by_name(a_scene.entities, "circle/other")
+    a_circle.get_collider_component().radius = 12
+    del a_collisions[:]
+    a_scene.check_collisions()
+    a_collisions.should.equal([("circle/one", "circle/other"), ("circle/other", "box")])
+    Engine.delete()
+
+
+def test_circle_collider_child():
+    a_engine, a_scene = new_collision_scene(0)
+    a_collisions = record_collisions(a_scene)
+    a_parent = Entity("parent", the_transform=Transform(the_position=pygame.Vector2(100, 0), the_dim=pygame.Vector2(20, 20)))
+    a_child = Entity("child", the_transform=Transform(the_position=pygame.Vector2(10, 0), the_dim=pygame.Vector2(4, 4)))
+    a_child.add_component(CircleCollider2D("child/collider"))
+    a_parent.add_child(a_child)
+    a_box = Entity("box", the_transform=Transform(the_position=pygame.Vector2(111, 1), the_dim=pygame.Vector2(2, 2)))
+    a_box.add_component(Collider2D("box/collider"))
+    a_other = Entity("other", the_transform=Transform(the_position=pygame.Vector2(11, 1), the_dim=pygame.Vector2(2, 2)))
+    a_other.add_component(Collider2D("other/collider"))
+    for a_entity in [a_parent, a_box, a_other]:
+        a_scene.add_entity(a_entity)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_collider = a_child.get_collider_component()
+    a_collider.get_collider_circle().should.equal((112, 2, 2))
+    a_scene.check_collisions()
+    a_collisions.should.equal([("child", "box")])
+    a_parent.transform.scale = pygame.Vector2(2, 2)
+    a_collider.get_collider_circle().should.equal((124, 4, 4))
+    Engine.delete()
+
+
+def test_scene_component_query():
+    a_engine, a_scene = new_collision_scene(4)
+    a_entities = [a_scene.lookup_by_name(a_scene.entities, "entity/{}".format(i)) for i in range(4)]
+    a_query = a_scene.query(MoveTo, Collider2D)
+    a_query.should.be.empty
+    sorted(x.name for x in a_scene.query(Collider2D)).should.equal(["entity/{}".format(i) for i in range(4)])
+    for a_entity in a_entities[:3]:
+        a_entity.add_component(MoveTo("{}/move-to".format(a_entity.name)))
+    a_scene.on_frame_end()
+    a_scene.query(MoveTo, Collider2D).should.be(a_query)
+    a_scene.query(Collider2D, MoveTo).should.be(a_query)
+    len(a_scene.archetypes.entity_queries).should.equal(2)
+    sorted(x.name for x in a_query).should.equal(["entity/0", "entity/1", "entity/2"])
+    a_entities[1].remove_component(a_entities[1].get_component("Collider2D"))
+    sorted(x.name for x in a_query).should.equal(["entity/0", "entity/2"])
+    [x.name for x in a_scene.query(MoveTo)].should.contain("entity/1")
+    a_scene.remove_entity(a_entities[0])
+    a_scene.on_after_update()
+    [x.name for x in a_query].should.equal(["entity/2"])
+    len(a_scene.query(Collider2D)).should.equal(2)
+    Engine.delete()
+
+
+def test_scene_name_and_tag_indexes():
+    a_engine, a_scene = new_collision_scene(3)
+    a_enemy = Entity("enemy", tag="enemy")
+    a_other_enemy = Entity("enemy", tag="enemy")
+    a_scene.add_entity(a_enemy)
+    a_scene.add_entity(a_other_enemy)
+    a_scene.get_entity_by_name("entity/1").name.should.equal("entity/1")
+    a_scene.get_entity_by_name("enemy").should.be(a_enemy)
+    a_scene.get_entity_by_name("unknown").should.be.none
+    a_scene.get_entities_by_tag("enemy").should.equal([a_enemy, a_other_enemy])
+    a_component = a_scene.get_scene_handler_component()
+    a_component.name.should.equal(Scene.SCENE_HANDLER_COMPONENT_NAME)
+    a_scene.get_scene_handler_component().should.be(a_component)
+    a_delegates = a_scene.get_collision_delegates()
+    a_scene.get_collision_delegates().should.be(a_delegates)
+    a_delegates[Scene.ON_COLLISION_EVENT_NAME].should.be(a_component.get_delegate(Scene.ON_COLLISION_EVENT_NAME))
+    a_scene.remove_entity(a_enemy).should.be.true
+    a_scene.remove_entity(a_enemy).should.be.false
+    a_scene.get_entity_by_name("enemy").should.be(a_other_enemy)
+    a_scene.get_entities_by_tag("enemy").should.equal([a_other_enemy])
+    a_scene.remove_entity(a_component.entity).should.be.true
+    a_scene.get_scene_handler_component().should.be.none
+    Engine.delete()
+
+
+def test_entity_pool():
+    a_engine, a_scene = new_collision_scene(2)
+
+    def new_bullet(the_position):
+        a_bullet = Entity("bullet")
+        a_bullet.transform = Transform(the_position=pygame.Vector2(the_position), the_dim=pygame.Vector2(4, 4))
+        a_bullet.add_component(Collider2D("bullet/collider"))
+        a_bullet.add_component(OutOfBounds("bullet/out-of-bounds"))
+        return a_bullet
+
+    def reset_bullet(the_bullet, the_position):
+        the_bullet.transform.position = pygame.Vector2(the_position)
+
+    a_pool = EntityPool(new_bullet, reset_bullet)
+    a_bullet = a_pool.spawn(a_scene, (10, 10))
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_component = a_bullet.get_component("OutOfBounds")
+    a_delegate = a_component.get_delegate()
+    a_delegate.should_not.be.none
+    a_delegates = len(a_engine.delegate_manager.delegates)
+    a_pool.release(a_bullet).should.be.true
+    len(a_pool).should.equal(0)
+    a_scene.on_after_update()
+    len(a_pool).should.equal(1)
+    a_scene.entities.should_not.contain(a_bullet)
+    a_scene.layers[a_bullet.layer].should_not.contain(a_bullet)
+    a_scene.query(Collider2D).should_not.contain(a_bullet)
+    a_scene.collision_collection.should_not.contain(a_bullet)
+    a_bullet.scene.should.be.none
+    a_pool.spawn(a_scene, (50, 60)).should.be(a_bullet)
+    len(a_pool).should.equal(0)
+    a_scene.get_entity_by_name("bullet").should.be(a_bullet)
+    a_scene.on_frame_start()
+    a_scene.loaded_entities.should.contain(a_bullet)
+    a_scene.query(Collider2D).should.contain(a_bullet)
+    a_scene.collision_collection.should.contain(a_bullet)
+    a_bullet.transform.get_rect().topleft.should.equal((50, 60))
+    a_bullet.get_component("OutOfBounds").should.be(a_component)
+    a_component.get_delegate().should.be(a_delegate)
+    len(a_engine.delegate_manager.delegates).should.equal(a_delegates)
+    a_pool.release(a_bullet)
+    a_pool.release(a_bullet).should.be.false
+    a_scene.on_after_update()
+    len(a_pool).should.equal(1)
+    Engine.delete()
+
+
+def test_scene_spawn_prefab():
+    a_engine, a_scene = new_collision_scene(0)
+    a_template = Entity("bullet")
+    a_template.transform = Transform(the_dim=pygame.Vector2(4, 4))
+    a_template.add_component(Collider2D("bullet/collider"))
+    a_template.add_component(MoveTo("bullet/move-to", the_speed=pygame.Vector2(1, 0)))
+    a_prefab = Prefab(a_template)
+    a_prefab.name.should.equal("bullet")
+    a_bullets = a_scene.spawn(a_prefab, 3, [(10, 20), (30, 40), (50, 60)])
+    len(a_bullets).should.equal(3)
+    len(set(x.id for x in a_bullets)).should.equal(3)
+    a_scene.get_entities_by_tag(None).should.be.empty
+    list(a_scene.entity_names["bullet"]).should.equal(a_bullets)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_scene.query(Collider2D, MoveTo).should.equal(a_bullets)
+    [x.transform.get_rect().topleft for x in a_bullets].should.equal([(10, 20), (30, 40), (50, 60)])
+    a_template.loaded.should.be.false
+    a_template.get_component("MoveTo").loaded.should.be.false
+    a_scene.entities.should_not.contain(a_template)
+    Engine.delete()
+
+
+def test_scene_command_buffer():
+    a_engine, a_scene = new_collision_scene(3)
+    a_entities = [a_scene.get_entity_by_name("entity/{}".format(i)) for i in range(3)]
+    a_template = Entity("bullet")
+    a_template.add_component(Collider2D("bullet/collider"))
+    a_new_entity = Entity("new-entity")
+    a_move_to = MoveTo("entity/2/move-to")
+    a_scene.command_buffer.remove_entity(a_entities[0])
+    a_scene.command_buffer.remove_component(a_entities[1], a_entities[1].get_component("Collider2D"))
+    a_scene.command_buffer.add_component(a_entities[2], a_move_to)
+    a_scene.command_buffer.add_entity(a_new_entity)
+    a_scene.command_buffer.spawn(Prefab(a_template), 2)
+    len(a_scene.command_buffer).should.equal(5)
+    a_scene.entities.should.contain(a_entities[0])
+    a_entities[1].get_component("Collider2D").should_not.be.none
+    a_scene.get_entity_by_name("new-entity").should.be.none
+    a_scene.on_after_update()
+    len(a_scene.command_buffer).should.equal(0)
+    a_scene.entities.should_not.contain(a_entities[0])
+    a_scene.loaded_entities.should_not.contain(a_entities[0])
+    a_scene.layers[a_entities[0].layer].should_not.contain(a_entities[0])
+    a_scene.collision_collection.should_not.contain(a_entities[0])
+    a_scene.dynamic_collision_collection.should_not.contain(a_entities[0])
+    a_entities[1].get_component("Collider2D").should.be.none
+    a_entities[2].get_component("MoveTo").should.be(a_move_to)
+    a_scene.get_entity_by_name("new-entity").should.be(a_new_entity)
+    len(a_scene.entity_names["bullet"]).should.equal(2)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_scene.query(MoveTo).should.equal([a_entities[2]])
+    len(a_scene.query(Collider2D)).should.equal(3)
+    Engine.delete()
+
+
+def test_scene_dispatch_lists():
+    a_engine, a_scene = new_collision_scene(2)
+    a_entity = a_scene.get_entity_by_name("entity/0")
+    a_box = Box("entity/0/box")
+    a_move_to = MoveTo("entity/0/move-to")
+    a_entity.add_component(a_box)
+    a_entity.add_component(a_move_to)
+    a_scene.get_dispatch("on_frame_end").should.contain(a_entity.on_frame_end)
+    a_scene.on_frame_end()
+    a_collider = a_entity.get_component("Collider2D")
+    a_entity.get_dispatch("on_start").should.equal([a_collider, a_box, a_move_to])
+    a_entity.get_dispatch("on_update").should.equal([a_move_to])
+    a_entity.get_dispatch("on_render").should.equal([a_box])
+    a_entity.get_dispatch("on_after_update").should.equal([a_box])
+    a_entity.get_dispatch("on_frame_start").should.be.empty
+    a_scene.get_dispatch("on_update").should.equal([a_move_to.on_update])
+    a_scene.get_dispatch("on_frame_start").should.be.empty
+    a_scene.get_dispatch("on_frame_end").should.be.empty
+    a_dispatch = a_scene.get_dispatch("on_after_update")
+    a_scene.get_dispatch("on_after_update").should.be(a_dispatch)
+    a_move_to.on_deactive()
+    a_entity.get_dispatch("on_update").should.be.empty
+    a_scene.get_dispatch("on_update").should.be.empty
+    a_move_to.on_active()
+    a_scene.get_dispatch("on_update").should.equal([a_move_to.on_update])
+    a_entity.remove_component(a_box)
+    a_entity.get_dispatch("on_render").should.be.empty
+    a_scene.get_dispatch("on_after_update").should.be.empty
+    Engine.delete()
+
+
+def test_scene_remove_entities_keeps_order():
+    a_engine, a_scene = new_collision_scene(100)
+    a_entities = [a_scene.get_entity_by_name("entity/{}".format(i)) for i in range(100)]
+    for a_entity in a_entities[::2]:
+        a_scene.remove_entity(a_entity)
+    a_scene.on_after_update()
+    a_kept = a_entities[1::2]
+    [x for x in a_scene.entities if x in a_kept].should.equal(a_kept)
+    list(a_scene.collision_collection).should.equal(a_kept)
+    list(a_scene.dynamic_collision_collection).should.equal(a_kept)
+    [x for x in a_scene.layers[a_kept[0].layer] if x in a_kept].should.equal(a_kept)
+    len(a_scene.loaded_entities).should.equal(51)
+    for a_entity in a_entities[::2]:
+        a_scene.entities.should_not.contain(a_entity)
+        a_scene.loaded_entities.should_not.contain(a_entity)
+        a_scene.layers[a_entity.layer].should_not.contain(a_entity)
+        a_scene.collision_order.should_not.contain(a_entity.id)
+    a_entity = Entity("entity/new")
+    a_entity.add_component(Collider2D("entity/new/collider"))
+    a_scene.add_entity(a_entity)
+    a_scene.on_frame_start()
+    list(a_scene.collision_collection)[-1].should.be(a_entity)
+    Engine.delete()
+
+
+def test_scene_layers_z_order():
+    a_engine, a_scene = new_collision_scene(0)
+    [a_layer.name for a_layer in a_scene.layer_order].should.equal(Scene.LAYERS)
+    a_scene.add_layer("hud", 10)
+    a_scene.add_layer("floor", -1)
+    a_scene.add_layer("ground", 1, Layer.y_sort)
+    a_scene.add_layer.when.called_with("hud").should.throw(Exception)
+    [a_layer.name for a_layer in a_scene.layer_order].should.equal(["floor", "background", "middle", "ground", "top", "hud"])
+    a_scene.get_layer("ground").sort_key.should.be(Layer.y_sort)
+    a_scene.get_layer("unknown").should.be.none
+    a_rendered = []
+
+    class Sprite(Box):
+
+        def on_render(self):
+            a_rendered.append(self.entity.name)
+
+    for a_index, a_layer_name in enumerate(["hud", "ground", "floor", "ground"]):
+        a_entity = Entity("{}/{}".format(a_layer_name, a_index), the_layer=a_layer_name)
+        a_entity.transform = Transform(the_position=pygame.Vector2(0, 100 - 10 * a_index), the_dim=pygame.Vector2(10, 10))
+        a_entity.add_component(Sprite("{}/sprite".format(a_entity.name)))
+        a_scene.add_entity(a_entity)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_scene.on_render()
+    a_rendered.should.equal(["floor/2", "ground/3", "ground/1", "hud/0"])
+    a_entity = Entity("entity/unknown", the_layer="unknown")
+    a_scene.add_entity(a_entity)
+    a_scene.on_frame_start.when.called_with().should.throw(Exception)
+    a_entity.loaded.should.be.false
+    a_entity.transform.pool.should.be.none
+    a_scene.loaded_entities.should_not.contain(a_entity)
+    a_scene.unloaded_entities.should.contain(a_entity)
+    a_scene.on_frame_start.when.called_with().should.throw(Exception)
+    Engine.delete()
+
+
+def test_scene_runtime_colliders():
+    a_engine, a_scene = new_collision_scene(0)
+    a_collisions = record_collisions(a_scene)
+    a_entities = []
+    for a_name in ["one", "other"]:
+        a_entity = Entity(a_name)
+        a_entity.transform = Transform(the_position=pygame.Vector2(10, 10), the_dim=pygame.Vector2(10, 10))
+        a_scene.add_entity(a_entity)
+        a_entities.append(a_entity)
+    a_entities[0].add_component(Collider2D("one/collider"))
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_scene.collision_collection.should.contain(a_entities[0])
+    a_scene.collision_collection.should_not.contain(a_entities[1])
+    a_entities[1].add_component(Collider2D("other/collider"))
+    a_scene.dynamic_collision_collection.should.contain(a_entities[1])
+    a_scene.on_frame_end()
+    a_scene.check_collisions()
+    a_collisions.should.equal([("one", "other")])
+    a_entities[1].remove_component(a_entities[1].get_component("Collider2D"))
+    a_scene.collision_collection.should_not.contain(a_entities[1])
+    a_scene.dynamic_collision_collection.should_not.contain(a_entities[1])
+    a_scene.collision_order.should_not.contain(a_entities[1].id)
+    a_entities[1].add_component(Collider2D("other/static", the_static=True))
+    a_scene.static_collision_collection.should.contain(a_entities[1])
+    a_scene.dynamic_collision_collection.should_not.contain(a_entities[1])
+    a_scene.on_frame_end()
+    del a_collisions[:]
+    a_scene.check_collisions()
+    a_collisions.should.equal([("one", "other")])
+    a_entities[1].remove_components()
+    a_scene.static_collision_collection.should_not.contain(a_entities[1])
+    Engine.delete()
+
+
+def test_scene_command_buffer_colliders():
+    a_engine, a_scene = new_collision_scene(0)
+    a_collisions = record_collisions(a_scene)
+    a_entities = []
+    for a_name in ["one", "other"]:
+        a_entity = Entity(a_name)
+        a_entity.transform = Transform(the_position=pygame.Vector2(10, 10), the_dim=pygame.Vector2(10, 10))
+        a_scene.add_entity(a_entity)
+        a_entities.append(a_entity)
+    a_entities[0].add_component(Collider2D("one/collider"))
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_scene.command_buffer.add_component(a_entities[1], Collider2D("other/collider"))
+    a_scene.on_after_update()
+    a_scene.collision_collection.should.contain(a_entities[1])
+    a_scene.dynamic_collision_collection.should.contain(a_entities[1])
+    a_scene.on_frame_end()
+    a_scene.check_collisions()
+    a_collisions.should.equal([("one", "other")])
+    a_scene.command_buffer.remove_component(a_entities[1], a_entities[1].get_component("Collider2D"))
+    a_scene.on_after_update()
+    a_scene.collision_collection.should_not.contain(a_entities[1])
+    a_scene.dynamic_collision_collection.should_not.contain(a_entities[1])
+    del a_collisions[:]
+    a_scene.check_collisions()
+    a_collisions.should.be.empty
+    Engine.delete()
@@ -0,0 +1,137 @@
+import pygame
+import sure
+from engine import DelegateManager, Engine, Entity, Scene, SceneManager, System, Transform
+from engine.assets.components import CircleCollider2D, Collider2D, MoveTo, OutOfBounds
+from engine.assets.systems import MoveToSystem, OutOfBoundsSystem
+
+
+class CountSystem(System):
+
+    COMPONENTS = (MoveTo, Collider2D)
+
+    def __init__(self, the_name, the_engine=None, **kwargs):
+        super().__init__(the_name, the_engine, **kwargs)
+        self.rows = []
+
+    def on_update_rows(self, the_entities, the_move_tos, the_colliders):
+        for a_entity, a_move_to, a_collider in zip(the_entities, the_move_tos, the_colliders):
+            a_move_to.entity.should.equal(a_entity)
+            a_collider.entity.should.equal(a_entity)
+            self.rows.append(a_entity.name)
+
+
+def test_system_archetypes():
+    a_engine = Engine("test/engine", 800, 400)
+    a_engine.delegate_manager = DelegateManager("delegate-manager")
+    a_engine.scene_manager = SceneManager("scene-manager")
+    a_scene = Scene("test-scene")
+    a_engine.scene_manager.add_scene(a_scene)
+    a_engine.scene_manager.assign_active_scene()
+    a_scene.on_init()
+    a_system = CountSystem("count-system")
+    a_engine.add_system(a_system).should.be.true
+    a_engine.add_system(a_system).should.be.false
+    a_system.engine.should.equal(a_engine)
+    for a_name, a_components in [("move", [MoveTo]),
+                                 ("move/collider", [MoveTo, Collider2D]),
+                                 ("move/circle", [MoveTo, CircleCollider2D]),
+                                 ("collider", [Collider2D])]:
+        a_entity = Entity(a_name)
+        for a_component in a_components:
+            a_entity.add_component(a_component("{}/{}".format(a_name, a_component.__name__)))
+        a_scene.add_entity(a_entity)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    len([x for x in a_scene.archetypes.archetypes.values() if len(x)]).should.equal(4)
+    len(a_system.get_archetypes(a_scene)).should.equal(2)
+    a_engine.on_update()
+    sorted(a_system.rows).should.equal(["move/circle", "move/collider"])
+    a_entity = a_scene.lookup_by_name(a_scene.entities, "move/collider")
+    a_entity.remove_component(a_entity.get_component("Collider2D"))
+    a_system.rows = []
+    a_engine.on_update()
+    a_system.rows.should.equal(["move/circle"])
+    a_entity = a_scene.lookup_by_name(a_scene.entities, "move/circle")
+    a_scene.remove_entity(a_entity)
+    a_scene.on_after_update()
+    a_system.rows = []
+    a_engine.on_update()
+    a_system.rows.should.be.empty
+    a_engine.remove_system(a_system).should.be.true
+    Engine.delete()
+
+
+def test_move_to_system():
+    a_engine = Engine("test/engine", 800, 400)
+    a_engine.delegate_manager = DelegateManager("delegate-manager")
+    a_engine.scene_manager = SceneManager("scene-manager")
+    a_scene = Scene("test-scene")
+    a_engine.scene_manager.add_scene(a_scene)
+    a_engine.scene_manager.assign_active_scene()
+    a_scene.on_init()
+    a_system = MoveToSystem("move-to-system")
+    a_engine.add_system(a_system)
+    a_move_tos = []
+    for a_index in range(3):
+        a_entity = Entity("entity/{}".format(a_index), the_transform=Transform(the_position=pygame.Vector2(a_index * 10, 0)))
+        a_move_to = MoveTo("entity/{}/move-to".format(a_index), the_speed=pygame.Vector2(a_index, 1))
+        a_entity.add_component(a_move_to)
+        a_scene.add_entity(a_entity)
+        a_move_tos.append(a_move_to)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    a_engine.on_update()
+    [tuple(x.entity.transform.position) for x in a_move_tos].should.equal([(0, 1), (11, 1), (22, 1)])
+    a_move_tos[0].system.should.be(a_system)
+    a_move_tos[0].speed = pygame.Vector2(5, 5)
+    a_move_tos[1].active = False
+    a_engine.on_update()
+    [tuple(x.entity.transform.position) for x in a_move_tos].should.equal([(5, 6), (11, 1), (24, 2)])
+    a_engine.remove_system(a_system).should.be.true
+    a_move_tos[1].active = True
+    a_engine.frames += 1
+    a_engine.on_update()
+    [tuple(x.entity.transform.position) for x in a_move_tos].should.equal([(10, 11), (12, 2), (26, 3)])
+    Engine.delete()
+
+
+def test_out_of_bounds_system():
+    a_engine = Engine("test/engine", 800, 400)
+    a_engine.delegate_manager = DelegateManager("delegate-manager")
+    a_engine.scene_manager = SceneManager("scene-manager")
+    a_scene = Scene("test-scene")
+    a_engine.scene_manager.add_scene(a_scene)
+    a_engine.scene_manager.assign_active_scene()
+    a_scene.on_init()
+    a_events = []
+    a_components = []
+    for a_index, (a_x, a_y) in enumerate([(-5, 10), (-25, 10), (795, 395), (801, 401), (100, -30), (400, 200), (-0.5, 10)]):
+        for a_bounce in [True, False]:
+            a_name = "entity/{}/{}".format(a_index, a_bounce)
+            a_entity = Entity(a_name, the_transform=Transform(the_position=pygame.Vector2(a_x, a_y), the_dim=pygame.Vector2(20, 10)))
+            a_component = OutOfBounds("{}/out-of-bounds".format(a_name), the_bounce=a_bounce)
+            a_entity.add_component(a_component)
+            a_scene.add_entity(a_entity)
+            a_components.append(a_component)
+    a_scene.on_frame_start()
+    a_scene.on_frame_end()
+    for a_component in a_components:
+        a_engine.delegate_manager.register_callback_to_delegate(
+            a_component, a_component.get_delegate(), lambda the_entity, the_location: a_events.append((the_entity.name, the_location)))
+    a_engine.on_update()
+    a_expected = sorted(a_events)
+    a_expected.should.contain(("entity/0/True", "left"))
+    a_expected.should_not.contain(("entity/0/False", "left"))
+    a_expected.should.contain(("entity/1/False", "left"))
+    a_expected.should_not.contain(("entity/6/True", "left"))
+    del a_events[:]
+    a_system = OutOfBoundsSystem("out-of-bounds-system")
+    a_engine.add_system(a_system)
+    a_engine.on_update()
+    sorted(a_events).should.equal(a_expected)
+    a_components[0].system.should.be(a_system)
+    a_components[0].active = False
+    del a_events[:]
+    a_engine.on_update()
+    sorted(a_events).should.equal([x for x in a_expected if x[0] != "entity/0/True"])
+    Engine.delete()
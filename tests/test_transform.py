@@ -0,0 +1,165 @@
+import pygame
+import sure
+from engine import DelegateManager, Engine, Entity, Scene, SceneManager, Transform, TransformPool
+
+
+def test_transform_pool_views():
+    a_pool = TransformPool(2)
+    a_transforms = [Transform(the_position=pygame.Vector2(i, i * 2), the_dim=pygame.Vector2(10, 5)) for i in range(5)]
+    for a_transform in a_transforms:
+        a_pool.attach(a_transform)
+    len(a_pool).should.equal(5)
+    a_pool.capacity.should.equal(8)
+    a_transform = a_transforms[3]
+    a_transform.position.x.should.equal(3)
+    a_transform.position.y.should.equal(6)
+    a_transform.position.x += 4
+    a_transform.position.y -= 1
+    a_transform.scale *= 2
+    list(a_pool.positions[a_transform.row]).should.equal([7, 5])
+    a_transform.get_rect().should.equal(pygame.Rect(7, 5, 20, 10))
+    a_pool.positions[:a_pool.size] += 1
+    a_transform.position.should.equal(pygame.Vector2(8, 6))
+    (a_transform.position + pygame.Vector2(1, 1)).should.equal(pygame.Vector2(9, 7))
+    a_transform.position = pygame.Vector2(0, 0)
+    a_xs, a_ys, a_widths, a_heights = a_pool.get_rects()
+    list(a_xs).should.equal([1, 2, 3, 0, 5])
+    list(a_widths).should.equal([10, 10, 10, 20, 10])
+    a_pool.detach(a_transform).should.be.true
+    a_transform.pool.should.be.none
+    a_transform.position.should.be.a(pygame.Vector2)
+    a_transform.get_rect().should.equal(pygame.Rect(0, 0, 20, 10))
+    len(a_pool).should.equal(4)
+    a_other = Transform(the_position=pygame.Vector2(30, 40))
+    a_pool.attach(a_other).should.equal(3)
+    a_pool.clear()
+    len(a_pool).should.equal(0)
+    a_other.position.should.equal(pygame.Vector2(30, 40))
+    a_transforms[0].position.should.equal(pygame.Vector2(1, 1))
+
+
+def test_transform_pool_scene():
+    a_engine = Engine("test/engine", 800, 400)
+    a_engine.delegate_manager = DelegateManager("delegate-manager")
+    a_engine.scene_manager = SceneManager("scene-manager")
+    a_scene = Scene("test-scene")
+    a_engine.scene_manager.add_scene(a_scene)
+    a_engine.scene_manager.assign_active_scene()
+    a_scene.on_init()
+    a_entity = Entity("entity", the_transform=Transform(the_position=pygame.Vector2(5, 5), the_dim=pygame.Vector2(2, 2)))
+    a_scene.add_entity(a_entity)
+    a_scene.on_frame_start()
+    a_entity.transform.pool.should.equal(a_scene.transform_pool)
+    a_entity.transform = Transform(the_position=pygame.Vector2(20, 10))
+    a_entity.transform.pool.should.equal(a_scene.transform_pool)
+    a_entity.transform.position.x += 1
+    list(a_scene.transform_pool.positions[a_entity.transform.row]).should.equal([21, 10])
+    a_transform = a_entity.transform
+    a_len = len(a_scene.transform_pool)
+    a_scene.remove_entity(a_entity)
+    a_scene.on_after_update()
+    a_transform.pool.should.be.none
+    a_transform.position.should.equal(pygame.Vector2(21, 10))
+    len(a_scene.transform_pool).should.equal(a_len - 1)
+    Engine.delete()
+
+
+def test_transform_versions():
+    a_transform = Transform(the_position=pygame.Vector2(1, 2), the_dim=pygame.Vector2(3, 4))
+    a_version = a_transform.version
+    a_transform.position = pygame.Vector2(5, 6)
+    a_transform.version.should_not.equal(a_version)
+    a_pool = TransformPool(1)
+    a_pool.attach(Transform())
+    a_pool.attach(a_transform)
+    a_rect = a_transform.get_rect()
+    a_rect.should.equal(pygame.Rect(5, 6, 3, 4))
+    a_transform.get_rect().should.be(a_rect)
+    a_version = a_transform.version
+    a_transform.position.x += 1
+    a_transform.version.should_not.equal(a_version)
+    a_transform.get_rect().should.equal(pygame.Rect(6, 6, 3, 4))
+    a_rect = a_transform.get_rect()
+    a_pool.positions[a_transform.row] += 1
+    a_transform.get_rect().should.be(a_rect)
+    a_pool.touch([a_transform.row])
+    a_transform.get_rect().should.equal(pygame.Rect(7, 7, 3, 4))
+    a_version = a_transform.version
+    a_pool.detach(a_transform)
+    a_transform.version.should.be.greater_than(a_version)
+    a_other = Transform(the_position=pygame.Vector2(9, 9))
+    a_pool.attach(a_other)
+    a_other.version.should.be.greater_than(a_version)
+
+
+def test_transform_hierarchy():
+    a_tank = Entity("tank", the_transform=Transform(the_position=pygame.Vector2(100, 50), the_dim=pygame.Vector2(20, 10)))
+    a_turret = Entity("turret", the_transform=Transform(the_position=pygame.Vector2(10, 0), the_dim=pygame.Vector2(4, 4)))
+    a_tank.add_child(a_turret)
+    a_turret.transform.parent.should.be(a_tank.transform)
+    a_turret.transform.world_position.should.equal(pygame.Vector2(110, 50))
+    a_turret.transform.get_rect().should.equal(pygame.Rect(110, 50, 4, 4))
+    a_position = a_turret.transform.world_position
+    a_version = a_turret.transform.version
+    a_turret.transform.world_position.should.equal(a_position)
+    a_tank.transform.position = pygame.Vector2(200, 100)
+    a_turret.transform.version.should.be.greater_than(a_version)
+    a_turret.transform.world_position.should.equal(pygame.Vector2(210, 100))
+    a_tank.transform.scale = pygame.Vector2(2, 2)
+    a_tank.transform.rotation = pygame.Vector2(90, 0)
+    a_turret.transform.world_position.x.should.equal(200)
+    a_turret.transform.world_position.y.should.equal(120)
+    a_turret.transform.world_rotation.should.equal(pygame.Vector2(90, 0))
+    a_turret.transform.world_scale.should.equal(pygame.Vector2(2, 2))
+    a_turret.transform.get_rect().size.should.equal((8, 8))
+    a_tank.remove_child(a_turret)
+    a_turret.transform.parent.should.be.none
+    a_turret.transform.world_position.should.equal(pygame.Vector2(10, 0))
+
+
+def test_transform_hierarchy_in_place():
+    a_transform = Transform(the_dim=pygame.Vector2(10, 10))
+    a_transform.world_position.should.equal(pygame.Vector2(0, 0))
+    a_transform.position.x = 50
+    a_transform.world_position.should.equal(pygame.Vector2(50, 0))
+    a_transform.get_rect().topleft.should.equal((50, 0))
+    a_tank = Entity("tank", the_transform=Transform(the_position=pygame.Vector2(100, 0), the_dim=pygame.Vector2(20, 10)))
+    a_turret = Entity("turret", the_transform=Transform(the_position=pygame.Vector2(10, 0), the_dim=pygame.Vector2(4, 4)))
+    a_tank.add_child(a_turret)
+    a_turret.transform.get_rect().topleft.should.equal((110, 0))
+    a_version = a_turret.transform.version
+    a_tank.transform.position.x += 100
+    a_turret.transform.version.should_not.equal(a_version)
+    a_turret.transform.world_position.should.equal(pygame.Vector2(210, 0))
+    a_turret.transform.get_rect().topleft.should.equal((210, 0))
+    a_turret.transform.position.y += 5
+    a_turret.transform.get_rect().topleft.should.equal((210, 5))
+
+
+def test_transform_hierarchy_pool():
+    a_engine = Engine("test/engine", 800, 400)
+    a_engine.delegate_manager = DelegateManager("delegate-manager")
+    a_engine.scene_manager = SceneManager("scene-manager")
+    a_scene = Scene("test-scene")
+    a_engine.scene_manager.add_scene(a_scene)
+    a_engine.scene_manager.assign_active_scene()
+    a_scene.on_init()
+    a_group = Entity("group", the_transform=Transform(the_position=pygame.Vector2(100, 100), the_dim=pygame.Vector2(10, 10)))
+    for a_index in range(3):
+        a_group.add_child(Entity("item/{}".format(a_index), the_transform=Transform(the_position=pygame.Vector2(a_index * 10, 0),
+                                                                                    the_dim=pygame.Vector2(5, 5))))
+    a_scene.add_entity(a_group)
+    a_scene.on_frame_start()
+    a_pool = a_scene.transform_pool
+    len(a_pool.child_rows).should.equal(3)
+    a_rows = [a_child.transform.row for a_child in a_group.children]
+    a_xs, a_ys, a_widths, _ = a_pool.get_rects(a_rows)
+    list(a_xs).should.equal([100, 110, 120])
+    list(a_ys).should.equal([100, 100, 100])
+    list(a_widths).should.equal([5, 5, 5])
+    a_scene.query_point((112, 102)).should.equal([a_group.children[1]])
+    a_group.transform.position.x += 100
+    a_scene.spatial_index_dirty = True
+    a_scene.query_point((212, 102)).should.equal([a_group.children[1]])
+    list(a_pool.positions[a_rows, 0]).should.equal([0, 10, 20])
+    Engine.delete()
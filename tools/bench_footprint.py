@@ -0,0 +1,55 @@
+"""bench_footprint.py reports the memory used by every entity, including its
+transform and three components, when many entities are created.
+
+    python -m tools.bench_footprint --count 100000
+
+Creating objects is dominated by logging, the footprint grows linearly with
+the number of entities, so a smaller count can be used for a quick check.
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+import pygame
+from engine import Entity, Transform
+from engine.assets.components import Box, Collider2D, MoveTo
+
+
+def new_entity(the_index):
+    """new_entity creates an entity with a transform and three components.
+    """
+    a_entity = Entity("entity/{}".format(the_index),
+                      the_transform=Transform(the_position=pygame.Vector2(the_index, the_index),
+                                              the_dim=pygame.Vector2(10, 10)))
+    a_entity.add_component(Box("entity/{}/box".format(the_index)))
+    a_entity.add_component(MoveTo("entity/{}/move-to".format(the_index)))
+    a_entity.add_component(Collider2D("entity/{}/collider".format(the_index)))
+    return a_entity
+
+
+def bench_footprint(the_count):
+    """bench_footprint creates the given number of entities and returns the
+    number of bytes allocated by every entity.
+    """
+    # first objects fill module level caches, like the ones used for logging.
+    new_entity(-1)
+    gc.collect()
+    tracemalloc.start()
+    a_start_memory = tracemalloc.get_traced_memory()[0]
+    a_entities = [new_entity(a_index) for a_index in range(the_count)]
+    gc.collect()
+    a_memory = tracemalloc.get_traced_memory()[0] - a_start_memory
+    tracemalloc.stop()
+    del a_entities
+    return a_memory / the_count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entity memory footprint benchmark")
+    parser.add_argument("-c", "--count", type=int, default=100000, help="Number of entities (default: 100000)")
+    args = parser.parse_args()
+    a_bytes = bench_footprint(args.count)
+    print("entities: {}".format(args.count))
+    print("bytes per entity: {:.0f}".format(a_bytes))
+    print("total: {:.1f} MiB".format(a_bytes * args.count / (1024 * 1024)))
@@ -42,10 +42,12 @@ def loggable(f):
     """
 
     def _loggable(self):
-        the_frame = inspect.stack()[1]
-        self.dicta["file-name"] = the_frame.filename
-        self.dicta["lineno"] = the_frame.lineno
-        self.dicta["func-name"] = the_frame.function
+        # inspect.stack() reads source lines for every frame in the stack,
+        # only the caller frame is required.
+        the_frame = inspect.currentframe().f_back
+        self.dicta["file-name"] = the_frame.f_code.co_filename
+        self.dicta["lineno"] = the_frame.f_lineno
+        self.dicta["func-name"] = the_frame.f_code.co_name
         self.dicta["level"] = DEBUG
         f(self)
         self.dicta = {}